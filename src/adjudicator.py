@@ -0,0 +1,151 @@
+"""
+Deciding simulated games without playing them to the end
+"""
+import math
+from typing import Any
+
+from go import Go
+
+# Reasons a simulated game stops.
+END = "end"
+CAP = "cap"
+RESIGN = "resign"
+PASSES = "passes"
+
+
+class Adjudicator:
+    """
+    Decides when a simulated game stops and who won it.
+
+    A game stops when it is over (END), when it reaches a move cap that
+    grows with the area of the board (CAP), when one player has led by a
+    large part of the board for a number of moves in a row (RESIGN), or
+    when every other player has just passed and the player to move has
+    nothing left to play but its own eyes, so it would pass too (PASSES).
+
+    The lead is measured with Go.estimated_scores, which is cheap to keep
+    up to date move after move. A game that resigns is won by the player
+    in the lead; games stopped at the cap or by the passes are decided by
+    Go.settled_scores.
+
+    An adjudicator follows one game at a time: start must be called before
+    every game.
+    """
+
+    _moves_per_point: float
+    _resign_margin: float | None
+    _resign_moves: int
+    _finish_passes: bool
+    _leader: int | None
+    _streak: int
+
+    def __init__(self, moves_per_point: float = 3.0,
+                 resign_margin: float | None = 0.3, resign_moves: int = 10,
+                 finish_passes: bool = True) -> None:
+        """
+        Constructor
+
+        Args:
+            moves_per_point: Moves allowed per position of the board
+            resign_margin: Lead, as a fraction of the positions of the
+                board, that makes the other players resign; None never
+                resigns
+            resign_moves: Number of moves in a row the lead must last
+            finish_passes: Whether to stop games once the player to move
+                would only pass after the others did
+        """
+        if moves_per_point <= 0:
+            raise ValueError("The move cap must allow some moves")
+        if resign_moves < 1:
+            raise ValueError("A lead must last at least one move")
+        self._moves_per_point = moves_per_point
+        self._resign_margin = resign_margin
+        self._resign_moves = resign_moves
+        self._finish_passes = finish_passes
+        self._leader = None
+        self._streak = 0
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """
+        returns the arguments the adjudicator was constructed with
+        """
+        return {'moves_per_point': self._moves_per_point,
+                'resign_margin': self._resign_margin,
+                'resign_moves': self._resign_moves,
+                'finish_passes': self._finish_passes}
+
+    def max_moves(self, game: Go) -> int:
+        """
+        returns the largest number of moves played in a game on the board
+        """
+        return math.ceil(self._moves_per_point * game.size ** 2)
+
+    def start(self) -> None:
+        """
+        Starts following a new game.
+        """
+        self._leader = None
+        self._streak = 0
+
+    def check(self, game: Go) -> str | None:
+        """
+        Returns the reason for stopping the game after its latest move, or
+        None if it goes on. Must be called after every move.
+        """
+        if game.done:
+            return END
+        if game.num_of_turns >= self.max_moves(game):
+            return CAP
+        if self._finish_passes and \
+            game.consecutive_passes == game.num_players - 1 and \
+            not self._has_move(game):
+            return PASSES
+        if self._resign_margin is not None and self._resigns(game):
+            return RESIGN
+        return None
+
+    def winners(self, game: Go, reason: str) -> list[int]:
+        """
+        Returns the outcome of a game stopped for a reason.
+        """
+        if reason == END:
+            return game.outcome
+        if reason == RESIGN:
+            assert self._leader is not None
+            return [self._leader]
+        scores = game.settled_scores()
+        max_score = max(scores.values())
+        return [player for player, score in scores.items()
+                if score == max_score]
+
+    def _resigns(self, game: Go) -> bool:
+        """
+        Follows the lead after a move and returns whether it has been large
+        enough for long enough.
+        """
+        assert self._resign_margin is not None
+        scores = sorted(game.estimated_scores().items(),
+                        key=lambda item: -item[1])
+        leader, lead = scores[0]
+        margin = lead - scores[1][1]
+        if margin < self._resign_margin * game.size ** 2:
+            self._leader = None
+            self._streak = 0
+            return False
+        if leader != self._leader:
+            self._leader = leader
+            self._streak = 0
+        self._streak += 1
+        return self._streak >= self._resign_moves
+
+    @staticmethod
+    def _has_move(game: Go) -> bool:
+        """
+        returns whether the player to move has a legal move other than
+        filling its own eyes or capturing its own stones
+        """
+        return any(not game.is_eye(move, game.turn)
+                   and not game.is_self_capture(move)
+                   and game.legal_move(move)
+                   for move in game.empty_positions())
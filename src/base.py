@@ -63,6 +63,14 @@ class GoBase(ABC):
         """
         return self._players
 
+    @property
+    def superko(self) -> bool:
+        """
+        Returns whether the "super ko" rule is in effect (rather than the
+        "simple ko" rule)
+        """
+        return self._superko
+
     @property
     @abstractmethod
     def grid(self) -> BoardGridType:
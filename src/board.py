@@ -2,20 +2,171 @@
 A class to represent a board.
 """
 from copy import deepcopy
+from typing import Any, ClassVar
 from base import BoardGridType
 
+# Positions next to every position of a board, keyed by position.
+NeighborTableType = dict[tuple[int, int], list[tuple[int, int]]]
+
+# For every position, the pattern codes that include it: the row and column
+# of each neighbor, and where the position sits in that neighbor's code.
+PatternUpdateTableType = dict[tuple[int, int], list[tuple[int, int, int]]]
+
+# A 3x3 pattern code packs the contents of the eight neighbors of a
+# position into 16 bits: neighbor i, in the direction PATTERN_DIRECTIONS[i],
+# takes bits 2i and 2i+1.
+PATTERN_DIRECTIONS = [(-1, 0), (-1, 1), (0, 1), (1, 1),
+                      (1, 0), (1, -1), (0, -1), (-1, -1)]
+PATTERN_EMPTY = 0
+PATTERN_FIRST = 1
+PATTERN_OTHER = 2
+PATTERN_EDGE = 3
+
+# A piece adds 1 << (INFLUENCE_RADIUS - d) to the influence of its player
+# on every position within Manhattan distance d <= INFLUENCE_RADIUS of it.
+INFLUENCE_RADIUS = 4
+
+# For every position, the positions it influences and by how much.
+InfluenceTableType = dict[tuple[int, int], list[tuple[int, int, int]]]
+
 class Board:
     """
     A class to represent a board.
+
+    Besides the grid, the board keeps the 3x3 pattern code of every
+    position (see PATTERN_DIRECTIONS), updated on every set. Codes hold
+    PATTERN_FIRST for pieces of player 1 and PATTERN_OTHER for pieces of
+    any other player.
+
+    Once the influence of the pieces has been asked for, the board also
+    keeps the influence of every player on every position and the owner of
+    every position (the player with the most influence on it, if there is
+    a single one). Sets are queued and applied on the next query, and only
+    the positions within INFLUENCE_RADIUS of a changed position are updated.
     """
     _rows: int
     _cols: int
     _grid: BoardGridType
+    _patterns: list[list[int]]
+    _adjacent: NeighborTableType
+    _diagonal: NeighborTableType
+    _pattern_updates: PatternUpdateTableType
+    _empty_patterns: list[list[int]]
+    _influence_table: InfluenceTableType
+    _influence: dict[int, list[list[int]]] | None
+    _owners: BoardGridType
+    _owned: dict[int, int]
+    _pending: list[tuple[int, int, int | None, int | None]]
+
+    # Neighbor tables shared by all boards of the same dimensions.
+    _tables: ClassVar[dict[tuple[int, int],
+                           tuple[NeighborTableType, NeighborTableType,
+                                 PatternUpdateTableType, list[list[int]],
+                                 InfluenceTableType]]] = {}
 
     def __init__(self, rows: int, cols: int) -> None:
         self._rows = rows
         self._cols = cols
         self._grid = [[None for _ in range(cols)] for _ in range(rows)]
+        if (rows, cols) not in Board._tables:
+            Board._tables[(rows, cols)] = (
+                self._neighbor_table([(0, 1), (0, -1), (1, 0), (-1, 0)]),
+                self._neighbor_table([(1, 1), (1, -1), (-1, 1), (-1, -1)]),
+                self._pattern_update_table(),
+                self._empty_pattern_table(),
+                self._influence_range_table(),
+            )
+        self._adjacent, self._diagonal, self._pattern_updates, \
+            self._empty_patterns, self._influence_table = \
+            Board._tables[(rows, cols)]
+        self._patterns = [row[:] for row in self._empty_patterns]
+        self._influence = None
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Board":
+        """
+        Copies the grid, pattern codes and influence, but shares the
+        neighbor tables with the copy.
+        """
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board._grid = [row[:] for row in self._grid]
+        board._patterns = [row[:] for row in self._patterns]
+        if self._influence is not None:
+            board._influence = {player: [row[:] for row in grid]
+                                for player, grid in self._influence.items()}
+            board._owners = [row[:] for row in self._owners]
+            board._owned = dict(self._owned)
+            board._pending = list(self._pending)
+        return board
+
+    def _influence_range_table(self) -> InfluenceTableType:
+        """
+        Lists, for every position, the positions within INFLUENCE_RADIUS of
+        it and the influence a piece there has on each of them.
+        """
+        table = {}
+        for row in range(self._rows):
+            for col in range(self._cols):
+                influenced = []
+                for d_row in range(-INFLUENCE_RADIUS, INFLUENCE_RADIUS + 1):
+                    reach = INFLUENCE_RADIUS - abs(d_row)
+                    for d_col in range(-reach, reach + 1):
+                        if self.valid_position(row + d_row, col + d_col):
+                            distance = abs(d_row) + abs(d_col)
+                            influenced.append(
+                                (row + d_row, col + d_col,
+                                 1 << (INFLUENCE_RADIUS - distance)))
+                table[(row, col)] = influenced
+        return table
+
+    def _pattern_update_table(self) -> PatternUpdateTableType:
+        """
+        Lists, for every position, the neighbors whose pattern code includes
+        it, and the bit offset of the position within each of those codes.
+        """
+        table = {}
+        for row in range(self._rows):
+            for col in range(self._cols):
+                updates = []
+                for i, (d_row, d_col) in enumerate(PATTERN_DIRECTIONS):
+                    neighbor = (row - d_row, col - d_col)
+                    if self.valid_position(*neighbor):
+                        updates.append((neighbor[0], neighbor[1], 2 * i))
+                table[(row, col)] = updates
+        return table
+
+    def _empty_pattern_table(self) -> list[list[int]]:
+        """
+        Computes the pattern code of every position of the empty board.
+        """
+        codes = []
+        for row in range(self._rows):
+            row_codes = []
+            for col in range(self._cols):
+                code = 0
+                for i, (d_row, d_col) in enumerate(PATTERN_DIRECTIONS):
+                    if not self.valid_position(row + d_row, col + d_col):
+                        code |= PATTERN_EDGE << (2 * i)
+                row_codes.append(code)
+            codes.append(row_codes)
+        return codes
+
+    def _neighbor_table(self, directions: list[tuple[int, int]]) -> \
+        NeighborTableType:
+        """
+        Lists, for every position, the valid positions one step away from
+        it in each of the given directions.
+        """
+        table = {}
+        for row in range(self._rows):
+            for col in range(self._cols):
+                positions = []
+                for direction in directions:
+                    potential_pos = (row + direction[0], col + direction[1])
+                    if self.valid_position(*potential_pos):
+                        positions.append(potential_pos)
+                table[(row, col)] = positions
+        return table
 
     @property
     def rows(self) -> int:
@@ -44,12 +195,161 @@ class Board:
         sets a grid to a new grid
         """
         self._grid = new_grid
+        self._patterns = [row[:] for row in self._empty_patterns]
+        for row in range(self._rows):
+            for col in range(self._cols):
+                if new_grid[row][col] is not None:
+                    self._update_patterns(row, col, new_grid[row][col])
+        if self._influence is not None:
+            self._start_influence()
+
+    def clear(self) -> None:
+        """
+        Empties the board, reusing its grids rather than allocating new ones.
+        """
+        for row in self._grid:
+            row[:] = [None] * self._cols
+        for codes, empty_codes in zip(self._patterns, self._empty_patterns):
+            codes[:] = empty_codes
+        if self._influence is not None:
+            for player_influence in self._influence.values():
+                for amounts in player_influence:
+                    amounts[:] = [0] * self._cols
+            for owners in self._owners:
+                owners[:] = [None] * self._cols
+            self._owned.clear()
+            self._pending.clear()
+
+    def snapshot(self) -> tuple[tuple[int | None, ...], ...]:
+        """
+        Get an immutable copy of the grid of the board.
+        """
+        return tuple(tuple(row) for row in self._grid)
 
     def set(self, row: int, col: int, value: int | None) -> None:
         """
         Set the value of the board at a given position.
         """
+        old_value = self._grid[row][col]
         self._grid[row][col] = value
+        self._update_patterns(row, col, value)
+        if self._influence is not None:
+            self._pending.append((row, col, old_value, value))
+
+    def _update_patterns(self, row: int, col: int, value: int | None) -> None:
+        """
+        Updates the pattern codes of the neighbors of a position after its
+        value has changed.
+        """
+        if value is None:
+            bits = PATTERN_EMPTY
+        elif value == 1:
+            bits = PATTERN_FIRST
+        else:
+            bits = PATTERN_OTHER
+        patterns = self._patterns
+        for n_row, n_col, shift in self._pattern_updates[(row, col)]:
+            patterns[n_row][n_col] = \
+                patterns[n_row][n_col] & ~(3 << shift) | bits << shift
+
+    def pattern(self, row: int, col: int) -> int:
+        """
+        Get the 3x3 pattern code of a position.
+        """
+        return self._patterns[row][col]
+
+    def _start_influence(self) -> None:
+        """
+        Starts keeping the influence of the pieces, queueing every piece on
+        the board.
+        """
+        self._influence = {}
+        self._owners = [[None] * self._cols for _ in range(self._rows)]
+        self._owned = {}
+        self._pending = [(row, col, None, self._grid[row][col])
+                         for row in range(self._rows)
+                         for col in range(self._cols)
+                         if self._grid[row][col] is not None]
+
+    def _update_influence(self) -> None:
+        """
+        Applies the queued sets to the influence and owners of the
+        positions around them.
+        """
+        if self._influence is None:
+            self._start_influence()
+        assert self._influence is not None
+        if not self._pending:
+            return
+        influence = self._influence
+        changed: set[tuple[int, int]] = set()
+        for row, col, old_value, value in self._pending:
+            if old_value == value:
+                continue
+            influenced = self._influence_table[(row, col)]
+            for player, sign in ((old_value, -1), (value, 1)):
+                if player is None:
+                    continue
+                if player not in influence:
+                    influence[player] = \
+                        [[0] * self._cols for _ in range(self._rows)]
+                player_influence = influence[player]
+                for n_row, n_col, weight in influenced:
+                    player_influence[n_row][n_col] += sign * weight
+            changed.update((n_row, n_col) for n_row, n_col, _ in influenced)
+        self._pending = []
+
+        owners = self._owners
+        owned = self._owned
+        for row, col in changed:
+            owner = None
+            most = 0
+            for player, player_influence in influence.items():
+                amount = player_influence[row][col]
+                if amount > most:
+                    owner, most = player, amount
+                elif amount == most:
+                    owner = None
+            old_owner = owners[row][col]
+            if owner != old_owner:
+                owners[row][col] = owner
+                if old_owner is not None:
+                    owned[old_owner] -= 1
+                if owner is not None:
+                    owned[owner] = owned.get(owner, 0) + 1
+
+    def influence(self, player: int) -> list[list[int]]:
+        """
+        Get the influence of a player on every position. The grid is shared
+        and must not be modified.
+        """
+        self._update_influence()
+        assert self._influence is not None
+        if player not in self._influence:
+            return [[0] * self._cols for _ in range(self._rows)]
+        return self._influence[player]
+
+    def owner(self, row: int, col: int) -> int | None:
+        """
+        Get the player with the most influence on a position, or None if no
+        single player has the most.
+        """
+        self._update_influence()
+        return self._owners[row][col]
+
+    def owners(self) -> BoardGridType:
+        """
+        Get a copy of the owner of every position.
+        """
+        self._update_influence()
+        return [row[:] for row in self._owners]
+
+    def owned_counts(self) -> dict[int, int]:
+        """
+        Get the number of positions owned by each player who owns any.
+        """
+        self._update_influence()
+        return dict(self._owned)
 
     def get(self, row: int, col: int) -> int | None:
         """
@@ -63,15 +363,16 @@ class Board:
         """
         return 0 <= row < self._rows and 0 <= col < self._cols
 
+    def diagonal_positions(self, pos: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Returns a list of all valid positions diagonally adjacent to the
+        specified position. The list is shared and must not be modified.
+        """
+        return self._diagonal[pos]
+
     def adjacent_positions(self, pos: tuple[int, int]) -> list[tuple[int, int]]:
         """
         Returns a list of all valid positions adjacent to the specified
-        position.
-        """
-        positions = []
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        for direction in directions:
-            potential_pos = (pos[0] + direction[0], pos[1] + direction[1])
-            if self.valid_position(*potential_pos):
-                positions.append(potential_pos)
-        return positions
+        position. The list is shared and must not be modified.
+        """
+        return self._adjacent[pos]
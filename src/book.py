@@ -0,0 +1,180 @@
+"""
+Opening book: precomputed moves for the first positions of a game
+"""
+import logging
+import struct
+from collections import deque
+from typing import Callable
+
+from go import Go
+from symmetry import canonical_hash, inverse_pos, transform_pos
+
+logger = logging.getLogger(__name__)
+
+# File layout: a header with a magic string, a format version and the board
+# size, followed by one record per position, sorted by hash.
+_MAGIC = b"GOBK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBB")
+_RECORD = struct.Struct("<QBB")
+# Row/column stored for a pass.
+_PASS_BYTE = 255
+
+PASS = (-1, -1)
+
+
+class OpeningBook:
+    """
+    Maps positions to the move to play in them.
+
+    Positions are keyed by their canonical hash, so a single entry covers
+    all eight symmetric versions of a position. Lookups are a single
+    dictionary access.
+    """
+
+    _size: int
+    _entries: dict[int, tuple[int, int]]
+    hits: int
+    lookups: int
+
+    def __init__(self, size: int,
+                 entries: dict[int, tuple[int, int]] | None = None) -> None:
+        """
+        Constructor
+
+        Args:
+            size: Number of squares on each side of the board
+            entries: Moves keyed by canonical hash, in canonical orientation
+        """
+        self._size = size
+        self._entries = {} if entries is None else entries
+        self.hits = 0
+        self.lookups = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the board the book is for
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def coverage(self) -> float:
+        """
+        Returns the fraction of lookups that found a move
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def add(self, game: Go, move: tuple[int, int]) -> None:
+        """
+        Adds the move to play in the current position of a game.
+        """
+        key, transform = canonical_hash(game)
+        if move != PASS:
+            move = transform_pos(move, transform, self._size)
+        self._entries[key] = move
+
+    def lookup(self, game: Go) -> tuple[int, int] | None:
+        """
+        Returns the book move for the current position of a game, or None
+        if the position is not in the book. Book moves that are not legal
+        in the game (because of the ko rule) are not returned.
+        """
+        if game.size != self._size:
+            return None
+        self.lookups += 1
+        key, transform = canonical_hash(game)
+        move = self._entries.get(key)
+        if move is None:
+            return None
+        if move != PASS:
+            move = inverse_pos(move, transform, self._size)
+            if not game.legal_move(move):
+                return None
+        self.hits += 1
+        logger.info("Opening book hit at turn %d: %s (%d/%d lookups)",
+                    game.num_of_turns, move, self.hits, self.lookups)
+        return move
+
+    def save(self, path: str) -> None:
+        """
+        Writes the book to a file.
+        """
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self._size))
+            for key in sorted(self._entries):
+                row, col = self._entries[key]
+                if (row, col) == PASS:
+                    row = col = _PASS_BYTE
+                file.write(_RECORD.pack(key, row, col))
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        """
+        Reads a book written by save.
+
+        Raises:
+            ValueError: If the file is not an opening book.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Not an opening book: {path}")
+        magic, version, size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or \
+            (len(data) - _HEADER.size) % _RECORD.size:
+            raise ValueError(f"Not an opening book: {path}")
+
+        entries = {}
+        for key, row, col in _RECORD.iter_unpack(data[_HEADER.size:]):
+            entries[key] = PASS if row == _PASS_BYTE else (row, col)
+        return cls(size, entries)
+
+    @classmethod
+    def build(cls, size: int, plies: int, width: int,
+              rank_moves: Callable[[Go], list[tuple[int, int]]]) -> \
+        "OpeningBook":
+        """
+        Builds a book by searching the positions reachable in the first
+        plies moves of a game along the moves ranked best.
+
+        Args:
+            size: Number of squares on each side of the board
+            plies: Number of moves from the start of the game to cover
+            width: Number of replies expanded in every position, the best
+            ranked first (so the move stored is always expanded); symmetric
+            replies are only expanded once
+            rank_moves: Returns the moves of a position, best first,
+            usually from a deep search; the first is the one stored
+
+        Returns: the book
+        """
+        book = cls(size)
+        queue = deque([(Go(size, 2), 0)])
+        seen = set()
+        while queue:
+            game, depth = queue.popleft()
+            key, _ = canonical_hash(game)
+            if key in seen:
+                continue
+            seen.add(key)
+            ranked = rank_moves(game)
+            book.add(game, ranked[0])
+            logger.info("Opening book: %d positions", len(book))
+            if depth + 1 >= plies:
+                continue
+
+            children: set[int] = set()
+            for move in ranked:
+                if len(children) == width:
+                    break
+                child = game.simulate_move(None if move == PASS else move)
+                assert isinstance(child, Go)
+                child_key, _ = canonical_hash(child)
+                if child_key not in seen and child_key not in children:
+                    children.add(child_key)
+                    queue.append((child, depth + 1))
+        return book
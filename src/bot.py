@@ -2,13 +2,53 @@
 Bot implementation for the Go game
 """
 
+import contextlib
+import cProfile
+import json
+import logging
+import math
+import os
+import pstats
 import random
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import deepcopy
+from typing import IO, Any, Callable, Iterable, Iterator, TextIO, TypedDict
 import click
-from go import Go
+from go import Go, ChainMapType
+from adjudicator import END, Adjudicator
+from book import OpeningBook
+from checkpoint import Checkpoint, CheckpointError
+from histogram import Histogram
 from botbase import BaseBot, SimulateBots
-from botbase import Players
+from botbase import Deadline, Players
+from cache import EvalCache
+from patterns import PatternTable
+from solver import SolutionTable, Solver
+from sprt import SPRT
+from symmetry import group_symmetric_moves, position_key
 
 PASS = (-1, -1)
+STRATEGIES = ['random', 'light', 'heuristic', 'smart', 'alphabeta', 'mcts',
+              'perfect']
+
+# Options of the strategies that take any in a bot spec (see
+# parse_bot_spec): the type of each option's value and the keyword
+# argument of the bot's constructor it sets.
+STRATEGY_OPTIONS: dict[str, dict[str, tuple[type, str]]] = {
+    'light': {'settled': (bool, 'skip_settled')},
+    'heuristic': {'ladders': (bool, 'ladders')},
+    'alphabeta': {'time': (float, 'time_limit'), 'depth': (int, 'max_depth'),
+                  'ponder': (int, 'ponder_width'),
+                  'influence': (bool, 'influence')},
+    'mcts': {'time': (float, 'time_limit'), 'playouts': (int, 'max_playouts'),
+             'rave': (bool, 'rave'), 'exploration': (float, 'exploration')},
+    'perfect': {'solve': (bool, 'solve_misses')},
+}
+
 class RandomBot(BaseBot):
     """Bot that makes random legal moves in a Go game."""
 
@@ -17,165 +57,1509 @@ class RandomBot(BaseBot):
     #init method inherited
 
     #show player inherited
-    def get_move(self, game: Go) -> tuple[int, int]:
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
         """
         gets the move to be made by a random bot
+
+        Every legal move and the pass are equally likely. Rather than
+        checking every position, empty positions are drawn at random
+        (without replacement) until one of them is legal, with one extra
+        slot that stands for the pass. The bot passes if the deadline
+        expires first.
         """
-        available_moves = [move for move in game.available_moves if \
-            game.legal_move(move)]
-        if not available_moves:
-            return PASS
-        else:
-            available_moves.append(PASS)
-            move = random.choice(available_moves)
-            return move
+        candidates = game.empty_positions()
+        candidates.append(PASS)
+        remaining = len(candidates)
+        while True:
+            if deadline is not None and deadline.expired():
+                return PASS
+            index = self.rng.randrange(remaining)
+            move = candidates[index]
+            if move == PASS or game.legal_move(move):
+                return move
+            remaining -= 1
+            candidates[index] = candidates[remaining]
 
-    def make_move(self, game: Go) -> None:
+    def make_move(self, game: Go, deadline: Deadline | None = None) -> None:
         """
         Make a random legal move in the game.
         """
 
-        random_move = self.get_move(game)
+        random_move = self.get_move(game, deadline)
         if random_move == PASS:
             game.pass_turn()
         else:
             game.apply_move(random_move)
 
 
+class PlayoutBot(RandomBot):
+    """
+    Light playout policy: random legal moves that never fill the bot's own
+    single-point eyes or capture the bot's own stones, and a pass only when
+    no other move remains.
+
+    Games between playout bots end on their own once both sides have only
+    eyes left, instead of running until the move cap.
+
+    The bot can also skip settled positions (see Go.settled): moves there
+    cannot change the result. Finding them takes a full-board pass, so they
+    are found again only every SETTLED_INTERVAL moves of the same game (the
+    same Go object, not reset or loaded since).
+    Settled areas only grow as long as no player plays inside them, which
+    holds when every player uses this policy. Opposing stones are then left
+    in settled regions, so such games should be scored with
+    Go.settled_scores.
+    """
+
+    SETTLED_INTERVAL = 8
+
+    _skip_settled: bool
+    _settled_game: weakref.ref[Go] | None
+    _settled_generation: int
+    _settled_turn: int
+    _settled: dict[tuple[int, int], int]
+
+    def __init__(self, player: Players, skip_settled: bool = False) -> None:
+        """
+        Initialize the bot.
+
+        player: color of the bot to identify bot.
+        skip_settled: If True, the bot never plays on settled positions.
+        """
+        super().__init__(player)
+        self._skip_settled = skip_settled
+        self._settled_game = None
+        self._settled_generation = 0
+        self._settled_turn = 0
+        self._settled = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        returns the state to pickle the bot with, without the settled
+        positions, as weak references cannot be pickled
+        """
+        state = self.__dict__.copy()
+        state['_settled_game'] = None
+        state['_settled'] = {}
+        return state
+
+    def settled(self, game: Go) -> dict[tuple[int, int], int]:
+        """
+        returns the settled positions of the game, found again if the game
+        is not the one they were last found for (or was reset or loaded
+        since) or is SETTLED_INTERVAL moves further along
+        """
+        if self._settled_game is None or self._settled_game() is not game \
+            or game.generation != self._settled_generation \
+            or not 0 <= game.num_of_turns - self._settled_turn \
+            < self.SETTLED_INTERVAL:
+            self._settled = game.settled()
+            self._settled_game = weakref.ref(game)
+            self._settled_generation = game.generation
+            self._settled_turn = game.num_of_turns
+        return self._settled
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        gets the move to be made by the playout policy, or a pass if the
+        deadline expires first
+        """
+        candidates = game.empty_positions()
+        if self._skip_settled:
+            settled = self.settled(game)
+            candidates = [move for move in candidates if move not in settled]
+        remaining = len(candidates)
+        while remaining:
+            if deadline is not None and deadline.expired():
+                return PASS
+            index = self.rng.randrange(remaining)
+            move = candidates[index]
+            if not game.is_eye(move, game.turn) and \
+                not game.is_self_capture(move) and game.legal_move(move):
+                return move
+            remaining -= 1
+            candidates[index] = candidates[remaining]
+        return PASS
+
+
+class HeuristicBot(RandomBot):
+    """
+    Bot that ranks moves by cheap local features, read from the liberty
+    counts of the chains next to each empty position (no simulations):
+
+    - capturing a chain in atari (bigger chains first),
+    - saving one of its own chains from atari,
+    - putting an opposing chain in atari,
+    - avoiding self-atari,
+    - and otherwise, gaining liberties.
+
+    If given a pattern table, the weight of the 3x3 pattern around each
+    position is added to its score. If it reads ladders, ataris that start
+    a working ladder score higher, and chains that a ladder captures anyway
+    are not worth saving. Ties are broken at random. Like the
+    playout policy, it never fills its own eyes or captures its own stones,
+    and passes only when no other move is left, so it also works as a
+    playout policy for the search bots.
+    """
+
+    CAPTURE = 100.0
+    SAVE = 80.0
+    ATARI = 10.0
+    SELF_ATARI = -50.0
+    LIBERTY = 1.0
+    PATTERN = 1.0
+    LADDER = 60.0
+
+    _patterns: PatternTable | None
+    _ladders: bool
+
+    def __init__(self, player: Players,
+                 patterns: PatternTable | None = None,
+                 ladders: bool = False) -> None:
+        """
+        Initialize the bot.
+
+        player: color of the bot to identify bot.
+        patterns: Weights of the 3x3 patterns around candidate moves.
+        ladders: If True, ataris and saving moves are checked by reading
+        ladders (see Go.read_ladder).
+        """
+        super().__init__(player)
+        self._patterns = patterns
+        self._ladders = ladders
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        gets the highest ranked legal move
+
+        If the deadline expires before every move has been scored (reading
+        ladders can take a while), the best of the moves scored so far is
+        returned, or a pass if none was.
+        """
+        # A move that reads ladders can take a millisecond or more to
+        # score, so read the clock at every one.
+        deadline = (deadline or Deadline()).within(None, stride=1)
+        chains = game.chains()
+        ranked = []
+        for move in game.empty_positions():
+            if deadline.expired():
+                break
+            score = self.score_move(game, move, chains)
+            if score is not None:
+                ranked.append((score, self.rng.random(), move))
+        while ranked:
+            best = max(ranked)
+            if game.legal_move(best[2]):
+                return best[2]
+            ranked.remove(best)
+        return PASS
+
+    def score_move(self, game: Go, move: tuple[int, int],
+                   chains: ChainMapType) -> float | None:
+        """
+        Scores an empty position for the player to move.
+
+        chains: Every chain on the board, as returned by Go.chains().
+        Returns: the score, or None if the move fills one of the player's
+        own eyes or captures the player's own stones.
+        """
+        turn = game.turn
+        score = 0.0
+        liberties = set()
+        captures = 0
+        saved = 0
+        surrounded = True
+        seen: list[tuple[int, set[tuple[int, int]], set[tuple[int, int]]]] \
+            = []
+        for adjacent_pos in game.adjacent_positions(move):
+            chain = chains.get(adjacent_pos)
+            if chain is None:
+                liberties.add(adjacent_pos)
+                surrounded = False
+                continue
+            if any(chain is other for other in seen):
+                if chain[0] != turn:
+                    surrounded = False
+                continue
+            seen.append(chain)
+            color, group, group_liberties = chain
+            if color == turn:
+                liberties |= group_liberties
+                if len(group_liberties) == 1 and not (
+                        self._ladders and game.read_ladder(adjacent_pos)):
+                    saved += len(group)
+                continue
+            surrounded = False
+            if len(group_liberties) == 1:
+                captures += len(group)
+                liberties.add(adjacent_pos)
+            elif len(group_liberties) == 2:
+                score += self.ATARI
+                if self._ladders and \
+                    game.read_ladder(adjacent_pos, attack=move):
+                    score += self.LADDER
+        liberties.discard(move)
+
+        if not liberties or surrounded and game.is_eye(move, turn):
+            return None
+        score += self.CAPTURE * captures + self.LIBERTY * len(liberties)
+        if self._patterns is not None:
+            score += self.PATTERN * \
+                self._patterns.weight(game.pattern_at(move), turn)
+        if len(liberties) == 1 and not captures:
+            score += self.SELF_ATARI
+        elif saved:
+            score += self.SAVE * saved
+        return score
+
+
 class SmartBot(BaseBot):
     """
     Bots that analyze not just the next move, but all the possible scenarios
     that will happen a few moves in the future, and choose the move that gets
     the player closer to winning.
+
+    Moves that lead to symmetric positions are looked at only once: at the
+    root, the bot picks at random among the moves of the best group, and
+    the replies of each group are weighted by its number of moves.
     """
     #init method inhereted
 
     #show player inhereted
 
 
-    def get_move(self, game: Go) -> tuple[int, int] | None:
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int] | None:
         """
         returns the move to be made by the bot
+
+        If the deadline expires before every move has been looked at, the
+        best of the moves looked at so far is returned, or a random legal
+        move if none was looked at in full.
         """
-        possible_moves = [
-            move for move in game.available_moves if game.legal_move(move)
-        ]
+        book_move = self.book_move(game)
+        if book_move is not None:
+            return book_move
+        # Every position looked at costs a legality check or a copy of the
+        # game, so read the clock at each.
+        deadline = (deadline or Deadline()).within(None, stride=1)
+        possible_moves, complete = self._legal_moves(game, deadline)
+        if not complete:
+            return self.rng.choice(possible_moves + [PASS])
         if not possible_moves:
             return None
         max_value: float | int = -1
-        best_moves = []
+        best_moves: list[tuple[int, int]] = []
         possible_moves.append(PASS)
-        for move in possible_moves:
-            if move == PASS:
-                game_copy = game.simulate_move(None)
-            else:
-                game_copy = game.simulate_move(move)
-            next_moves = [
-                move for move in game_copy.available_moves if \
-                game_copy.legal_move(move)
-            ]
-            next_moves.append(PASS)
-            total_pieces = 0
-            for next_move in next_moves:
-                if next_move == PASS:
-                    game_copy2 = game_copy.simulate_move(None)
-                else:
-                    game_copy2 = game_copy.simulate_move(next_move)
-                total_pieces += game_copy2.scores()[self.show_player()]
-
-            value = total_pieces / len(next_moves) if next_moves else 0
+        for group in group_symmetric_moves(game, possible_moves):
+            value = self._reply_value(game, group[0], deadline)
+            if value is None:
+                break
             if value > max_value:
                 max_value = value
-                best_moves = [move]
+                best_moves = list(group)
             elif value == max_value:
-                best_moves.append(move)
+                best_moves.extend(group)
         if best_moves:
-            return random.choice(best_moves)
+            return self.rng.choice(best_moves)
         else:
+            return self.rng.choice(possible_moves)
+
+    @staticmethod
+    def _legal_moves(game: Go, deadline: Deadline) -> \
+        tuple[list[tuple[int, int]], bool]:
+        """
+        returns the legal moves of the game (without the pass) and whether
+        they were all found before the deadline expired
+        """
+        moves: list[tuple[int, int]] = []
+        for move in game.empty_positions():
+            if deadline.expired():
+                return moves, False
+            if game.legal_move(move):
+                moves.append(move)
+        return moves, True
+
+    def _reply_value(self, game: Go, move: tuple[int, int],
+                     deadline: Deadline) -> float | None:
+        """
+        returns the bot's score after a move and a reply, averaged over the
+        replies, or None if the deadline expires before every reply has
+        been looked at
+        """
+        game_copy = game.simulate_move(None if move == PASS else move)
+        assert isinstance(game_copy, Go)
+        next_moves, complete = self._legal_moves(game_copy, deadline)
+        if not complete:
             return None
+        next_moves.append(PASS)
+        total_pieces = 0
+        for next_group in group_symmetric_moves(game_copy, next_moves):
+            if deadline.expired():
+                return None
+            next_move = next_group[0]
+            game_copy2 = game_copy.simulate_move(
+                None if next_move == PASS else next_move)
+            assert isinstance(game_copy2, Go)
+            total_pieces += len(next_group) * \
+                self.cached_scores(game_copy2)[self.show_player()]
+        return total_pieces / len(next_moves)
 
-    def make_move(self, game: Go) -> None:
+    def make_move(self, game: Go, deadline: Deadline | None = None) -> None:
         """
         Make a legal smart (MinMax) move in the game.
         """
-        best_move = self.get_move(game)
+        best_move = self.get_move(game, deadline)
         if best_move is None or best_move == PASS:
             game.pass_turn()
         else:
             game.apply_move(best_move)
 
+class _SearchTimeout(Exception):
+    """Raised inside a search when its time budget has run out."""
+
+
+class AlphaBetaBot(BaseBot):
+    """
+    Bot that runs a negamax alpha-beta search with iterative deepening.
+
+    The search deepens one ply at a time until the time limit runs out, and
+    returns the best move of the last iteration that completed. Moves are
+    ordered so that captures, ataris and moves that caused cutoffs earlier
+    (the history heuristic) are searched first. Leaves are evaluated with
+    Go.scores(), or with Go.estimated_scores() if the bot evaluates by
+    influence, which judges unfinished positions better.
+
+    The bot can ponder: while another player is thinking it searches the
+    positions after their most likely replies in a background thread. When
+    the reply actually played is one of them, the next search resumes from
+    the depth pondering reached instead of starting over.
+    """
+
+    _time_limit: float
+    _max_depth: int
+    _ponder_width: int
+    _history: dict[tuple[int, int], int]
+    _deadline: Deadline
+    _pondered: dict[tuple[int, tuple[tuple[int | None, ...], ...]],
+                    tuple[int, tuple[int, int]]]
+    _ponder_thread: threading.Thread | None
+    _influence: bool
+    completed_depth: int
+    ponder_hits: int
+    root_moves: list[tuple[int, int]]
+
+    def __init__(self, player: Players, time_limit: float = 1.0,
+                 max_depth: int = 16, ponder_width: int = 8,
+                 book: OpeningBook | None = None,
+                 cache: EvalCache[dict[int, int]] | None = None,
+                 influence: bool = False) -> None:
+        """
+        Initialize the bot.
+
+        player: color of the bot to identify bot.
+        time_limit: Number of seconds the bot may think about each move.
+        max_depth: Deepest iteration the search will attempt.
+        ponder_width: Number of opponent replies searched while pondering.
+        book: Opening book the bot plays from before it starts searching.
+        cache: Cache of the scores of the positions evaluated.
+        influence: If True, leaves are evaluated by estimated ownership.
+        """
+        super().__init__(player, book, cache)
+        self._influence = influence
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._ponder_width = ponder_width
+        self._history = {}
+        self._deadline = Deadline(0.0)
+        self._pondered = {}
+        self._ponder_thread = None
+        self.completed_depth = 0
+        self.ponder_hits = 0
+        self.root_moves = []
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        returns the best move of the deepest completed search iteration
+
+        The search stops at the time limit, or at the deadline if that comes
+        first. If that happens before the root moves have been found and
+        ordered, the move found by pondering, if any, or else a random legal
+        move is returned.
+
+        The root moves searched are left in root_moves, best first: the
+        best moves of the iterations, deepest first, then the rest in the
+        order they were searched (empty if there was no search).
+        """
+        self.root_moves = []
+        self.stop_pondering()
+        pondered = self._pondered.pop(position_key(game), None)
+        self._pondered = {}
+        book_move = self.book_move(game)
+        if book_move is not None:
+            return book_move
+        if deadline is None:
+            deadline = Deadline()
+        # Every node costs a full legality scan, so check the clock at each,
+        # and keep some time back to unwind the search.
+        self._deadline = deadline.within(self._time_limit, stride=1,
+                                         reserve=0.05)
+        self.completed_depth = 0
+        if self._influence:
+            game = self._influence_copy(game)
+
+        moves: list[tuple[int, int]] = []
+        try:
+            for move in game.empty_positions():
+                self._check_time()
+                if game.legal_move(move):
+                    moves.append(move)
+            moves = self.order_moves(game, moves)
+        except _SearchTimeout:
+            if pondered is None:
+                return self.rng.choice(moves + [PASS])
+            self.ponder_hits += 1
+            self.completed_depth, best_move = pondered
+            return best_move
+        if not moves:
+            return PASS
+        moves.append(PASS)
+        self.root_moves = moves
+        best_move = moves[0]
+        if pondered is None:
+            self._history = {}
+        else:
+            self.ponder_hits += 1
+            self.completed_depth, best_move = pondered
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+        for depth in range(self.completed_depth + 1, self._max_depth + 1):
+            try:
+                best_move = self._search_root(game, moves, depth)
+            except _SearchTimeout:
+                break
+            self.completed_depth = depth
+            # Search the principal move first in the next iteration.
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+        return best_move
+
+    def make_move(self, game: Go, deadline: Deadline | None = None) -> None:
+        """
+        Make the move chosen by the alpha-beta search in the game.
+        """
+        best_move = self.get_move(game, deadline)
+        if best_move == PASS:
+            game.pass_turn()
+        else:
+            game.apply_move(best_move)
+
+    def start_pondering(self, game: Go) -> None:
+        """
+        Starts searching the likely replies to the current position in a
+        background thread. See BaseBot.start_pondering.
+        """
+        self.stop_pondering()
+        self._pondered = {}
+        self._history = {}
+        self._deadline = Deadline(stride=1)
+        if self._influence:
+            game = self._influence_copy(game)
+        else:
+            game = deepcopy(game)
+        self._ponder_thread = threading.Thread(
+            target=self._ponder, args=(game,), daemon=True
+        )
+        self._ponder_thread.start()
+
+    def stop_pondering(self) -> None:
+        """
+        Stops the background search, keeping what it found.
+        """
+        if self._ponder_thread is None:
+            return
+        self._deadline.cancel()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+
+    def _ponder(self, game: Go) -> None:
+        """
+        Deepens the search of every likely reply one ply at a time, until
+        the pondering is stopped. Runs in the pondering thread.
+        """
+        try:
+            replies = self.order_moves(game, self._legal_moves(game))
+            replies = replies[:self._ponder_width] + [PASS]
+            children = []
+            for reply in replies:
+                child = game.simulate_move(None if reply == PASS else reply)
+                assert isinstance(child, Go)
+                if not child.done:
+                    moves = self.order_moves(child,
+                                             self._legal_moves(child))
+                    children.append((child, moves + [PASS]))
+
+            for depth in range(1, self._max_depth + 1):
+                for child, moves in children:
+                    best_move = self._search_root(child, moves, depth)
+                    self._pondered[position_key(child)] = (depth, best_move)
+                    moves.remove(best_move)
+                    moves.insert(0, best_move)
+        except _SearchTimeout:
+            pass
+
+    @staticmethod
+    def _influence_copy(game: Go) -> Go:
+        """
+        Returns a copy of the game that keeps the influence of its pieces,
+        so that the positions searched from it update the influence instead
+        of computing it from scratch.
+        """
+        game = deepcopy(game)
+        game.estimated_scores()
+        return game
+
+    def evaluate(self, game: Go) -> float:
+        """
+        Evaluates a position from the point of view of the player to move:
+        their score minus the best score among the other players.
+        """
+        if self._influence:
+            scores = game.estimated_scores()
+        else:
+            scores = self.cached_scores(game)
+        turn = game.turn
+        return scores[turn] - max(score for player, score in scores.items()
+                                  if player != turn)
+
+    def order_moves(self, game: Go, moves: list[tuple[int, int]]) -> \
+        list[tuple[int, int]]:
+        """
+        Sorts moves so the most promising ones are searched first.
+
+        Captures come first (larger captures before smaller ones), then
+        moves that save one of the player's chains from atari, then moves
+        that put an opposing chain in atari. Ties are broken by the history
+        heuristic. Checks the time limit at every move.
+        """
+        chains: dict[tuple[int, int],
+                     tuple[set[tuple[int, int]], set[tuple[int, int]]]] = {}
+        priorities = {}
+        for move in moves:
+            self._check_time()
+            priority = 0
+            for adjacent_pos in game.adjacent_positions(move):
+                piece = game.piece_at(adjacent_pos)
+                if piece is None:
+                    continue
+                if adjacent_pos not in chains:
+                    chain = game.chain(adjacent_pos)
+                    for stone in chain[0]:
+                        chains[stone] = chain
+                group, liberties = chains[adjacent_pos]
+                if piece != game.turn and len(liberties) == 1:
+                    priority += 1000 * len(group)
+                elif piece == game.turn and len(liberties) == 1:
+                    priority += 500
+                elif piece != game.turn and len(liberties) == 2:
+                    priority += 100
+            priorities[move] = priority + self._history.get(move, 0)
+        return sorted(moves, key=lambda move: -priorities[move])
+
+    def _check_time(self) -> None:
+        """
+        Aborts the current iteration if the time limit has run out.
+        """
+        if self._deadline.expired():
+            raise _SearchTimeout
+
+    def _legal_moves(self, game: Go) -> list[tuple[int, int]]:
+        """
+        Returns the legal moves of the game (without the pass), checking the
+        time limit at every position.
+        """
+        moves: list[tuple[int, int]] = []
+        for move in game.empty_positions():
+            self._check_time()
+            if game.legal_move(move):
+                moves.append(move)
+        return moves
+
+    def _search_root(self, game: Go, moves: list[tuple[int, int]],
+                     depth: int) -> tuple[int, int]:
+        """
+        Searches every root move to the given depth and returns the best.
+        """
+        alpha = -math.inf
+        best_move = moves[0]
+        for move in moves:
+            child = game.simulate_move(None if move == PASS else move)
+            assert isinstance(child, Go)
+            value = -self._negamax(child, depth - 1, -math.inf, -alpha)
+            if value > alpha:
+                alpha = value
+                best_move = move
+        return best_move
+
+    def _negamax(self, game: Go, depth: int, alpha: float,
+                 beta: float) -> float:
+        """
+        Returns the negamax value of a position for the player to move.
+        """
+        self._check_time()
+        if depth == 0 or game.done:
+            return self.evaluate(game)
+
+        moves = self.order_moves(game, self._legal_moves(game))
+        moves.append(PASS)
+        best_value = -math.inf
+        for move in moves:
+            child = game.simulate_move(None if move == PASS else move)
+            assert isinstance(child, Go)
+            value = -self._negamax(child, depth - 1, -beta, -alpha)
+            best_value = max(best_value, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                if move != PASS:
+                    self._history[move] = \
+                        self._history.get(move, 0) + depth * depth
+                break
+        return best_value
+
+
+class _Node:
+    """
+    A node of the Monte Carlo search tree: the position reached by a move,
+    with the statistics of the playouts that went through it.
+    """
+
+    move: tuple[int, int]
+    player: int
+    parent: "_Node | None"
+    children: list["_Node"]
+    expanded: bool
+    visits: int
+    wins: float
+    amaf_visits: int
+    amaf_wins: float
+
+    def __init__(self, move: tuple[int, int], player: int,
+                 parent: "_Node | None") -> None:
+        """
+        move: The move that leads to the node (PASS at the root).
+        player: The player who made the move.
+        parent: The node the move was made from.
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.expanded = False
+        self.visits = 0
+        self.wins = 0.0
+        self.amaf_visits = 0
+        self.amaf_wins = 0.0
+
+
+class MCTSBot(BaseBot):
+    """
+    Bot that runs Monte Carlo tree search (UCT): it plays out many games
+    with a fast policy, grows a tree of the positions visited, and plays
+    the move whose subtree was visited most.
+
+    With RAVE, every playout also updates the all-moves-as-first (AMAF)
+    statistics of every move either player made later in it, from every
+    node it went through. Early on, when a move has few visits of its own,
+    its value is mostly the AMAF value; the weight of the AMAF value falls
+    as sqrt(k / (3n + k)) with the n visits of the move and the
+    equivalence parameter k. This gives reliable values from far fewer
+    playouts.
+    """
+
+    _time_limit: float
+    _max_playouts: int | None
+    _rave: bool
+    _equivalence: float
+    _exploration: float
+    _policy: BaseBot
+    playouts: int
+
+    def __init__(self, player: Players, time_limit: float = 1.0,
+                 max_playouts: int | None = None, rave: bool = True,
+                 equivalence: float = 1000.0, exploration: float = 0.4,
+                 policy: BaseBot | None = None,
+                 book: OpeningBook | None = None) -> None:
+        """
+        Initialize the bot.
+
+        player: color of the bot to identify bot.
+        time_limit: Number of seconds the bot may think about each move.
+        max_playouts: Largest number of playouts per move, if any.
+        rave: If True, moves are selected with AMAF statistics too.
+        equivalence: Number of visits of a move at which its own value and
+        its AMAF value weigh about the same.
+        exploration: Weight of the UCT exploration term.
+        policy: Bot that plays out the games (by default, PlayoutBot
+        skipping settled positions). It must play for whichever player is
+        to move.
+        book: Opening book the bot plays from before it starts searching.
+        """
+        super().__init__(player, book)
+        self._time_limit = time_limit
+        self._max_playouts = max_playouts
+        self._rave = rave
+        self._equivalence = equivalence
+        self._exploration = exploration
+        if policy is None:
+            policy = PlayoutBot(player, skip_settled=True)
+        self._policy = policy
+        self.playouts = 0
+
+    def use_rng(self, rng: random.Random) -> None:
+        """
+        Makes the bot and its playout policy draw their random numbers from
+        rng.
+        """
+        super().use_rng(rng)
+        self._policy.use_rng(rng)
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        returns the most visited move after searching until the time limit
+        (or the deadline, if it comes first) or the playout limit
+
+        A playout cut short by the deadline is not counted. If the deadline
+        expires while the root is being expanded, one of the moves found so
+        far is returned, or a pass if none was.
+        """
+        book_move = self.book_move(game)
+        if book_move is not None:
+            return book_move
+        if deadline is None:
+            deadline = Deadline()
+        deadline = deadline.within(self._time_limit, stride=1, reserve=0.05)
+        previous = (game.turn - 2) % game.num_players + 1
+        root = _Node(PASS, previous, None)
+        self.playouts = 0
+        while self._max_playouts is None or \
+            self.playouts < self._max_playouts:
+            if deadline.expired():
+                break
+            if self._iterate(root, deepcopy(game), deadline):
+                self.playouts += 1
+        if not root.children:
+            return PASS
+        return max(root.children, key=lambda child: child.visits).move
+
+    def make_move(self, game: Go, deadline: Deadline | None = None) -> None:
+        """
+        Make the move chosen by the tree search in the game.
+        """
+        move = self.get_move(game, deadline)
+        if move == PASS:
+            game.pass_turn()
+        else:
+            game.apply_move(move)
+
+    def _iterate(self, root: _Node, game: Go, deadline: Deadline) -> bool:
+        """
+        Runs one playout: selects a path down the tree, expands its last
+        node, plays the game out and updates the statistics along the path.
+        game is a copy of the root position and is played on.
+
+        Returns: False if the deadline expired before the playout ended, in
+        which case no statistics are updated.
+        """
+        node = root
+        played: list[tuple[int, tuple[int, int]]] = []
+        while not game.done:
+            if not node.expanded:
+                self._expand(node, game, deadline)
+                if not node.expanded:
+                    return False
+                node = self._select(node)
+                self._play(game, node.move)
+                played.append((node.player, node.move))
+                break
+            node = self._select(node)
+            self._play(game, node.move)
+            played.append((node.player, node.move))
+
+        max_moves = 3 * game.size * game.size
+        while not game.done and len(played) < max_moves:
+            if deadline.expired():
+                return False
+            player = game.turn
+            move = self._policy.get_move(game) or PASS
+            self._play(game, move)
+            played.append((player, move))
+
+        self._update(node, played, self._rewards(game))
+        return True
+
+    def _expand(self, node: _Node, game: Go, deadline: Deadline) -> None:
+        """
+        Adds a child for every legal move that does not fill one of the
+        mover's own eyes. Like the playout policy, the search passes only
+        when there is no such move: a pass has no AMAF statistics, and its
+        noisy early results would otherwise draw visits from real moves.
+
+        If the deadline expires first, the node keeps the children found so
+        far but is not marked as expanded.
+        """
+        turn = game.turn
+        for move in game.empty_positions():
+            if deadline.expired():
+                return
+            if not game.is_eye(move, turn) and game.legal_move(move):
+                node.children.append(_Node(move, turn, node))
+        if not node.children:
+            node.children.append(_Node(PASS, turn, node))
+        node.expanded = True
+
+    def _select(self, node: _Node) -> _Node:
+        """
+        Returns the child of a node with the best blend of its own value,
+        its AMAF value and the UCT exploration term. Children that have
+        never been tried nor seen in a playout come first.
+        """
+        log_visits = math.log(node.visits + 1)
+        best_value = -math.inf
+        best_children: list[_Node] = []
+        for child in node.children:
+            if child.visits == 0 and \
+                (not self._rave or child.amaf_visits == 0):
+                value = math.inf
+            else:
+                value = self._value(child) + self._exploration * \
+                    math.sqrt(log_visits / (child.visits + 1))
+            if value > best_value:
+                best_value = value
+                best_children = [child]
+            elif value == best_value:
+                best_children.append(child)
+        return self.rng.choice(best_children)
+
+    def _value(self, child: _Node) -> float:
+        """
+        Returns the estimated value of a move, for the player who made it
+        """
+        value = child.wins / child.visits if child.visits else 0.0
+        if not self._rave or child.amaf_visits == 0:
+            return value
+        amaf_value = child.amaf_wins / child.amaf_visits
+        beta = math.sqrt(self._equivalence /
+                         (3 * child.visits + self._equivalence))
+        return (1 - beta) * value + beta * amaf_value
+
+    @staticmethod
+    def _play(game: Go, move: tuple[int, int]) -> None:
+        """
+        Plays a move or a pass.
+        """
+        if move == PASS:
+            game.pass_turn()
+        else:
+            game.apply_move(move)
+
+    @staticmethod
+    def _rewards(game: Go) -> dict[int, float]:
+        """
+        Returns the reward of every player at the end of a playout: 1
+        shared among the players with the best score, counting settled
+        positions for their owners.
+        """
+        scores = game.settled_scores()
+        best = max(scores.values())
+        winners = [player for player, score in scores.items()
+                   if score == best]
+        return {player: (1 / len(winners) if player in winners else 0.0)
+                for player in scores}
+
+    def _update(self, node: _Node, played: list[tuple[int, tuple[int, int]]],
+                rewards: dict[int, float]) -> None:
+        """
+        Adds the result of a playout to the nodes on the path from the root
+        to node. With RAVE, the children of every node on the path whose
+        move was later made by the same player get an AMAF update too.
+        """
+        depth = 0
+        parent = node.parent
+        while parent is not None:
+            depth += 1
+            parent = parent.parent
+        # played[depth:] are the moves made below node; walking up, each
+        # node's move joins the moves made after its parent's position.
+        later = {entry for entry in played[depth:] if entry[1] != PASS}
+        current: _Node | None = node
+        while current is not None:
+            current.visits += 1
+            current.wins += rewards.get(current.player, 0.0)
+            if self._rave:
+                for child in current.children:
+                    if (child.player, child.move) in later:
+                        child.amaf_visits += 1
+                        child.amaf_wins += rewards.get(child.player, 0.0)
+            if current.move != PASS:
+                later.add((current.player, current.move))
+            current = current.parent
+
+
+class PerfectBot(BaseBot):
+    """
+    Bot that plays the best move from a solution table computed by the
+    exact solver. The table only holds exact values, so positions reached
+    along other lines of play may be missing from it: those are solved on
+    the spot if the bot is told to (and the solution added to the table),
+    and otherwise get a random move.
+    """
+
+    _table: SolutionTable
+    _solver: Solver | None
+    _fallback: RandomBot
+    misses: int
+
+    def __init__(self, player: Players, table: SolutionTable,
+                 solve_misses: bool = False) -> None:
+        """
+        Initialize the bot.
+
+        player: color of the bot to identify bot.
+        table: Solved positions for the size of board the bot plays on.
+        solve_misses: Whether to solve positions missing from the table,
+        which only answers in time on the tiniest boards.
+        """
+        super().__init__(player)
+        self._table = table
+        self._solver = Solver(table.size, table) if solve_misses else None
+        self._fallback = RandomBot(player)
+        self.misses = 0
+
+    def use_rng(self, rng: random.Random) -> None:
+        """
+        Makes the bot and its fallback draw their random numbers from rng.
+        """
+        super().use_rng(rng)
+        self._fallback.use_rng(rng)
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        returns the best move according to the solution table, solving the
+        position first if it is missing and the bot solves misses
+        """
+        entry = self._table.lookup(game)
+        if entry is not None:
+            move = entry[1]
+            if move == PASS or game.legal_move(move):
+                return move
+        self.misses += 1
+        if entry is None and self._solver is not None and \
+            game.size == self._table.size:
+            # The position a solve starts from always gets an entry.
+            self._solver.solve(game)
+            entry = self._table.lookup(game)
+            assert entry is not None
+            return entry[1]
+        return self._fallback.get_move(game, deadline)
+
+    def make_move(self, game: Go, deadline: Deadline | None = None) -> None:
+        """
+        Make the best move according to the solution table in the game.
+        """
+        move = self.get_move(game, deadline)
+        if move == PASS:
+            game.pass_turn()
+        else:
+            game.apply_move(move)
+
+
+def parse_bot_spec(spec: str) -> tuple[str, dict[str, Any]]:
+    """
+    Splits a bot spec into the name of its strategy and the keyword
+    arguments of its options.
+
+    A spec is the name of a strategy (one of STRATEGIES), optionally
+    followed by a colon and comma-separated options of the strategy (see
+    STRATEGY_OPTIONS), as in "alphabeta:time=2,depth=4". Boolean options
+    take true/false, yes/no, on/off or 1/0.
+
+    Raises ValueError if the strategy or an option is unknown or a value
+    is not valid.
+    """
+    strategy, _, options = spec.partition(':')
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    known = STRATEGY_OPTIONS.get(strategy, {})
+    kwargs: dict[str, Any] = {}
+    for option in options.split(',') if options else []:
+        name, equals, text = option.partition('=')
+        if not equals or name not in known:
+            raise ValueError(f"Unknown option of {strategy}: {option} "
+                             f"(options: {', '.join(known) or 'none'})")
+        kind, keyword = known[name]
+        if kind is bool:
+            if text.lower() not in ('true', 'yes', 'on', '1', 'false', 'no',
+                                    'off', '0'):
+                raise ValueError(f"Not a boolean for {name}: {text}")
+            kwargs[keyword] = text.lower() in ('true', 'yes', 'on', '1')
+        else:
+            try:
+                kwargs[keyword] = kind(text)
+            except ValueError as error:
+                raise ValueError(f"Not a valid {name} for {strategy}: "
+                                 f"{text}") from error
+    return strategy, kwargs
+
+
+def make_bot(spec: str, player: Players,
+             book: OpeningBook | None = None,
+             table: SolutionTable | None = None) -> BaseBot:
+    """
+    Creates a bot from the spec of its strategy and options.
+
+    spec: The name of a strategy, with any options (see parse_bot_spec).
+    player: color of the bot.
+    book: Opening book for the bots that search.
+    table: Solution table for the perfect bot.
+    """
+    strategy, options = parse_bot_spec(spec)
+    if strategy == 'perfect':
+        if table is None:
+            raise ValueError("The perfect strategy needs a solution table")
+        return PerfectBot(player, table, **options)
+    if strategy == 'random':
+        return RandomBot(player)
+    if strategy == 'light':
+        return PlayoutBot(player, **options)
+    if strategy == 'heuristic':
+        return HeuristicBot(player, PatternTable.default(), **options)
+    if strategy == 'smart':
+        return SmartBot(player, book, EvalCache())
+    if strategy == 'alphabeta':
+        return AlphaBetaBot(player, book=book, cache=EvalCache(), **options)
+    assert strategy == 'mcts'
+    return MCTSBot(player, book=book, **options)
+
+
+class BotSpec(click.ParamType):
+    """
+    Click parameter type of a bot spec (see parse_bot_spec).
+    """
+
+    name = 'strategy'
+
+    def convert(self, value: Any, param: click.Parameter | None,
+                ctx: click.Context | None) -> str:
+        """
+        Checks that a value is a valid bot spec and returns it.
+        """
+        try:
+            parse_bot_spec(value)
+        except ValueError as error:
+            self.fail(str(error), param, ctx)
+        return str(value)
+
+
+BOT_SPEC = BotSpec()
+
+
+class GameRecord(TypedDict):
+    """
+    What a simulation records about one finished game.
+
+    seed: The seed the game was played from (see Simulation.seed_bots).
+    moves: The moves played, with PASS for passes and timeouts.
+    scores: The final scores, from Go.scores.
+    outcome: The winners (see Adjudicator.winners).
+    reason: Why the game stopped (one of the reasons in adjudicator).
+    num_moves: The number of moves played.
+    think_times: The number of seconds each move took, for every player.
+    timeouts: The number of moves each player answered too late.
+    seconds: The number of seconds the whole game took.
+    """
+
+    seed: int
+    moves: list[tuple[int, int]]
+    scores: dict[int, int]
+    outcome: list[int]
+    reason: str
+    num_moves: int
+    think_times: dict[int, list[float]]
+    timeouts: dict[int, int]
+    seconds: float
+
+
 class Simulation(SimulateBots):
     """Simulates a number of games between two RandomBots."""
 
     game: Go
-    bots: list[BaseBot]
+    timeouts: dict[Players, int]
+    game_times: Histogram
+    slowest_game: tuple[int, float] | None
+    think_times: dict[Players, Histogram]
+    last_run: tuple[int, int, float] | None
+    settings: dict[str, Any]
 
-    def __init__(self, game: Go, bots: list[BaseBot]) -> None:
+    def __init__(self, game: Go, bots: list[BaseBot],
+                 move_time_limit: float | None = None,
+                 output: IO[str] | None = None,
+                 adjudicator: Adjudicator | None = None,
+                 settings: dict[str, Any] | None = None) -> None:
         """
         Initialize the simulation with the game.
 
         game: The game the bots will be playing.
+        bots: The bots playing the game.
+        move_time_limit: If given, the number of seconds each bot has for
+        every move. A bot that answers late has its move replaced by a pass
+        and a timeout recorded against it.
+        output: If given, the record of every game (see GameRecord) is
+        written to it as a line of JSON as soon as the game is over.
+        adjudicator: Decides when games stop and who won them (by default,
+        an Adjudicator with its default settings).
+        settings: What the games are played with, saved with checkpoints
+        so that a run with other settings does not resume from them (by
+        default, the board size, the classes of the bots, the move time
+        limit and the settings of the adjudicator).
         """
         self._game = game
         self._bots = bots
+        self._move_time_limit = move_time_limit
+        self._output = output
+        self._adjudicator = adjudicator or Adjudicator()
         self._wins = {bot.show_player(): 0 for bot in bots}
         self._ties = 0
         self.total_moves = 0
+        self.timeouts = {bot.show_player(): 0 for bot in bots}
+        self.game_times = Histogram()
+        self.slowest_game = None
+        self.think_times = {bot.show_player(): Histogram() for bot in bots}
+        self.last_run = None
+        if settings is None:
+            settings = {'size': game.size,
+                        'bots': [type(bot).__name__ for bot in bots],
+                        'move_time': move_time_limit,
+                        'adjudicator': self._adjudicator.settings}
+        self.settings = settings
+
+    @property
+    def bots(self) -> list[BaseBot]:
+        """
+        returns the bots playing the games
+        """
+        return self._bots
 
     def reset_game(self) -> None:
         """
-        resets a game to its default, beginning state
+        resets a game to its default, beginning state, in place (see
+        Go.reset)
         """
-        size = self._game.size
-        num_of_players = self._game.num_players
-        self._game = Go(size, num_of_players)
+        self._game.reset()
 
-    def simulate_games(self, num_of_games: int) -> \
+    def simulate_games(self, num_of_games: int, jobs: int = 1,
+                       seed: int | None = None,
+                       checkpoint: Checkpoint | None = None,
+                       resume: bool = False) -> \
         tuple[float, float, float, float]:
         """
         Simulate a number of games and return the win percentages.
 
+        Every game has its own seed (see game_seeds), recorded with it
+        (see GameRecord), from which the bots' random number generators are
+        seeded when it starts (see seed_bots); each game can be played
+        again on its own from its seed. With more than one job, the games
+        are shared among that many worker processes, each playing copies of
+        the bots; the games are recorded in the same order as in a serial
+        run. Games played again, or played in parallel, are the same as the
+        originals for bots that do not depend on the clock.
+
+        With a checkpoint, the state of the run (see state) is saved to it
+        every so often and once the run is over. A resumed run starts from
+        the saved state, with its seed, and plays only the games left.
+
         param num_of_games: The number of games to simulate.
+        param jobs: Number of worker processes.
+        param seed: Seed of the games' seeds, drawn from the random module
+        if it is not given.
+        param checkpoint: Where to save the state of the run.
+        param resume: Whether to resume from the checkpoint, if it has been
+        saved before.
         return: A tuple of the win percentages for bot1, bot2, and ties.
+        raises CheckpointError: If the checkpoint cannot be resumed from.
         """
-        for _ in range(num_of_games):
-            while not self._game.done:
-                if self._game.num_of_turns == 256:
-                    break
-                for bot in self._bots:
-                    if self._game.turn == bot.show_player():
-                        bot.make_move(self._game)
-                        self.total_moves += 1
-                    if self._game.done:
-                        break
-            self.update_results(self._game.outcome)
-            self.reset_game()
+        self._run(num_of_games, jobs, seed, checkpoint, resume)
         return self.calculate_percentages(num_of_games)
 
+    def run_sprt(self, sprt: SPRT, max_games: int, jobs: int = 1,
+                 seed: int | None = None,
+                 checkpoint: Checkpoint | None = None,
+                 resume: bool = False) -> \
+        tuple[float, float, float, float]:
+        """
+        Plays games, like simulate_games, until the sequential probability
+        ratio test accepts one of its hypotheses about the strength of the
+        first bot relative to the second, or until max_games have been
+        played. Every game's score for the first bot is added to the test,
+        whose results are saved with the checkpoint, if any.
+
+        return: The win percentages for bot1, bot2, and ties, and the
+        average number of moves, of the games played.
+        """
+        games = self._run(max_games, jobs, seed, checkpoint, resume, sprt)
+        return self.calculate_percentages(games)
+
+    def _run(self, num_of_games: int, jobs: int, seed: int | None,
+             checkpoint: Checkpoint | None, resume: bool,
+             sprt: SPRT | None = None) -> int:
+        """
+        Plays the games of a run, resuming it from the checkpoint if asked
+        to, saving checkpoints along the way, and stopping early if the
+        SPRT decides. Returns the number of games played in the whole run.
+
+        The games and moves played by this call (not those restored from
+        the checkpoint) and the seconds it took are kept in last_run.
+        """
+        state = None
+        if checkpoint is not None and resume:
+            state = checkpoint.load()
+            if state is not None:
+                # Compared as saved, with tuples turned into lists.
+                settings = json.loads(json.dumps(self.settings))
+                if state['num_of_games'] != num_of_games or \
+                    seed not in (None, state['seed']) or \
+                    state['settings'] != settings:
+                    raise CheckpointError(
+                        f"The checkpoint is of a different run: "
+                        f"{checkpoint.path}")
+                seed = state['seed']
+                self.restore(state, sprt)
+        if seed is None:
+            seed = random.getrandbits(32)
+        games = 0 if state is None else state['games']
+        start, start_games, start_moves = \
+            time.perf_counter(), games, self.total_moves
+        first = int(self._bots[0].show_player())
+        seeds = game_seeds(seed, num_of_games)[games:]
+        if sprt is None or sprt.decision is None:
+            for record in self._play(seeds, jobs):
+                self.record_game(record)
+                games += 1
+                if sprt is not None:
+                    outcome = record['outcome']
+                    sprt.add(1 / len(outcome) if first in outcome else 0.0)
+                    if sprt.decision is not None:
+                        break
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint.save(self.state(seed, num_of_games, games,
+                                               sprt))
+        if checkpoint is not None:
+            checkpoint.save(self.state(seed, num_of_games, games, sprt))
+        self.last_run = (games - start_games, self.total_moves - start_moves,
+                         time.perf_counter() - start)
+        return games
+
+    def state(self, seed: int, num_of_games: int, games: int,
+              sprt: SPRT | None = None) -> dict[str, Any]:
+        """
+        Returns the state of a run of num_of_games games from a seed, of
+        which the first games have been played: the settings, the counts,
+        the game and think times, the results of the SPRT, if any, and the
+        size of the output after the last of those games (None if the
+        output cannot tell).
+        """
+        offset = None
+        if self._output is not None and self._output.seekable():
+            offset = self._output.tell()
+        return {
+            'seed': seed,
+            'num_of_games': num_of_games,
+            'settings': self.settings,
+            'games': games,
+            'wins': {int(player): count
+                     for player, count in self._wins.items()},
+            'ties': self._ties,
+            'total_moves': self.total_moves,
+            'timeouts': {int(player): count
+                         for player, count in self.timeouts.items()},
+            'game_times': self.game_times.state(),
+            'slowest_game': self.slowest_game,
+            'think_times': {int(player): histogram.state()
+                            for player, histogram in self.think_times.items()},
+            'output_offset': offset,
+            'sprt': None if sprt is None else sprt.state(),
+        }
+
+    def restore(self, state: dict[str, Any], sprt: SPRT | None = None) \
+        -> None:
+        """
+        Sets the counts, the game and think times and the results of the
+        SPRT, if any, from a state saved by state, and cuts the output back
+        to the games that the state covers, dropping those played after it
+        was saved.
+        """
+        self._wins = {Players(int(player)): count
+                      for player, count in state['wins'].items()}
+        self._ties = state['ties']
+        self.total_moves = state['total_moves']
+        self.timeouts = {Players(int(player)): count
+                         for player, count in state['timeouts'].items()}
+        self.game_times.restore(state['game_times'])
+        self.slowest_game = None if state['slowest_game'] is None \
+            else (state['slowest_game'][0], state['slowest_game'][1])
+        for player, histogram_state in state['think_times'].items():
+            self.think_times[Players(int(player))].restore(histogram_state)
+        if sprt is not None and state['sprt'] is not None:
+            sprt.restore(state['sprt'])
+        if self._output is not None and state['output_offset'] is not None:
+            self._output.seek(state['output_offset'])
+            self._output.truncate()
+
+    def play_games(self, seeds: Iterable[int]) -> None:
+        """
+        Plays one game for each seed and records it (see record_game).
+        """
+        for record in self._play(seeds):
+            self.record_game(record)
+
+    def _play(self, seeds: Iterable[int], jobs: int = 1) -> \
+        Iterator[GameRecord]:
+        """
+        Plays one game for each seed and yields their records in order.
+        With more than one job, the games are played in a pool of worker
+        processes, a few at a time, so that a caller that stops early
+        leaves little work behind.
+        """
+        if jobs == 1:
+            for game_seed in seeds:
+                yield self.play_game(game_seed)
+            return
+        setup = (self._game.size, self._game.num_players,
+                 self._game.superko, self._bots, self._move_time_limit,
+                 self._adjudicator)
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_start_worker,
+                                   initargs=(setup,))
+        try:
+            pending: deque[Future[GameRecord]] = deque()
+            for game_seed in seeds:
+                pending.append(pool.submit(_play_worker_game, game_seed))
+                if len(pending) == 2 * jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def seed_bots(self, game_seed: int) -> None:
+        """
+        Gives every bot a new random number generator, seeded from the seed
+        of a game and the bot's place in the list of bots.
+        """
+        rng = random.Random(game_seed)
+        for bot in self._bots:
+            bot.use_rng(random.Random(rng.getrandbits(64)))
+
+    def play_game(self, game_seed: int) -> GameRecord:
+        """
+        Plays the current game from a seed until the adjudicator stops it,
+        starts a new game and returns the record of the one played. The
+        counts are not changed.
+        """
+        self.seed_bots(game_seed)
+        players = [int(bot.show_player()) for bot in self._bots]
+        record: GameRecord = {
+            'seed': game_seed,
+            'moves': [],
+            'scores': {},
+            'outcome': [],
+            'reason': END,
+            'num_moves': 0,
+            'think_times': {player: [] for player in players},
+            'timeouts': {player: 0 for player in players},
+            'seconds': 0.0,
+        }
+        self._adjudicator.start()
+        start = time.perf_counter()
+        reason = None
+        while reason is None:
+            for bot in self._bots:
+                if self._game.turn == bot.show_player():
+                    self.play_move(bot, record)
+                    reason = self._adjudicator.check(self._game)
+                    if reason is not None:
+                        break
+        record['seconds'] = time.perf_counter() - start
+        record['scores'] = self._game.scores()
+        record['outcome'] = self._adjudicator.winners(self._game, reason)
+        record['reason'] = reason
+        record['num_moves'] = len(record['moves'])
+        self.reset_game()
+        return record
+
+    def record_game(self, record: GameRecord) -> None:
+        """
+        Adds a finished game to the counts, game_times, slowest_game and
+        think_times, and writes it to the output, if any. Only these
+        fixed-size summaries of the games are kept in memory.
+        """
+        self.update_results(record['outcome'])
+        self.total_moves += record['num_moves']
+        for player, count in record['timeouts'].items():
+            self.timeouts[Players(int(player))] += count
+        for player, seconds in record['think_times'].items():
+            histogram = self.think_times[Players(int(player))]
+            for think_time in seconds:
+                histogram.add(think_time)
+        self.game_times.add(record['seconds'])
+        if self.slowest_game is None or \
+            record['seconds'] > self.slowest_game[1]:
+            self.slowest_game = (record['seed'], record['seconds'])
+        if self._output is not None:
+            self._output.write(json.dumps(record) + '\n')
+            self._output.flush()
+
+    def play_move(self, bot: BaseBot, record: GameRecord) -> None:
+        """
+        Asks a bot for its move, within the per-move time limit, and plays it.
+
+        bot: The bot whose turn it is.
+        record: The record of the game, to which the move, its time and any
+        timeout are added.
+        """
+        player = int(bot.show_player())
+        deadline = Deadline(self._move_time_limit)
+        start = time.perf_counter()
+        move = bot.get_move(self._game, deadline)
+        elapsed = time.perf_counter() - start
+        if self._move_time_limit is not None and \
+            elapsed > self._move_time_limit:
+            record['timeouts'][player] += 1
+            move = None
+        if move is None or move == PASS:
+            self._game.pass_turn()
+            move = PASS
+        else:
+            self._game.apply_move(move)
+        record['moves'].append(move)
+        record['think_times'][player].append(elapsed)
+
     def update_results(self, results: list[int]) -> None:
         """
         Update the win/tie counts based on the outcome of a game.
 
-        results: The outcome of a game.
+        results: The outcome of a game (see Adjudicator.winners).
         """
-        if results:
-            if len(results) == 2:
-                self._ties += 1
-            else:
-                player = Players(results[0])
-                self._wins[player] += 1
+        if len(results) > 1:
+            self._ties += 1
         else:
-            scores = self._game.scores()
-            max_score = max(scores.values())
-            max_score_count = list(scores.values()).count(max_score)
-            if max_score_count > 1:
-                self._ties += 1
-            else:
-                max_score_player = max(
-                    scores, key=lambda player: scores[player]
-                )
-                player = Players(max_score_player)
-                self._wins[player] += 1
+            player = Players(results[0])
+            self._wins[player] += 1
+
     def calculate_percentages(self, num_of_games: int) -> \
         tuple[float, float, float, float]:
         """
@@ -199,36 +1583,538 @@ class Simulation(SimulateBots):
             average_moves_per_game
         )
 
-@click.command()
+
+def game_seeds(seed: int, num_of_games: int) -> list[int]:
+    """
+    Derives the seeds of a run's games from the seed of the run. The seed
+    of a game does not depend on how the games are shared among workers.
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(num_of_games)]
+
+
+_worker_simulation: Simulation | None = None
+
+
+def _start_worker(setup: tuple[int, int, bool, list[BaseBot], float | None,
+                                Adjudicator]) -> None:
+    """
+    Sets up the simulation of a worker process of a parallel simulation.
+
+    setup: The board size, number of players, ko rule (see Go.superko),
+    bots, move time limit and adjudicator.
+    """
+    global _worker_simulation
+    size, num_of_players, superko, bots, move_time_limit, adjudicator = setup
+    _worker_simulation = Simulation(Go(size, num_of_players, superko), bots,
+                                    move_time_limit, adjudicator=adjudicator)
+
+
+def _play_worker_game(game_seed: int) -> GameRecord:
+    """
+    Plays one game of a parallel simulation in a worker process and returns
+    its record.
+    """
+    assert _worker_simulation is not None
+    return _worker_simulation.play_game(game_seed)
+
+
+def game_options(command: Callable[..., None]) -> Callable[..., None]:
+    """
+    Adds the options that choose the board size, the bots, their resources
+    and the adjudication of games to a command.
+    """
+    spec_help = ' (a strategy among ' + ', '.join(STRATEGIES) + \
+        ', with any options, as in alphabeta:time=2,depth=4).'
+    command = click.option('-2', '--player2', default='random',
+                           type=BOT_SPEC,
+                           help='Bot of player 2' + spec_help)(command)
+    command = click.option('-1', '--player1', default='random',
+                           type=BOT_SPEC,
+                           help='Bot of player 1' + spec_help)(command)
+    return match_options(command)
+
+
+def match_options(command: Callable[..., None]) -> Callable[..., None]:
+    """
+    Adds the options that choose the board size, the bots' resources and
+    the adjudication of games to a command.
+    """
+    options = [
+        click.option('-s', '--size', default=6, help='Board size.'),
+        click.option('-t', '--move-time', default=None, type=float,
+                     help='Seconds each bot has per move '
+                     '(unlimited by default).'),
+        click.option('-b', '--book', 'book_path', default=None,
+                     type=click.Path(exists=True, dir_okay=False),
+                     help='Opening book for the smart and alphabeta bots.'),
+        click.option('--table', 'table_path', default=None,
+                     type=click.Path(exists=True, dir_okay=False),
+                     help='Solution table for the perfect bot.'),
+        click.option('--moves-per-point', default=3.0,
+                     type=click.FloatRange(0, min_open=True),
+                     help='Moves a game may last per position of the board.'),
+        click.option('--resign-margin', default=0.3,
+                     type=click.FloatRange(0, 1),
+                     help='Lead, as a fraction of the board, at which a '
+                     'game is resigned (0 never resigns).'),
+        click.option('--resign-moves', default=10,
+                     type=click.IntRange(min=1),
+                     help='Moves in a row the lead must last to resign.'),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def make_simulation(size: int, player1: str, player2: str,
+                    move_time: float | None, book: OpeningBook | None,
+                    table_path: str | None, moves_per_point: float,
+                    resign_margin: float, resign_moves: int,
+                    output: IO[str] | None = None) -> Simulation:
+    """
+    Creates a simulation of games between the bots of two specs (see
+    parse_bot_spec), adjudicated as the options say, writing the records
+    of the games to output, if given.
+    """
+    table = None if table_path is None else SolutionTable.load(table_path)
+    if table is None and needs_table([player1, player2]):
+        raise click.BadParameter("the perfect strategy needs --table")
+    #in this simulation, white plays first.
+    bot_white = make_bot(player1, Players.WHITE, book, table)
+    bot_black = make_bot(player2, Players.BLACK, book, table)
+    adjudicator = make_adjudicator(moves_per_point, resign_margin,
+                                   resign_moves)
+    settings = {'size': size, 'player1': player1, 'player2': player2,
+                'move_time': move_time, 'moves_per_point': moves_per_point,
+                'resign_margin': resign_margin, 'resign_moves': resign_moves}
+    return Simulation(Go(size, 2), [bot_white, bot_black], move_time,
+                      output, adjudicator, settings)
+
+
+def make_adjudicator(moves_per_point: float, resign_margin: float,
+                     resign_moves: int) -> Adjudicator:
+    """
+    Creates the adjudicator the options of match_options ask for.
+    """
+    return Adjudicator(moves_per_point, resign_margin or None, resign_moves)
+
+
+def needs_table(specs: Iterable[str]) -> bool:
+    """
+    returns whether any of the bot specs is of the perfect strategy
+    """
+    return any(parse_bot_spec(spec)[0] == 'perfect' for spec in specs)
+
+
+@click.group(invoke_without_command=True)
 @click.option('-n', '--num-games', default=20,
               help='Number of games to simulate.')
-@click.option('-s', '--size', default=6, help='Board size.')
-@click.option('-1', '--player1', default='random',
-              help='Strategy for player 1 (random or smart).')
-@click.option('-2', '--player2', default='random',
-              help='Strategy for player 2 (random or smart).')
+@game_options
+@click.option('-j', '--jobs', default=1, type=click.IntRange(min=1),
+              help='Number of worker processes playing games.')
+@click.option('--seed', default=None, type=int,
+              help='Seed that fixes every game (random by default).')
+@click.option('-r', '--results', 'results_path', default=None,
+              type=click.Path(dir_okay=False, allow_dash=True),
+              help='File to write a JSON line about every game to, as it '
+              'finishes ("-" for standard output, in which case the summary '
+              'goes to standard error).')
+@click.option('--checkpoint', 'checkpoint_path', default=None,
+              type=click.Path(dir_okay=False),
+              help='File to save the state of the run to now and then.')
+@click.option('--checkpoint-interval', default=60.0,
+              type=click.FloatRange(min=0),
+              help='Seconds between checkpoints.')
+@click.option('--resume', is_flag=True,
+              help='Continue the run saved in the checkpoint, if any.')
+@click.option('--sprt', 'sprt_elos', nargs=2, type=float, default=None,
+              metavar='ELO0 ELO1',
+              help='Stop once a sequential probability ratio test decides '
+              'whether player 1 is ELO0 or ELO1 Elo stronger than player 2; '
+              '-n is then the most games played.')
+@click.option('--alpha', default=0.05,
+              type=click.FloatRange(0, 1, min_open=True, max_open=True),
+              help='False positive rate of the SPRT.')
+@click.option('--beta', default=0.05,
+              type=click.FloatRange(0, 1, min_open=True, max_open=True),
+              help='False negative rate of the SPRT.')
+@click.pass_context
 def main(
+    ctx: click.Context,
     num_games: int,
     size: int,
     player1: str,
-    player2: str) -> None:
+    player2: str,
+    move_time: float | None,
+    book_path: str | None,
+    table_path: str | None,
+    moves_per_point: float,
+    resign_margin: float,
+    resign_moves: int,
+    jobs: int,
+    seed: int | None,
+    results_path: str | None,
+    checkpoint_path: str | None,
+    checkpoint_interval: float,
+    resume: bool,
+    sprt_elos: tuple[float, float] | None,
+    alpha: float,
+    beta: float) -> None:
     """
     Run the simulation and print the results.
 
     num_games: The number of games to simulate.
     """
-    current_game = Go(size, 2)
-    bot_white = RandomBot(Players.WHITE) if player1 == 'random' else\
-        SmartBot(Players.WHITE) #in this simulation, white plays first.
-    bot_black = RandomBot(Players.BLACK) if player2 == 'random' else \
-        SmartBot(Players.BLACK)
-    random_simulation = Simulation(current_game, [bot_white, bot_black])
+    if ctx.invoked_subcommand is not None:
+        return
+    if resume and checkpoint_path is None:
+        raise click.BadParameter("--resume needs --checkpoint")
+    checkpoint = None
+    if checkpoint_path is not None:
+        checkpoint = Checkpoint(checkpoint_path, checkpoint_interval)
+    results = None
+    if results_path is not None:
+        # A resumed run keeps the games written before the checkpoint.
+        resuming = resume and os.path.exists(str(checkpoint_path))
+        results = ctx.with_resource(
+            click.open_file(results_path, 'a' if resuming else 'w'))
+    to_stderr = results_path == '-'
+
+    def echo(message: str) -> None:
+        click.echo(message, err=to_stderr)
+
+    book = None if book_path is None else OpeningBook.load(book_path)
+    random_simulation = make_simulation(size, player1, player2, move_time,
+                                        book, table_path, moves_per_point,
+                                        resign_margin, resign_moves, results)
+    sprt = None
+    if sprt_elos is not None:
+        try:
+            sprt = SPRT(*sprt_elos, alpha, beta)
+        except ValueError as error:
+            raise click.BadParameter(str(error)) from error
+    try:
+        if sprt is not None:
+            percentages = random_simulation.run_sprt(sprt, num_games, jobs,
+                                                     seed, checkpoint, resume)
+        else:
+            percentages = random_simulation.simulate_games(
+                num_games, jobs, seed, checkpoint, resume)
+    except CheckpointError as error:
+        raise click.BadParameter(str(error),
+                                 param_hint="'--checkpoint'") from error
+    for line in summary(random_simulation, percentages, player1, player2,
+                        move_time is not None):
+        echo(line)
+    if sprt is not None:
+        for line in sprt_report(sprt):
+            echo(line)
+    if jobs > 1:
+        # The workers' books and caches are not sent back.
+        return
+    if book is not None:
+        echo(f"Book hits: {book.hits}/{book.lookups} "
+             f"({book.coverage * 100:.1f}%)")
+    for number, bot in enumerate(random_simulation.bots, 1):
+        if bot.cache is not None:
+            echo(f"Cache of player {number}: {bot.cache.stats()}")
+
+
+def summary(simulation: Simulation,
+            percentages: tuple[float, float, float, float], player1: str,
+            player2: str, timeouts: bool) -> list[str]:
+    """
+    Returns lines describing the results of a simulation: the percentages
+    it returned, the timeouts (if asked for), the percentiles of the game
+    times and its slowest game, the percentiles of every player's think
+    times and, after a run, the games and moves it played per second.
+    """
     player_white_win_percentage, player_black_win_percentage, ties_percentage, \
-        average_moves_per_game = random_simulation.simulate_games(num_games)
-    print(f"Player 1 ({player1}) wins: {player_white_win_percentage:.2f}%")
-    print(f"Player 2 ({player2}) wins: {player_black_win_percentage:.2f}%")
-    print(f"Ties: {ties_percentage:.2f}%")
-    print(f"Average moves: {average_moves_per_game:.1f}")
+        average_moves_per_game = percentages
+    lines = [
+        f"Player 1 ({player1}) wins: {player_white_win_percentage:.2f}%",
+        f"Player 2 ({player2}) wins: {player_black_win_percentage:.2f}%",
+        f"Ties: {ties_percentage:.2f}%",
+        f"Average moves: {average_moves_per_game:.1f}",
+    ]
+    if timeouts:
+        counts = simulation.timeouts
+        lines.append(f"Timeouts: player 1 {counts[Players.WHITE]}, "
+                     f"player 2 {counts[Players.BLACK]}")
+    if simulation.game_times.count:
+        lines.append(f"Game time: {_percentiles(simulation.game_times)}")
+    if simulation.slowest_game is not None:
+        slowest_seed, slowest_time = simulation.slowest_game
+        lines.append(f"Slowest game: seed {slowest_seed} "
+                     f"({slowest_time:.2f}s)")
+    for number, histogram in enumerate(simulation.think_times.values(), 1):
+        if histogram.count:
+            lines.append(f"Think time of player {number}: "
+                         f"{_percentiles(histogram)}")
+    if simulation.last_run is not None:
+        games, moves, seconds = simulation.last_run
+        if seconds > 0:
+            lines.append(f"Throughput: {games / seconds:.2f} games/s, "
+                         f"{moves / seconds:.1f} moves/s")
+    return lines
+
+
+def _percentiles(histogram: Histogram) -> str:
+    """
+    formats the 50th, 90th and 99th percentiles and the largest of the
+    latencies in a histogram, in milliseconds
+    """
+    values = [(f"p{percent}", histogram.percentile(percent))
+              for percent in (50, 90, 99)]
+    values.append(("max", histogram.largest))
+    return ", ".join(f"{name} {seconds * 1000:.3g}ms"
+                     for name, seconds in values)
+
+
+def sprt_report(sprt: SPRT, points: int = 10) -> list[str]:
+    """
+    Returns lines describing the result of an SPRT and its LLR after
+    evenly spaced numbers of games (at most points of them).
+    """
+    lower, upper = sprt.bounds
+    decision = sprt.decision
+    verdict = "no decision" if decision is None else f"{decision} accepted"
+    lines = [f"SPRT: {verdict} after {sprt.games} games "
+             f"(W {sprt.wins}, T {sprt.ties}, L {sprt.losses}; "
+             f"bounds {lower:.2f}, {upper:.2f})",
+             "LLR trajectory:"]
+    step = max(1, math.ceil(sprt.games / points))
+    games = list(range(step, sprt.games, step)) + [sprt.games]
+    for game in games:
+        lines.append(f"  {game:>6} games: {sprt.trajectory[game - 1]:+.2f}")
+    return lines
+
+
+@main.command()
+@click.option('--seed', required=True, type=int,
+              help='Seed of the game, as printed by the simulation.')
+@game_options
+@click.option('-l', '--limit', default=25,
+              help='Number of functions to list in the profile.')
+@click.option('-o', '--output', default=None,
+              help='File to write the raw profile to (for pstats).')
+def replay(
+    seed: int,
+    size: int,
+    player1: str,
+    player2: str,
+    move_time: float | None,
+    book_path: str | None,
+    table_path: str | None,
+    moves_per_point: float,
+    resign_margin: float,
+    resign_moves: int,
+    limit: int,
+    output: str | None) -> None:
+    """
+    Play one game of a simulation again from its seed under the profiler.
+
+    The bots must be set up with the same options as in the simulation.
+    """
+    book = None if book_path is None else OpeningBook.load(book_path)
+    simulation = make_simulation(size, player1, player2, move_time, book,
+                                 table_path, moves_per_point, resign_margin,
+                                 resign_moves)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    record = simulation.play_game(seed)
+    profiler.disable()
+    outcome = record['outcome']
+    if len(outcome) > 1:
+        result = "tie"
+    elif outcome[0] == Players.WHITE:
+        result = f"player 1 ({player1}) wins"
+    else:
+        result = f"player 2 ({player2}) wins"
+    print(f"Game {seed}: {result} ({record['reason']}) after "
+          f"{record['num_moves']} moves in {record['seconds']:.2f}s")
+    if output is not None:
+        profiler.dump_stats(output)
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(limit)
+
+
+@main.command()
+@click.argument('strategies', nargs=-1, required=True, type=BOT_SPEC)
+@click.option('-g', '--games', default=10,
+              help='Number of games every pair of strategies plays (even).')
+@match_options
+@click.option('-j', '--jobs', default=1, type=click.IntRange(min=1),
+              help='Number of worker processes playing games.')
+@click.option('--seed', default=None, type=int,
+              help='Seed that fixes every game (random by default).')
+@click.option('-o', '--output', default=None, type=click.File('w'),
+              help='File to write the crosstable to.')
+def tournament(
+    strategies: tuple[str, ...],
+    games: int,
+    size: int,
+    move_time: float | None,
+    book_path: str | None,
+    table_path: str | None,
+    moves_per_point: float,
+    resign_margin: float,
+    resign_moves: int,
+    jobs: int,
+    seed: int | None,
+    output: TextIO | None) -> None:
+    """
+    Play a round-robin tournament between bots, given by their strategies
+    and options (as in alphabeta:time=2), and print their ratings in a
+    crosstable.
+    """
+    # Imported here, as the tournament module builds on this one.
+    from tournament import Tournament
+    if table_path is None and needs_table(strategies):
+        raise click.BadParameter("the perfect strategy needs --table")
+    adjudicator = make_adjudicator(moves_per_point, resign_margin,
+                                   resign_moves)
+    try:
+        contest = Tournament(list(strategies), games, size, move_time,
+                             book_path, table_path, adjudicator)
+    except ValueError as error:
+        raise click.BadParameter(str(error)) from error
+    if seed is None:
+        seed = random.getrandbits(32)
+    contest.run(seed, jobs)
+    table = contest.crosstable()
+    print(table)
+    if output is not None:
+        output.write(table + "\n")
+
+
+@main.command()
+@click.option('-n', '--num-games', default=20,
+              help='Number of games to simulate.')
+@game_options
+@click.option('--seed', default=None, type=int,
+              help='Seed that fixes every game (random by default).')
+@click.option('--host', default='127.0.0.1',
+              help='Address to listen on for workers.')
+@click.option('--port', default=5142, help='Port to listen on for workers.')
+@click.option('--batch-size', default=8, type=click.IntRange(min=1),
+              help='Largest number of games handed to a worker at once.')
+@click.option('--lease', default=300.0, type=click.FloatRange(min=0),
+              help='Seconds after which games a worker has not finished are '
+              'handed out again.')
+@click.option('-r', '--results', 'results_path', default=None,
+              type=click.Path(dir_okay=False, allow_dash=True),
+              help='File to write a JSON line about every game to.')
+def coordinator(
+    num_games: int,
+    size: int,
+    player1: str,
+    player2: str,
+    move_time: float | None,
+    book_path: str | None,
+    table_path: str | None,
+    moves_per_point: float,
+    resign_margin: float,
+    resign_moves: int,
+    seed: int | None,
+    host: str,
+    port: int,
+    batch_size: int,
+    lease: float,
+    results_path: str | None) -> None:
+    """
+    Hand out the games of a simulation to workers (see the worker command)
+    and print the results once they are all in.
+    """
+    # Imported here, as the cluster module builds on this one.
+    from cluster import Coordinator
+    if book_path is not None or table_path is not None:
+        raise click.BadParameter("workers cannot load books or tables")
+    settings: dict[str, Any] = {
+        'size': size, 'player1': player1, 'player2': player2,
+        'move_time': move_time, 'moves_per_point': moves_per_point,
+        'resign_margin': resign_margin, 'resign_moves': resign_moves}
+    with contextlib.ExitStack() as stack:
+        results = None
+        if results_path is not None:
+            results = stack.enter_context(click.open_file(results_path, 'w'))
+        simulation = make_simulation(book=None, table_path=None,
+                                     output=results, **settings)
+        if seed is None:
+            seed = random.getrandbits(32)
+        hub = Coordinator(simulation, settings, num_games, seed, batch_size,
+                          lease, host, port)
+        click.echo(f"Waiting for workers on {host}:{hub.address[1]}",
+                   err=True)
+        hub.run()
+        percentages = simulation.calculate_percentages(num_games)
+        for line in summary(simulation, percentages, player1, player2,
+                            move_time is not None):
+            click.echo(line, err=results_path == '-')
+
+
+@main.command()
+@click.option('--host', default='127.0.0.1',
+              help='Address of the coordinator.')
+@click.option('--port', default=5142, help='Port of the coordinator.')
+@click.option('--retries', default=10, type=click.IntRange(min=0),
+              help='Times to try connecting again, a second apart.')
+@click.option('-j', '--jobs', default=1, type=click.IntRange(min=1),
+              help='Number of worker processes to start.')
+def worker(host: str, port: int, retries: int, jobs: int) -> None:
+    """
+    Play games handed out by a coordinator until its run is done.
+    """
+    from cluster import run_worker
+    if jobs == 1:
+        played = run_worker(host, port, retries)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            played = sum(pool.map(run_worker, [host] * jobs, [port] * jobs,
+                                  [retries] * jobs))
+    click.echo(f"Played {played} games")
+
+
+@click.command()
+@click.option('-s', '--size', default=6, help='Board size.')
+@click.option('-p', '--plies', default=4,
+              help='Number of moves from the start of the game to cover.')
+@click.option('-w', '--width', default=4,
+              help='Number of replies expanded in every position.')
+@click.option('-t', '--move-time', default=5.0,
+              help='Seconds of alpha-beta search for every position.')
+@click.option('-o', '--output', default='book.bin', help='Book file to write.')
+def build_book(size: int, plies: int, width: int, move_time: float,
+               output: str) -> None:
+    """
+    Build an opening book by deep alpha-beta search and write it to a file.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    def rank_moves(game: Go) -> list[tuple[int, int]]:
+        bot = AlphaBetaBot(Players(game.turn), time_limit=move_time)
+        best_move = bot.get_move(game)
+        return [best_move] + [move for move in bot.root_moves
+                              if move != best_move]
+
+    book = OpeningBook.build(size, plies, width, rank_moves)
+    book.save(output)
+    print(f"Wrote {len(book)} positions to {output}")
+
+
+@click.command()
+@click.option('-s', '--size', default=2, help='Board size.')
+@click.option('-o', '--output', default='solution.bin',
+              help='Solution table file to write.')
+def solve_board(size: int, output: str) -> None:
+    """
+    Solve a tiny board exactly and write the solution table to a file.
+    """
+    solver = Solver(size)
+    value = solver.solve()
+    solver.table.save(output)
+    print(f"Value for player 1: {value:+d} ({solver.nodes} nodes searched)")
+    print(f"Wrote {len(solver.table)} positions to {output}")
 
 if __name__ == "__main__":
     print("hi")
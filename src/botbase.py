@@ -2,9 +2,15 @@
 Base class for the bot implementation
 """
 
+import math
+import random
+import time
 from abc import ABC, abstractmethod
 from enum import IntEnum
 from go import Go
+from book import OpeningBook
+from cache import EvalCache
+from symmetry import canonical_board_key
 
 
 
@@ -14,19 +20,113 @@ class Players(IntEnum):
     BLACK = 2
 
 
+class Deadline:
+    """
+    A point in time by which a bot must have chosen its move.
+
+    expired() is meant to be called from the inner loops of a search, so it
+    only reads the clock once every few calls. Once a deadline has expired it
+    stays expired.
+    """
+
+    _end: float | None
+    _stride: int
+    _calls: int
+    _expired: bool
+
+    def __init__(self, budget: float | None = None, stride: int = 8) -> None:
+        """
+        Start a deadline.
+
+        budget: Number of seconds from now until the deadline, or None for
+        a deadline that never expires.
+        stride: The clock is read once every stride calls to expired().
+        """
+        self._end = None if budget is None else time.perf_counter() + budget
+        self._stride = stride
+        self._calls = 0
+        self._expired = False
+
+    @property
+    def end(self) -> float | None:
+        """
+        returns the time.perf_counter() value of the deadline, if any
+        """
+        return self._end
+
+    def within(self, budget: float | None, stride: int | None = None,
+               reserve: float = 0.0) -> "Deadline":
+        """
+        Returns a new deadline that expires at the earlier of this deadline
+        and budget seconds from now. It reads the clock every stride calls
+        (by default, as often as this deadline does).
+
+        reserve is the fraction of the time left that the new deadline keeps
+        back, so that a search stopped by it still has time to return.
+        """
+        now = time.perf_counter()
+        deadline = Deadline(budget, stride or self._stride)
+        if self._end is not None and \
+            (deadline.end is None or self._end < deadline.end):
+            deadline._end = self._end
+        if deadline._end is not None:
+            deadline._end -= reserve * max(0.0, deadline._end - now)
+        return deadline
+
+    def remaining(self) -> float:
+        """
+        returns the number of seconds left before the deadline
+        """
+        if self._end is None:
+            return math.inf
+        return max(0.0, self._end - time.perf_counter())
+
+    def cancel(self) -> None:
+        """
+        Makes the deadline expire now. Safe to call from another thread.
+        """
+        self._expired = True
+
+    def expired(self) -> bool:
+        """
+        Returns True if the deadline has passed.
+        """
+        if self._expired:
+            return True
+        if self._end is None:
+            return False
+        self._calls += 1
+        if self._calls % self._stride == 0 or self._calls == 1:
+            self._expired = time.perf_counter() >= self._end
+        return self._expired
+
+
 class BaseBot(ABC):
     """
     Base class for a bot in a Go Game
+
+    Bots draw their random numbers from their own generator, rng, rather
+    than from the random module, so that a game can be played again by
+    giving every bot a generator with the same seed (see use_rng).
     """
 
-    def __init__(self, player: Players) -> None:
+    rng: random.Random
+
+    def __init__(self, player: Players,
+                 book: OpeningBook | None = None,
+                 cache: EvalCache[dict[int, int]] | None = None) -> None:
 
         """
         Initialize the bot with the game.
 
         Player: color of the bot to identify bot.
+        book: Opening book the bot plays from before it starts searching.
+        cache: Cache of the scores of positions the bot has evaluated.
         """
         self._player = player
+        self._book = book
+        self._cache = cache
+        self.rng = random.Random(random.getrandbits(64))
 
     def show_player(self) -> Players:
         """
@@ -34,20 +134,71 @@ class BaseBot(ABC):
         """
         return self._player
 
+    def use_rng(self, rng: random.Random) -> None:
+        """
+        Makes the bot, and any bots it plays through, draw their random
+        numbers from rng.
+        """
+        self.rng = rng
+
+    def book_move(self, game: Go) -> tuple[int, int] | None:
+        """
+        returns the opening book move for the position, if there is one
+        """
+        if self._book is None:
+            return None
+        return self._book.lookup(game)
+
+    @property
+    def cache(self) -> EvalCache[dict[int, int]] | None:
+        """
+        returns the cache of scores the bot uses, if any
+        """
+        return self._cache
+
+    def cached_scores(self, game: Go) -> dict[int, int]:
+        """
+        returns game.scores(), from the cache if the bot has one and has
+        scored the same board, or a symmetric one, before. The result may be
+        shared with the cache and must not be modified.
+        """
+        if self._cache is None:
+            return game.scores()
+        key, _ = canonical_board_key(game)
+        return self._cache.get_or_compute(key, game.scores)
+
     @abstractmethod
-    def get_move(self, game: Go) -> tuple[int, int] | None:
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int] | None:
         """
-        gets the move to be made by a random bot
+        gets the move to be made by the bot
+
+        deadline: If given, the bot must return a legal move (or a pass)
+        before it expires.
         """
         raise NotImplementedError
 
     @abstractmethod
-    def make_move(self, game: Go) -> None:
+    def make_move(self, game: Go, deadline: Deadline | None = None) -> None:
         """
-        Make a random legal move in the game.
+        Make a legal move in the game, choosing it before the deadline.
         """
         raise NotImplementedError
 
+    def start_pondering(self, game: Go) -> None:
+        """
+        Starts thinking about a position while another player is to move.
+        Bots that cannot ponder ignore this.
+
+        game: The game, with one of the other players to move. The bot must
+        not rely on this object staying unchanged.
+        """
+
+    def stop_pondering(self) -> None:
+        """
+        Stops any thinking started by start_pondering.
+        """
+
 class SimulateBots(ABC):
     """
     Simulate a bot 
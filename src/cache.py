@@ -0,0 +1,117 @@
+"""
+A bounded cache of position evaluations shared by the bots
+"""
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+# Default number of positions kept. A 19x19 board key is 361 bytes, so a
+# full cache of 19x19 positions takes a few tens of megabytes.
+DEFAULT_CAPACITY = 1 << 16
+
+
+class EvalCache(Generic[ValueType]):
+    """
+    A least-recently-used cache of position -> evaluation.
+
+    Once the cache holds capacity entries, adding a new one evicts the entry
+    that was used least recently, so memory stays capped however many games
+    are played. Hits, misses and evictions are counted. The cache is not
+    thread-safe; share it only between searches that do not run at the
+    same time.
+    """
+
+    _capacity: int
+    _entries: OrderedDict[Hashable, ValueType]
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Constructor
+
+        Args:
+            capacity: Largest number of entries kept (at least 1)
+        """
+        if capacity < 1:
+            raise ValueError("The capacity of a cache must be at least 1")
+        self._capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        returns the largest number of entries kept
+        """
+        return self._capacity
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        returns the fraction of lookups that were hits
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> ValueType | None:
+        """
+        Returns the value stored for a key, marking it as recently used, or
+        None if there is none.
+        """
+        entries = self._entries
+        value = entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: ValueType) -> None:
+        """
+        Stores the value of a key, evicting the least recently used entry if
+        the cache is full.
+        """
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self._capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable,
+                       compute: Callable[[], ValueType]) -> ValueType:
+        """
+        Returns the value stored for a key, computing and storing it first
+        if there is none.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """
+        Removes every entry. The counters are kept.
+        """
+        self._entries.clear()
+
+    def stats(self) -> str:
+        """
+        returns the counters as a line of text
+        """
+        return (f"{self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate * 100:.1f}%), {self.evictions} evictions, "
+                f"{len(self)}/{self._capacity} entries")
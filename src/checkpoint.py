@@ -0,0 +1,95 @@
+"""
+Checkpoints that let long simulation runs be resumed
+"""
+import json
+import os
+import time
+from typing import Any
+
+# Version of the format of the saved states, raised whenever the state of a
+# simulation gains or changes keys, so that older checkpoints are rejected.
+_VERSION = 4
+
+
+class CheckpointError(ValueError):
+    """
+    Raised when a checkpoint cannot be used: the file is not a checkpoint,
+    is of another version or holds the state of another run.
+    """
+
+
+class Checkpoint:
+    """
+    A file holding the state of a run, saved every interval seconds.
+
+    Saves are atomic: the state is written to a temporary file next to the
+    checkpoint, flushed to disk and then renamed over it, so an interrupted
+    save leaves the previous checkpoint as it was.
+    """
+
+    _path: str
+    _interval: float
+    _last_save: float
+
+    def __init__(self, path: str, interval: float = 60.0) -> None:
+        """
+        Constructor
+
+        Args:
+            path: The checkpoint file
+            interval: Number of seconds between saves
+        """
+        self._path = path
+        self._interval = interval
+        self._last_save = time.monotonic()
+
+    @property
+    def path(self) -> str:
+        """
+        returns the checkpoint file
+        """
+        return self._path
+
+    def due(self) -> bool:
+        """
+        returns whether interval seconds have gone by since the last save
+        (or since the checkpoint was created)
+        """
+        return time.monotonic() - self._last_save >= self._interval
+
+    def save(self, state: dict[str, Any]) -> None:
+        """
+        Replaces the saved state with a new one.
+        """
+        temporary = self._path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"version": _VERSION, "state": state}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path)
+        self._last_save = time.monotonic()
+
+    def load(self) -> dict[str, Any] | None:
+        """
+        Returns the saved state, or None if nothing was saved yet.
+
+        Raises:
+            CheckpointError: If the file is not a checkpoint, or is a
+                checkpoint of another version.
+        """
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as error:
+            raise CheckpointError(f"Not a checkpoint: {self._path}") \
+                from error
+        if not isinstance(data, dict) or "version" not in data:
+            raise CheckpointError(f"Not a checkpoint: {self._path}")
+        if data["version"] != _VERSION:
+            raise CheckpointError(f"Checkpoint of another version "
+                                  f"({data['version']}, not {_VERSION}): "
+                                  f"{self._path}")
+        state: dict[str, Any] = data["state"]
+        return state
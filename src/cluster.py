@@ -0,0 +1,262 @@
+"""
+Simulations spread over many machines: a coordinator hands out batches of
+games to workers over TCP and collects their results
+"""
+import json
+import logging
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable
+
+from bot import GameRecord, Simulation, game_seeds, make_simulation
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker waits before asking again when every game left is
+# being played by another worker.
+WAIT = 0.1
+
+
+def _send(connection: socket.socket, message: dict[str, Any]) -> None:
+    """
+    Sends a message as a line of JSON.
+    """
+    connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one worker connected to a coordinator.
+    """
+
+    server: "_Server"
+
+    def handle(self) -> None:
+        """
+        Talks to the worker until it leaves.
+        """
+        self.server.coordinator.serve_worker(self.connection, self.rfile)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    """
+    TCP server of a coordinator, serving every worker in its own thread.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+    coordinator: "Coordinator"
+
+
+class Coordinator:
+    """
+    Hands out the games of a simulation to workers and records their
+    results in the simulation.
+
+    The protocol is one JSON object per line. A worker that connects gets
+    the settings of the simulation (see make_simulation) and then asks
+    for games; it is sent a batch of (index, seed) pairs, told to wait
+    (every game left is out with other workers) or told that the run is
+    done. It sends back the record of every game as soon as the game is
+    over.
+
+    Games are handed out at least once. The games a worker had not sent
+    back when its connection closed go back to the queue, and so do games
+    out for longer than the lease, for workers that hang or vanish without
+    closing their connection. A game can then be played twice; only the
+    first record of every game index is counted.
+    """
+
+    _simulation: Simulation
+    _settings: dict[str, Any]
+    _seeds: list[int]
+    _batch_size: int
+    _lease: float
+    _lock: threading.Condition
+    _queue: deque[int]
+    _leases: dict[int, float]
+    _finished: bytearray
+    _remaining: int
+    _server: _Server
+
+    def __init__(self, simulation: Simulation, settings: dict[str, Any],
+                 num_of_games: int, seed: int, batch_size: int = 8,
+                 lease: float = 300.0, host: str = "127.0.0.1",
+                 port: int = 0) -> None:
+        """
+        Constructor
+
+        Args:
+            simulation: Simulation in which the results are recorded
+            settings: Keyword arguments of make_simulation (without the
+                book, table and output) from which workers set up the
+                same simulation
+            num_of_games: Number of games to play
+            seed: Seed of the games' seeds (see game_seeds)
+            batch_size: Largest number of games handed out at once
+            lease: Seconds after which games that are out are handed out
+                again
+            host: Address to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self._simulation = simulation
+        self._settings = settings
+        self._seeds = game_seeds(seed, num_of_games)
+        self._batch_size = batch_size
+        self._lease = lease
+        self._lock = threading.Condition()
+        self._queue = deque(range(num_of_games))
+        self._leases = {}
+        self._finished = bytearray(num_of_games)
+        self._remaining = num_of_games
+        self._server = _Server((host, port), _WorkerHandler)
+        self._server.coordinator = self
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """
+        returns the host and port the coordinator listens on
+        """
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def run(self) -> None:
+        """
+        Serves workers until every game has been recorded, then keeps the
+        games, moves and seconds of the run in the simulation's last_run.
+        """
+        start, start_moves = time.perf_counter(), self._simulation.total_moves
+        thread = threading.Thread(target=self._server.serve_forever,
+                                  daemon=True)
+        thread.start()
+        try:
+            with self._lock:
+                while self._remaining:
+                    self._lock.wait()
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+            thread.join()
+        self._simulation.last_run = (
+            len(self._seeds), self._simulation.total_moves - start_moves,
+            time.perf_counter() - start)
+
+    def serve_worker(self, connection: socket.socket,
+                     lines: Iterable[bytes]) -> None:
+        """
+        Talks to a worker until it leaves, then puts the games it still had
+        back in the queue.
+        """
+        peer = connection.getpeername()
+        logger.info("Worker %s connected", peer)
+        _send(connection, {"type": "settings", "settings": self._settings})
+        handed_out: set[int] = set()
+        try:
+            for line in lines:
+                message = json.loads(line)
+                if message["type"] == "request":
+                    reply = self._hand_out(handed_out)
+                    _send(connection, reply)
+                    if reply["type"] == "done":
+                        break
+                elif message["type"] == "result":
+                    self._collect(message["index"], message["record"])
+                    handed_out.discard(message["index"])
+        except (OSError, ValueError, KeyError) as error:
+            logger.warning("Lost worker %s: %s", peer, error)
+        finally:
+            with self._lock:
+                lost = [index for index in handed_out
+                        if not self._finished[index]]
+                for index in lost:
+                    self._leases.pop(index, None)
+                self._queue.extendleft(sorted(lost, reverse=True))
+            if lost:
+                logger.info("Requeued %d games of worker %s", len(lost),
+                            peer)
+
+    def _hand_out(self, handed_out: set[int]) -> dict[str, Any]:
+        """
+        Returns the reply to a worker asking for games, adding any games
+        handed out to it to the given set.
+        """
+        with self._lock:
+            if not self._remaining:
+                return {"type": "done"}
+            now = time.monotonic()
+            batch: list[int] = []
+            while self._queue and len(batch) < self._batch_size:
+                index = self._queue.popleft()
+                if not self._finished[index]:
+                    batch.append(index)
+            if not batch:
+                batch = [index for index, end in self._leases.items()
+                         if end <= now][:self._batch_size]
+            if not batch:
+                return {"type": "wait", "seconds": WAIT}
+            for index in batch:
+                self._leases[index] = now + self._lease
+            handed_out.update(batch)
+            return {"type": "batch",
+                    "games": [[index, self._seeds[index]]
+                              for index in batch]}
+
+    def _collect(self, index: int, record: GameRecord) -> None:
+        """
+        Records the result of a game, unless it was recorded before.
+        """
+        with self._lock:
+            if self._finished[index]:
+                return
+            self._finished[index] = 1
+            self._leases.pop(index, None)
+            self._remaining -= 1
+            self._simulation.record_game(record)
+            if not self._remaining:
+                self._lock.notify_all()
+
+
+def run_worker(host: str, port: int, retries: int = 0) -> int:
+    """
+    Connects to a coordinator and plays the games it hands out until it
+    says the run is done or goes away. Returns the number of games played.
+
+    retries: Number of times to try connecting again, a second apart, if
+    the coordinator is not up yet.
+    """
+    for attempt in range(retries + 1):
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except OSError:
+            if attempt == retries:
+                raise
+            time.sleep(1.0)
+    played = 0
+    with connection, connection.makefile("r", encoding="utf-8") as lines:
+        message = json.loads(lines.readline())
+        simulation = make_simulation(book=None, table_path=None,
+                                     **message["settings"])
+        try:
+            while True:
+                _send(connection, {"type": "request"})
+                line = lines.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message["type"] == "done":
+                    break
+                if message["type"] == "wait":
+                    time.sleep(message["seconds"])
+                    continue
+                for index, game_seed in message["games"]:
+                    record = simulation.play_game(game_seed)
+                    _send(connection, {"type": "result", "index": index,
+                                       "record": record})
+                    played += 1
+        except ConnectionError:
+            logger.info("The coordinator went away")
+    return played
@@ -6,12 +6,28 @@ from copy import deepcopy
 from base import GoBase, BoardGridType, ListMovesType
 from board import Board
 
+# Chains on the board: maps the position of every stone to the color,
+# stones and liberties of its chain (see Go.chains).
+ChainMapType = dict[
+    tuple[int, int], tuple[int, set[tuple[int, int]], set[tuple[int, int]]]
+]
+
+# Default number of moves Go.read_ladder reads before giving up; enough for
+# a ladder across a 19x19 board.
+LADDER_DEPTH = 80
+
+# Most moves Go.read_ladder places in all the lines it reads after each
+# first move. Ataris and captures that repeat (as in a ko) would otherwise
+# branch exponentially.
+LADDER_NODES = 400
 
 class Go(GoBase):
     """
     Class representing the game Go
     """
     captured_pos_color: dict[tuple[int, int], int | None]
+    _ladder_nodes: int
+    _generation: int
 
     def __init__(self, side: int, players: int, superko: bool = False):
         """
@@ -26,6 +42,8 @@ class Go(GoBase):
         self._num_of_moves = 0
         self._consecutive_passes = 0
         self.captured_pos_color = {}
+        self._ladder_nodes = 0
+        self._generation = 0
 
         if self._superko:
             self._previous_boards: set[tuple[tuple[int | None, ...], ...]] = \
@@ -68,6 +86,22 @@ class Go(GoBase):
         returns current number of turns of a Go object
         """
         return self._num_of_moves
+
+    @property
+    def generation(self) -> int:
+        """
+        returns the number of times the game was reset or loaded, so that
+        what is cached about a game can be told from a later game played
+        on the same object
+        """
+        return self._generation
+
+    @property
+    def consecutive_passes(self) -> int:
+        """
+        returns the number of passes played since the last move
+        """
+        return self._consecutive_passes
     @property
 
     def available_moves(self) -> ListMovesType:
@@ -81,6 +115,17 @@ class Go(GoBase):
                     moves.append((row, col))
         return moves
 
+    def empty_positions(self) -> ListMovesType:
+        """
+        Returns the list of positions on the board without a piece.
+        """
+        return [
+            (row, col)
+            for row in range(self._side)
+            for col in range(self._side)
+            if self._board.get(row, col) is None
+        ]
+
     @property
     def done(self) -> bool:
         """
@@ -117,6 +162,10 @@ class Go(GoBase):
         """
         if not self._board.valid_position(*pos):
             raise ValueError("Position is outside the bounds of the board.")
+        if self._board.get(*pos) is not None:
+            return False
+        if not self._superko and self._survives_simple_ko(pos):
+            return True
 
         resulting_board = tuple(
             tuple(row) for row in self.simulate_move(pos).grid
@@ -137,9 +186,9 @@ class Go(GoBase):
         if not self._board.valid_position(*pos):
             raise ValueError("Position is outside the bounds of the board.")
         if self._superko:
-            self._previous_boards.add(tuple(tuple(row) for row in self.grid))
+            self._previous_boards.add(self._board.snapshot())
         else:
-            self._previous_board = tuple(tuple(row) for row in self.grid)
+            self._previous_board = self._board.snapshot()
         self._board.set(*pos, self._turn)
 
 
@@ -153,6 +202,88 @@ class Go(GoBase):
         self.pass_turn()
         self._consecutive_passes = 0
 
+    def is_eye(self, pos: tuple[int, int], player: int) -> bool:
+        """
+        Checks whether an empty position is a single-point true eye of a
+        player: all its neighbors are the player's stones, and the opponents
+        hold none of its diagonals on the edge of the board, or at most one
+        in the middle of it.
+
+        Args:
+            pos: The position to check.
+            player: The player that would own the eye.
+
+        Returns:
+            A boolean indicating whether the position is an eye of player.
+        """
+        if self._board.get(*pos) is not None:
+            return False
+        for adjacent_pos in self._board.adjacent_positions(pos):
+            if self._board.get(*adjacent_pos) != player:
+                return False
+
+        diagonals = self._board.diagonal_positions(pos)
+        opponents = 0
+        for diagonal_pos in diagonals:
+            piece = self._board.get(*diagonal_pos)
+            if piece is not None and piece != player:
+                opponents += 1
+        if len(diagonals) < 4:
+            return opponents == 0
+        return opponents <= 1
+
+    def is_self_capture(self, pos: tuple[int, int]) -> bool:
+        """
+        Checks whether a stone of the current player placed on an empty
+        position would be captured straight away: it would have no empty
+        neighbor, connect only to chains of the player with no other
+        liberty, and capture no opposing chain.
+
+        Args:
+            pos: The empty position to check.
+
+        Returns:
+            A boolean indicating whether the move captures its own stone.
+        """
+        for adjacent_pos in self._board.adjacent_positions(pos):
+            piece = self._board.get(*adjacent_pos)
+            if piece is None:
+                return False
+            liberties = self.chain(adjacent_pos)[1]
+            if piece == self._turn and liberties - {pos}:
+                return False
+            if piece != self._turn and liberties == {pos}:
+                return False
+        return True
+
+    def _survives_simple_ko(self, pos: tuple[int, int]) -> bool:
+        """
+        Cheaply checks whether placing a stone on an empty position is
+        certainly legal under the simple ko rule, without simulating it.
+
+        If the stone keeps a liberty, the resulting board has a stone at pos.
+        When the board before the last move had no stone there, the two
+        boards differ and the move cannot violate the ko rule.
+
+        Args:
+            pos: The empty position to check.
+
+        Returns:
+            True if the move is certainly legal, False if it has to be
+            simulated to tell.
+        """
+        if self._previous_board is not None and \
+            self._previous_board[pos[0]][pos[1]] is not None:
+            return False
+        for adjacent_pos in self._board.adjacent_positions(pos):
+            piece = self._board.get(*adjacent_pos)
+            if piece is None:
+                return True
+            if piece == self._turn and \
+                self.chain(adjacent_pos)[1] - {pos}:
+                return True
+        return False
+
     def has_liberties(self, pos: tuple[int, int]) -> bool:
         """
         Return whether a group of stones has liberties.
@@ -182,6 +313,251 @@ class Go(GoBase):
                         stack.append(adjacent_pos)
         return False
 
+    def board_key(self) -> bytes:
+        """
+        Returns a compact encoding of the pieces on the board (one byte per
+        position, 0 when empty), for use as a key in caches. It does not
+        include the player to move.
+        """
+        return bytes(0 if piece is None else piece
+                     for row in self._board.snapshot() for piece in row)
+
+    def ko_point(self) -> tuple[int, int] | None:
+        """
+        Returns the empty position the simple ko rule forbids the player to
+        move from playing, as it would recreate the board before the last
+        move, or None if there is none (always None with superko).
+        """
+        if self._superko or self._previous_board is None:
+            return None
+        for row, col in self.empty_positions():
+            # Only a position that held a piece before the last move can
+            # take the board back there.
+            if self._previous_board[row][col] is not None and \
+                tuple(tuple(line) for line in
+                      self.simulate_move((row, col)).grid) == \
+                    self._previous_board:
+                return row, col
+        return None
+
+    def pattern_at(self, pos: tuple[int, int]) -> int:
+        """
+        Returns the 3x3 pattern code of a position (see board.Board). The
+        code is kept up to date as pieces are placed and captured, so this
+        is a single lookup.
+        """
+        return self._board.pattern(*pos)
+
+    def adjacent_positions(self, pos: tuple[int, int]) -> \
+        list[tuple[int, int]]:
+        """
+        Returns the positions on the board orthogonally adjacent to pos.
+        """
+        return self._board.adjacent_positions(pos)
+
+    def chain(self, pos: tuple[int, int]) -> \
+        tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """
+        Find the chain of stones connected to a position, and its liberties.
+
+        Args:
+            pos: The position of a stone in the chain.
+
+        Returns:
+            A tuple containing the stones of the chain and its liberties,
+            respectively. Both sets are empty if the position is empty.
+        """
+        color = self.piece_at(pos)
+        group: set[tuple[int, int]] = set()
+        liberties: set[tuple[int, int]] = set()
+        if color is None:
+            return group, liberties
+
+        board = self._board
+        stack = [pos]
+        while stack:
+            current_pos = stack.pop()
+            if current_pos in group:
+                continue
+            group.add(current_pos)
+
+            for adjacent_pos in board.adjacent_positions(current_pos):
+                adjacent_piece = board.get(*adjacent_pos)
+                if adjacent_piece is None:
+                    liberties.add(adjacent_pos)
+                elif adjacent_piece == color and adjacent_pos not in group:
+                    stack.append(adjacent_pos)
+        return group, liberties
+
+    def chains(self) -> ChainMapType:
+        """
+        Find every chain on the board, and its liberties.
+
+        Returns:
+            A dictionary mapping the position of every stone to the color,
+            stones and liberties of the chain it belongs to. All the stones
+            of a chain map to the same tuple.
+        """
+        chains: ChainMapType = {}
+        for row in range(self._side):
+            for col in range(self._side):
+                pos = (row, col)
+                color = self._board.get(row, col)
+                if color is not None and pos not in chains:
+                    group, liberties = self.chain(pos)
+                    chain = (color, group, liberties)
+                    for stone in group:
+                        chains[stone] = chain
+        return chains
+
+    def read_ladder(self, pos: tuple[int, int],
+                    max_depth: int = LADDER_DEPTH,
+                    attack: tuple[int, int] | None = None) -> bool:
+        """
+        Reads whether the chain at a position is captured in a ladder.
+
+        Only the forced sequence is read: the attacker keeps the chain in
+        atari, and the chain's owner either extends from its last liberty
+        or captures an attacking chain that is itself in atari. The chain
+        escapes once it has three liberties. If the chain has one liberty
+        its owner moves first; if it has two, the attacker (the player to
+        move, or the next player if the chain is theirs) starts with either
+        atari. Moves are placed and undone on the board itself, so reading
+        a ladder takes no copies; ko and superko are ignored.
+
+        Args:
+            pos: The position of a stone in the chain.
+            max_depth: Number of moves read before giving up. A ladder that
+            is not resolved by then, or within LADDER_NODES moves placed in
+            all after each first atari, counts as an escape. Each atari
+            gets a budget of its own, so one that runs into a ladder
+            breaker the long way does not leave the other unread.
+            attack: For a chain with two liberties, the only atari tried.
+
+        Returns: True if the chain is captured.
+        """
+        defender = self.piece_at(pos)
+        if defender is None:
+            return False
+        attacker = self._turn
+        if attacker == defender:
+            attacker = self._turn % self._players + 1
+        _, liberties = self.chain(pos)
+        undo: list[tuple[int, int, int | None]] = []
+        try:
+            if len(liberties) == 1:
+                self._ladder_nodes = LADDER_NODES
+                return self._ladder_defend(pos, defender, attacker,
+                                           max_depth, undo)
+            if len(liberties) == 2:
+                ataris = list(liberties) if attack is None else [attack]
+                for atari in ataris:
+                    self._ladder_nodes = LADDER_NODES
+                    if self._ladder_attack(pos, defender, attacker, [atari],
+                                           max_depth, undo):
+                        return True
+            return False
+        finally:
+            self._undo_ladder(undo, 0)
+
+    def _ladder_place(self, pos: tuple[int, int], color: int,
+                      undo: list[tuple[int, int, int | None]]) -> bool:
+        """
+        Places a stone for the ladder reader, removing the opposing chains
+        it captures. Every change is recorded in undo.
+
+        Returns: False if the stone has no liberties (the move is illegal),
+        in which case it is still on the board and must be undone.
+        """
+        board = self._board
+        self._ladder_nodes -= 1
+        undo.append((pos[0], pos[1], board.get(*pos)))
+        board.set(*pos, color)
+        has_liberty = False
+        for adjacent_pos in board.adjacent_positions(pos):
+            piece = board.get(*adjacent_pos)
+            if piece is None:
+                has_liberty = True
+                continue
+            if piece == color or any(
+                board.get(*position) is None
+                for position in board.adjacent_positions(adjacent_pos)):
+                continue
+            group, liberties = self.chain(adjacent_pos)
+            if not liberties:
+                for stone in group:
+                    undo.append((stone[0], stone[1], piece))
+                    board.set(*stone, None)
+                has_liberty = True
+        return has_liberty or bool(self.chain(pos)[1])
+
+    def _undo_ladder(self, undo: list[tuple[int, int, int | None]],
+                     mark: int) -> None:
+        """
+        Undoes the changes of the ladder reader made after undo had mark
+        entries.
+        """
+        board = self._board
+        while len(undo) > mark:
+            row, col, value = undo.pop()
+            board.set(row, col, value)
+
+    def _ladder_attack(self, pos: tuple[int, int], defender: int,
+                       attacker: int, ataris: list[tuple[int, int]],
+                       depth: int,
+                       undo: list[tuple[int, int, int | None]]) -> bool:
+        """
+        The attacker's turn: tries each atari on the chain at pos (which
+        has two liberties). Returns True if one of them captures it.
+        """
+        if depth <= 0 or self._ladder_nodes <= 0:
+            return False
+        for atari in ataris:
+            mark = len(undo)
+            if self._ladder_place(atari, attacker, undo) and \
+                len(self.chain(pos)[1]) == 1 and \
+                self._ladder_defend(pos, defender, attacker, depth - 1,
+                                    undo):
+                self._undo_ladder(undo, mark)
+                return True
+            self._undo_ladder(undo, mark)
+        return False
+
+    def _ladder_defend(self, pos: tuple[int, int], defender: int,
+                       attacker: int, depth: int,
+                       undo: list[tuple[int, int, int | None]]) -> bool:
+        """
+        The defender's turn, with the chain at pos in atari: tries to
+        capture an attacking chain in atari, then to extend. Returns True
+        if no move saves the chain.
+        """
+        if depth <= 0 or self._ladder_nodes <= 0:
+            return False
+        board = self._board
+        group, liberties = self.chain(pos)
+        escapes = set(liberties)
+        seen: set[tuple[int, int]] = set()
+        for stone in group:
+            for adjacent_pos in board.adjacent_positions(stone):
+                if adjacent_pos not in seen and \
+                    board.get(*adjacent_pos) == attacker:
+                    attackers, attacker_liberties = self.chain(adjacent_pos)
+                    seen |= attackers
+                    if len(attacker_liberties) == 1:
+                        escapes |= attacker_liberties
+        for escape in escapes:
+            mark = len(undo)
+            if self._ladder_place(escape, defender, undo):
+                liberties = self.chain(pos)[1]
+                if len(liberties) >= 3 or len(liberties) == 2 and \
+                    not self._ladder_attack(pos, defender, attacker,
+                                            list(liberties), depth - 1,
+                                            undo):
+                    self._undo_ladder(undo, mark)
+                    return False
+            self._undo_ladder(undo, mark)
+        return True
+
     def capture_group(self, pos: tuple[int, int]) -> None:
         """
         Capture a group of stones.
@@ -241,6 +617,162 @@ class Go(GoBase):
                         scores[player] += len(territory)
         return scores
 
+    def ownership(self) -> BoardGridType:
+        """
+        Estimates who owns every position: the player whose pieces have the
+        most influence on it (see board.INFLUENCE_RADIUS), or None if no
+        single player does. Pieces surrounded by stronger opposing influence
+        count as owned by the opponent.
+
+        The influence is kept up to date as pieces are placed and captured,
+        and only the area around each change is recomputed.
+        """
+        return self._board.owners()
+
+    def estimated_scores(self) -> dict[int, int]:
+        """
+        Estimates the scores of an unfinished game: the number of positions
+        each player owns according to ownership(). This costs time in
+        proportion to the moves made since the last estimate, not to the
+        size of the board.
+        """
+        owned = self._board.owned_counts()
+        return {player: owned.get(player, 0)
+                for player in range(1, self._players + 1)}
+
+    def pass_alive(self, player: int) -> \
+        tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """
+        Finds a player's pass-alive chains with Benson's algorithm: chains
+        that no sequence of opposing moves can capture, even if the player
+        always passes.
+
+        The regions of a player are the connected areas of positions that
+        do not hold the player's pieces. A region is vital to a chain that
+        borders it if all its empty positions are liberties of the chain.
+        Starting from all chains and regions, chains with fewer than two
+        vital regions are dropped, then regions bordered by a dropped chain,
+        until nothing changes; the chains left are pass-alive.
+
+        Args:
+            player: The player whose chains are checked.
+
+        Returns:
+            A tuple with the stones of the pass-alive chains, and the
+            positions of the regions they settle: regions bordered only by
+            pass-alive chains whose empty positions are all liberties of
+            those chains, where the opponent cannot live.
+        """
+        board = self._board
+        side = self._side
+        chain_index: dict[tuple[int, int], int] = {}
+        chains: list[tuple[set[tuple[int, int]], set[tuple[int, int]]]] = []
+        region_index: dict[tuple[int, int], int] = {}
+        # The positions, empty positions and bordering chains of each region
+        regions: list[tuple[set[tuple[int, int]], set[tuple[int, int]],
+                            set[int]]] = []
+        for row in range(side):
+            for col in range(side):
+                pos = (row, col)
+                if board.get(row, col) == player:
+                    if pos not in chain_index:
+                        group, liberties = self.chain(pos)
+                        for stone in group:
+                            chain_index[stone] = len(chains)
+                        chains.append((group, liberties))
+                elif pos not in region_index:
+                    region: set[tuple[int, int]] = set()
+                    empty: set[tuple[int, int]] = set()
+                    stack = [pos]
+                    while stack:
+                        current = stack.pop()
+                        if current in region:
+                            continue
+                        region.add(current)
+                        region_index[current] = len(regions)
+                        if board.get(*current) is None:
+                            empty.add(current)
+                        for adjacent_pos in board.adjacent_positions(current):
+                            if board.get(*adjacent_pos) != player and \
+                                adjacent_pos not in region:
+                                stack.append(adjacent_pos)
+                    regions.append((region, empty, set()))
+
+        for index, (group, _) in enumerate(chains):
+            for stone in group:
+                for adjacent_pos in board.adjacent_positions(stone):
+                    if adjacent_pos in region_index:
+                        regions[region_index[adjacent_pos]][2].add(index)
+
+        alive = set(range(len(chains)))
+        remaining = set(range(len(regions)))
+        while True:
+            vital = {index: 0 for index in alive}
+            for region_number in remaining:
+                _, empty, border = regions[region_number]
+                for index in border:
+                    if empty <= chains[index][1]:
+                        vital[index] += 1
+            dropped = {index for index, count in vital.items() if count < 2}
+            if not dropped:
+                break
+            alive -= dropped
+            remaining = {region_number for region_number in remaining
+                         if regions[region_number][2] <= alive}
+
+        stones = set()
+        for index in alive:
+            stones |= chains[index][0]
+        settled = set()
+        for region_number in remaining:
+            region, empty, border = regions[region_number]
+            if not border:
+                continue
+            border_liberties: set[tuple[int, int]] = set()
+            for index in border:
+                border_liberties |= chains[index][1]
+            if empty <= border_liberties:
+                settled |= region
+        return stones, settled
+
+    def settled(self) -> dict[tuple[int, int], int]:
+        """
+        Maps every position that is settled for good (see pass_alive) to
+        the player it belongs to: the stones of pass-alive chains and the
+        regions they settle, including any opposing stones in them.
+        """
+        owners = {}
+        for player in range(1, self._players + 1):
+            stones, regions = self.pass_alive(player)
+            for pos in stones | regions:
+                owners[pos] = player
+        return owners
+
+    def settled_scores(self) -> dict[int, int]:
+        """
+        Scores the board like scores(), except that settled positions (see
+        settled) count for the player they belong to, so opposing stones
+        left in a pass-alive player's regions count as dead.
+        """
+        settled = self.settled()
+        scores = {player: 0 for player in range(1, self._players + 1)}
+        visited = set()
+        for row in range(self._side):
+            for col in range(self._side):
+                pos = (row, col)
+                piece = self.piece_at(pos)
+                if pos in settled:
+                    scores[settled[pos]] += 1
+                elif piece is not None:
+                    scores[piece] += 1
+                elif pos not in visited:
+                    territory, borders = self.find_territory(pos)
+                    visited.update(territory)
+                    if len(borders) == 1:
+                        player = borders.pop()
+                        scores[player] += len(territory)
+        return scores
+
     def find_territory(
             self, pos: tuple[int, int],
             territory: list[tuple[int, int]] | None = None,
@@ -295,6 +827,25 @@ class Go(GoBase):
         self._consecutive_passes = 0
         self._turn = turn
         self._board.grid = grid
+        self._generation += 1
+
+    def reset(self) -> None:
+        """
+        Puts the game back to its beginning, with an empty board and the
+        same size, players and ko rule, reusing the board and containers of
+        the game.
+        """
+        self._board.clear()
+        self._turn = 1
+        self._num_of_moves = 0
+        self._consecutive_passes = 0
+        self.captured_pos_color.clear()
+        self._ladder_nodes = 0
+        self._generation += 1
+        if self._superko:
+            self._previous_boards.clear()
+        else:
+            self._previous_board = None
 
     def simulate_move(self, pos: tuple[int, int] | None) -> "GoBase":
         """
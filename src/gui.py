@@ -3,10 +3,15 @@ GUI implementation for Go
 """
 import math
 import sys
+import threading
+from copy import deepcopy
 from typing import Optional
 import click
 import pygame
 from go import Go
+from botbase import BaseBot, Deadline, Players
+from bot import PASS, STRATEGIES, make_bot
+from solver import SolutionTable
 
 ORANGE = (230, 165, 0)
 BLACK = (0, 0, 0)
@@ -35,21 +40,37 @@ class GoGUI():
     cell_size : int
     stone_rad : int
     buttons : dict[str, pygame.rect.Rect]
+    bot : BaseBot | None
+    show_ownership : bool
+    _bot_thread : threading.Thread | None
+    _bot_move : tuple[int, int] | None
 
-    def __init__(self, go: Go) -> None:
+    def __init__(self, go: Go, bot: BaseBot | None = None,\
+        ponder: bool = False, move_time: float | None = 2.0) -> None:
         """
         Constructor
 
         Args:
             go: The Go game to display and interact with
+            bot: A bot playing one of the players, or None if every player
+            is human
+            ponder: If True, the bot thinks while the humans are thinking
+            move_time: Seconds the bot may think about each move, or None
+            for no limit
         """
         self._go = go
+        self._bot = bot
+        self._ponder = ponder
+        self._move_time = move_time
+        self._bot_thread = None
+        self._bot_move = None
 
         pygame.init()
         self.game_started = False
         self.clock_timer= pygame.time.Clock()
         self.all_pos = {}
         self.captured_pos_color = {}
+        self.show_ownership = False
 
         self.cell_size = 700 // self._go.size
         self.stone_rad = self.cell_size // 4
@@ -248,6 +269,23 @@ class GoGUI():
                 piece_at_pos = self._go.piece_at((i, j))
                 self._draw_player_stone(piece_at_pos, (i, j))
 
+    def _draw_ownership(self) -> None:
+        """
+        Marks every position with a small square in the color of the player
+        estimated to own it (see Go.ownership)
+        """
+        half = self.stone_rad // 2
+        for i, row in enumerate(self._go.ownership()):
+            for j, owner in enumerate(row):
+                if owner is None:
+                    continue
+                square = pygame.rect.Rect(
+                    i * self.cell_size + BOARD_PADDING - half,
+                    j * self.cell_size + BOARD_PADDING - half,
+                    2 * half, 2 * half)
+                pygame.draw.rect(self.screen, PLAYER_COLORS[owner - 1],
+                                 square)
+
     def _draw_window(self) -> None:
         """
         Displays pygame's interactive window
@@ -259,6 +297,8 @@ class GoGUI():
             self.display_board()
             self._draw_button(font, self.buttons["pass_rect"], "PASS")
             self._draw_board_state()
+            if self.show_ownership:
+                self._draw_ownership()
 
             if self._go.done:
                 winner = self._go.outcome
@@ -293,23 +333,79 @@ class GoGUI():
                     loop = False
                     sys.exit()
 
+                elif event.type == pygame.KEYDOWN and \
+                    event.key == pygame.K_o:
+                    self.show_ownership = not self.show_ownership
+
                 elif self._go.done:
                     continue
 
-                elif event.type == pygame.MOUSEBUTTONDOWN:
+                elif event.type == pygame.MOUSEBUTTONDOWN and \
+                    self._bot_thread is None:
                     self._on_click(event.pos)
 
             self._draw_window()
             pygame.display.update()
+            self._bot_turn()
             self.clock_timer.tick(24)
 
+    def _bot_turn(self) -> None:
+        """
+        Lets the bot play if it is its turn. The bot thinks in a thread, on
+        a copy of the game and within the move time, so that the window
+        keeps responding; its move is played once the thread is done. Once
+        it has played, it ponders on the humans' time if pondering is
+        enabled.
+        """
+        if self._bot is None or not self.game_started:
+            return
+        if self._bot_thread is not None:
+            if self._bot_thread.is_alive():
+                return
+            self._bot_thread = None
+            self.captured_pos_color = self._go.captured_pos_color
+            if self._bot_move is None or self._bot_move == PASS:
+                self._go.pass_turn()
+            else:
+                self._go.apply_move(self._bot_move)
+            if self._ponder and not self._go.done:
+                self._bot.start_pondering(self._go)
+            return
+        if self._go.done:
+            self._bot.stop_pondering()
+            return
+        if self._go.turn != self._bot.show_player():
+            return
+
+        self._bot_thread = threading.Thread(
+            target=self._think,
+            args=(self._bot, deepcopy(self._go), Deadline(self._move_time)),
+            daemon=True)
+        self._bot_thread.start()
+
+    def _think(self, bot: BaseBot, game: Go, deadline: Deadline) -> None:
+        """
+        Asks the bot for its move. Runs in the bot's thread.
+        """
+        self._bot_move = bot.get_move(game, deadline)
+
 @click.command()
 @click.option("-n", "--num-players", default=2, help="Number of players")
 @click.option("-s", "--size", default=19, help="Size of the board")
 @click.option("--simple-ko", is_flag=True, help="Use simple ko rule")
 @click.option("--super-ko", is_flag=True, help="Use super ko rule")
+@click.option("--bot", type=click.Choice(STRATEGIES), default=None,
+              help="Let a bot play as player 2")
+@click.option("--ponder", is_flag=True,
+              help="Let the bot think during the other players' turns")
+@click.option("--table", "table_path", default=None,
+              type=click.Path(exists=True, dir_okay=False),
+              help="Solution table file for the perfect bot")
+@click.option("--move-time", default=2.0, type=click.FloatRange(min=0),
+              help="Seconds the bot may think about each move")
 def create_game(num_players: int = 2 , size: int = 19, simple_ko : bool = True,\
-    super_ko: bool = False) -> None:
+    super_ko: bool = False, bot: str | None = None, ponder: bool = False,
+    table_path: str | None = None, move_time: float = 2.0) -> None:
     """
     Creates go game from click commands, initializes GUI
         Args:
@@ -318,9 +414,18 @@ def create_game(num_players: int = 2 , size: int = 19, simple_ko : bool = True,\
             simple_ko (bool) - property that sets the simple_ko rule if super_ko
             is not declared in click interface
             super_ko - property that sets super_ko rule
+            bot (str|None) - strategy of the bot playing as player 2, if any
+            ponder (bool) - lets the bot think during the humans' turns
+            table_path (str|None) - solution table file for the perfect bot
+            move_time (float) - seconds the bot may think about each move
     """
+    table = None if table_path is None else SolutionTable.load(table_path)
+    if bot == "perfect" and table is None:
+        raise click.BadParameter("the perfect strategy needs --table")
     go = Go(size, num_players, super_ko)
-    go_gui = GoGUI(go)
+    opponent = None if bot is None else make_bot(bot, Players.BLACK,
+                                                 table=table)
+    go_gui = GoGUI(go, opponent, ponder, move_time)
     go_gui.gui_loop()
 
 def play_sound(sound_path: str) -> None:
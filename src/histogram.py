@@ -0,0 +1,106 @@
+"""
+Histograms of latencies that take the same memory however many are added
+"""
+import math
+from typing import Any
+
+# Smallest and largest latencies, in seconds, told apart by a histogram;
+# smaller and larger ones are counted in its first and last bucket.
+SMALLEST = 1e-6
+LARGEST = 1e4
+
+# Buckets per doubling of the latency: every bucket is 2 ** (1 / 8), about
+# 9%, wider than the one before it, which bounds the relative error of the
+# percentiles.
+BUCKETS_PER_DOUBLING = 8
+
+_BUCKETS = math.ceil(math.log2(LARGEST / SMALLEST) * BUCKETS_PER_DOUBLING) + 1
+
+
+class Histogram:
+    """
+    A histogram of latencies in seconds with logarithmic buckets (see
+    BUCKETS_PER_DOUBLING), from which percentiles are estimated. The
+    largest and smallest latencies are kept exactly.
+    """
+
+    counts: list[int]
+    count: int
+    total: float
+    smallest: float
+    largest: float
+
+    def __init__(self) -> None:
+        """
+        Constructor
+        """
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.smallest = math.inf
+        self.largest = 0.0
+
+    def add(self, seconds: float) -> None:
+        """
+        Adds a latency to the histogram.
+        """
+        bucket = 0
+        if seconds > SMALLEST:
+            bucket = min(_BUCKETS - 1, int(math.log2(seconds / SMALLEST)
+                                            * BUCKETS_PER_DOUBLING))
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.smallest = min(self.smallest, seconds)
+        self.largest = max(self.largest, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """
+        returns an estimate of the latency below which percent percent of
+        the latencies fall: the geometric middle of the bucket holding it,
+        kept within the smallest and largest latencies added, or the
+        largest itself for the last one (0 if none were added)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        if rank >= self.count:
+            return self.largest
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        middle = SMALLEST * 2 ** ((bucket + 0.5) / BUCKETS_PER_DOUBLING)
+        return min(self.largest, max(self.smallest, middle))
+
+    @property
+    def mean(self) -> float:
+        """
+        returns the mean of the latencies added (0 if none were)
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def state(self) -> dict[str, Any]:
+        """
+        returns the latencies added, to be saved
+        """
+        return {'counts': {bucket: count
+                           for bucket, count in enumerate(self.counts)
+                           if count},
+                'total': self.total,
+                'smallest': self.smallest if self.count else None,
+                'largest': self.largest}
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """
+        Sets the latencies added from a state saved by state.
+        """
+        self.counts = [0] * _BUCKETS
+        for bucket, count in state['counts'].items():
+            self.counts[int(bucket)] = count
+        self.count = sum(self.counts)
+        self.total = state['total']
+        self.smallest = math.inf if state['smallest'] is None \
+            else state['smallest']
+        self.largest = state['largest']
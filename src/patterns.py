@@ -0,0 +1,129 @@
+"""
+Weights of 3x3 patterns, for scoring moves in O(1)
+"""
+from functools import lru_cache
+from typing import Callable
+
+from board import PATTERN_DIRECTIONS, PATTERN_EMPTY, PATTERN_FIRST, \
+    PATTERN_OTHER, PATTERN_EDGE
+
+# Number of distinct pattern codes.
+NUM_PATTERNS = 1 << (2 * len(PATTERN_DIRECTIONS))
+
+# Contents of a neighbor, seen from the player to move.
+EMPTY = PATTERN_EMPTY
+OWN = PATTERN_FIRST
+OPPONENT = PATTERN_OTHER
+EDGE = PATTERN_EDGE
+
+
+def decode(code: int) -> tuple[int, ...]:
+    """
+    Splits a pattern code into the contents of the eight neighbors, in the
+    order of board.PATTERN_DIRECTIONS (north first, then clockwise).
+    """
+    return tuple((code >> (2 * i)) & 3 for i in range(len(PATTERN_DIRECTIONS)))
+
+
+@lru_cache(maxsize=1)
+def _swapped_codes() -> list[int]:
+    """
+    Returns, for every pattern code, the code with the pieces of player 1
+    and of the other players swapped.
+    """
+    swapped = []
+    for code in range(NUM_PATTERNS):
+        new_code = 0
+        for i, cell in enumerate(decode(code)):
+            if cell == PATTERN_FIRST:
+                cell = PATTERN_OTHER
+            elif cell == PATTERN_OTHER:
+                cell = PATTERN_FIRST
+            new_code |= cell << (2 * i)
+        swapped.append(new_code)
+    return swapped
+
+
+def shape_weight(cells: tuple[int, ...]) -> float:
+    """
+    A simple hand-written weight for a pattern, seen from the player to
+    move: cutting points and hane are good, empty triangles and lone moves
+    on the first line are bad.
+
+    Args:
+        cells: Contents of the eight neighbors (EMPTY, OWN, OPPONENT or EDGE)
+        in the order of board.PATTERN_DIRECTIONS
+
+    Returns: the weight
+    """
+    north, north_east, east, south_east, south, south_west, west, \
+        north_west = cells
+    weight = 0.0
+    corners = [(north, north_east, east), (east, south_east, south),
+               (south, south_west, west), (west, north_west, north)]
+    for side, diagonal, other_side in corners:
+        if side == OWN and other_side == OWN and diagonal == EMPTY:
+            weight -= 1.0
+        if side == OPPONENT and other_side == OPPONENT and \
+            diagonal != OPPONENT:
+            weight += 1.0
+        if side == OPPONENT and diagonal == OWN or \
+            other_side == OPPONENT and diagonal == OWN:
+            weight += 0.5
+    if EDGE in cells and all(cell in (EMPTY, EDGE) for cell in cells):
+        weight -= 0.5
+    return weight
+
+
+class PatternTable:
+    """
+    Maps 3x3 pattern codes to weights.
+
+    Weights are given from the point of view of the player to move (OWN
+    pieces are theirs). Codes on the board hold player 1's pieces as OWN,
+    so the table keeps a second copy of the weights with the colors swapped
+    for the other players; a lookup is then a single list access. With more
+    than two players, all opponents look the same.
+    """
+
+    _weights: list[float]
+    _swapped_weights: list[float]
+
+    def __init__(self, weights: list[float]) -> None:
+        """
+        Constructor
+
+        Args:
+            weights: The weight of every pattern code (NUM_PATTERNS of them)
+        """
+        if len(weights) != NUM_PATTERNS:
+            raise ValueError(f"Expected {NUM_PATTERNS} weights")
+        swapped = _swapped_codes()
+        self._weights = list(weights)
+        self._swapped_weights = [weights[swapped[code]]
+                                 for code in range(NUM_PATTERNS)]
+
+    @classmethod
+    def from_function(cls, weight: Callable[[tuple[int, ...]], float]) -> \
+        "PatternTable":
+        """
+        Precomputes a table from a function of the eight neighbors (as
+        returned by decode).
+        """
+        return cls([weight(decode(code)) for code in range(NUM_PATTERNS)])
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def default(cls) -> "PatternTable":
+        """
+        Returns the table of shape_weight, computed once.
+        """
+        return cls.from_function(shape_weight)
+
+    def weight(self, code: int, player: int) -> float:
+        """
+        Returns the weight of a pattern code for the given player to move.
+        """
+        if player == 1:
+            return self._weights[code]
+        return self._swapped_weights[code]
@@ -0,0 +1,262 @@
+"""
+Exact solver for tiny Go boards
+"""
+import struct
+import sys
+from hashlib import blake2b
+
+from go import Go
+from symmetry import canonical_hash, inverse_pos, transform_pos
+
+# File layout: a header with a magic string, a format version and the board
+# size, followed by one record per solved state, sorted by key.
+_MAGIC = b"GOSV"
+# Version 2 keys states by their ko point too (see state_key); version 3
+# keeps only values that hold wherever a state comes up (see Solver).
+_VERSION = 3
+_HEADER = struct.Struct("<4sBB")
+_RECORD = struct.Struct("<QBbBB")
+# Row/column stored for a pass.
+_PASS_BYTE = 255
+
+PASS = (-1, -1)
+
+# A solved state: canonical hash of the position and ko point, and number of
+# consecutive passes (see state_key).
+StateKey = tuple[int, int]
+
+
+def state_key(game: Go) -> tuple[StateKey, int]:
+    """
+    Returns the key of the state of a game and the transform that maps its
+    position onto the canonical orientation (see canonical_hash).
+
+    Besides the position and the player to move, a state is told apart by
+    the number of consecutive passes and by the point the simple ko rule
+    forbids (see Go.ko_point), as both change the moves that follow.
+    """
+    key, transform = canonical_hash(game)
+    ko_point = game.ko_point()
+    if ko_point is not None:
+        row, col = transform_pos(ko_point, transform, game.size)
+        digest = blake2b(key.to_bytes(8, "little") + bytes([row, col]),
+                         digest_size=8).digest()
+        key = int.from_bytes(digest, "little")
+    return (key, game.consecutive_passes), transform
+
+
+class SolutionTable:
+    """
+    Game-theoretic values and best moves of solved positions.
+
+    Values are the final score of the player to move minus their opponent's,
+    with perfect play from both sides from that state on. Entries are keyed
+    by state_key, so one entry covers all symmetric versions of a position.
+    """
+
+    _size: int
+    _entries: dict[StateKey, tuple[int, tuple[int, int]]]
+
+    def __init__(self, size: int,
+                 entries: dict[StateKey, tuple[int, tuple[int, int]]] |
+                 None = None) -> None:
+        """
+        Constructor
+
+        Args:
+            size: Number of squares on each side of the board
+            entries: Values and best moves (in canonical orientation) keyed
+            by state_key
+        """
+        self._size = size
+        self._entries = {} if entries is None else entries
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the board the table is for
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: StateKey) -> tuple[int, tuple[int, int]] | None:
+        """
+        Returns the value and best move (in canonical orientation) of a
+        state, or None if it has not been solved.
+        """
+        return self._entries.get(key)
+
+    def add(self, key: StateKey, value: int, move: tuple[int, int]) -> None:
+        """
+        Stores the value and best move (in canonical orientation) of a state.
+        """
+        self._entries[key] = (value, move)
+
+    def lookup(self, game: Go) -> tuple[int, tuple[int, int]] | None:
+        """
+        Returns the value and best move for the current position of a game,
+        or None if the position has not been solved.
+        """
+        if game.size != self._size:
+            return None
+        key, transform = state_key(game)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, move = entry
+        if move != PASS:
+            move = inverse_pos(move, transform, self._size)
+        return value, move
+
+    def save(self, path: str) -> None:
+        """
+        Writes the table to a file.
+        """
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self._size))
+            for key, passes in sorted(self._entries):
+                value, (row, col) = self._entries[(key, passes)]
+                if (row, col) == PASS:
+                    row = col = _PASS_BYTE
+                file.write(_RECORD.pack(key, passes, value, row, col))
+
+    @classmethod
+    def load(cls, path: str) -> "SolutionTable":
+        """
+        Reads a table written by save.
+
+        Raises:
+            ValueError: If the file is not a solution table.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Not a solution table: {path}")
+        magic, version, size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or \
+            (len(data) - _HEADER.size) % _RECORD.size:
+            raise ValueError(f"Not a solution table: {path}")
+
+        entries = {}
+        for key, passes, value, row, col in \
+            _RECORD.iter_unpack(data[_HEADER.size:]):
+            move = PASS if row == _PASS_BYTE else (row, col)
+            entries[(key, passes)] = (value, move)
+        return cls(size, entries)
+
+
+class Solver:
+    """
+    Solves two-player games on tiny boards by memoized negamax search.
+
+    Every state reached is stored in a SolutionTable keyed by state_key, so
+    symmetric positions (and symmetric moves within a position) are
+    only searched once. On top of the engine's simple ko rule, the search
+    forbids returning to any state already on the current line of play
+    (positional superko), which keeps it finite. A value that depends on
+    the earlier part of the line of play (because a move back to one of
+    those states was ruled out somewhere below it) is thrown away, so a
+    state may be searched again on another line. Every other value is
+    exact: it holds wherever the state comes up, taking the state as the
+    start of play for the superko rule, and only those are stored. The
+    position a search starts from always gets an exact value.
+
+    A 2x2 board solves in seconds. Ko fights make most states depend on
+    the line of play, so each extra row and column multiplies the work:
+    3x3 and up take hours and a lot of memory.
+    """
+
+    _size: int
+    table: SolutionTable
+    nodes: int
+
+    def __init__(self, size: int, table: SolutionTable | None = None) -> None:
+        """
+        Constructor
+
+        Args:
+            size: Number of squares on each side of the board
+            table: Exact values solved before, to reuse and add to (a new
+                table if None)
+        """
+        self._size = size
+        self.table = SolutionTable(size) if table is None else table
+        self.nodes = 0
+
+    def solve(self, game: Go | None = None) -> int:
+        """
+        Solves a position and every position reachable from it.
+
+        Args:
+            game: The position to solve (by default, the empty board)
+
+        Returns: the value of the position for the player to move
+        """
+        if game is None:
+            game = Go(self._size, 2)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 100_000))
+        try:
+            return self._negamax(game, {})[0]
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def _negamax(self, game: Go, path: dict[StateKey, int]) -> \
+        tuple[int, int]:
+        """
+        Returns the value of a position for the player to move, and the
+        lowest index into the line of play of a state the value depends on
+        (the length of the line if it depends on none).
+
+        path maps the states on the current line of play to their index.
+        """
+        self.nodes += 1
+        depth = len(path)
+        if game.done:
+            scores = game.scores()
+            own = scores.pop(game.turn)
+            return own - max(scores.values()), depth
+
+        state, transform = state_key(game)
+        entry = self.table.get(state)
+        if entry is not None:
+            return entry[0], depth
+
+        path[state] = depth
+        best_value: int | None = None
+        best_move = PASS
+        lowest = depth + 1
+        searched = set()
+        for move in game.available_moves + [PASS]:
+            child = game.simulate_move(None if move == PASS else move)
+            assert isinstance(child, Go)
+            child_state = state_key(child)[0]
+            if child_state in path:
+                lowest = min(lowest, path[child_state])
+                continue
+            if child_state in searched:
+                continue
+            searched.add(child_state)
+            value, child_lowest = self._negamax(child, path)
+            lowest = min(lowest, child_lowest)
+            if best_value is None or -value > best_value:
+                best_value = -value
+                best_move = move
+        del path[state]
+
+        if best_value is None:
+            # Every move repeats the line of play: pass, scoring it as if
+            # the game ended here.
+            scores = game.scores()
+            own = scores.pop(game.turn)
+            best_value = own - max(scores.values())
+        if best_move != PASS:
+            best_move = transform_pos(best_move, transform, self._size)
+        if lowest >= depth:
+            # Only this state and states after it on the line were ruled
+            # out, so the value holds wherever the state comes up.
+            self.table.add(state, best_value, best_move)
+            lowest = depth
+        return best_value, lowest
@@ -0,0 +1,146 @@
+"""
+Sequential probability ratio test for matches between two bots
+"""
+import math
+from typing import Any
+
+# Decisions of the test.
+H0 = "H0"
+H1 = "H1"
+
+
+def expected_score(elo: float) -> float:
+    """
+    returns the expected score per game of a player rated elo points above
+    its opponent
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+class SPRT:
+    """
+    A sequential probability ratio test of whether a player is elo0 (the
+    null hypothesis, H0) or elo1 (H1) Elo points stronger than its
+    opponent.
+
+    Games are added one at a time. The log-likelihood ratio (LLR) of the
+    scores is approximated as in the generalized SPRT used by fishtest:
+
+        LLR = n (s1 - s0) (2 mean - s0 - s1) / (2 variance)
+
+    with the expected scores s0 and s1 of the two hypotheses and the mean
+    and variance of the n scores so far (a tie scores 1/2). One virtual win
+    and one virtual loss are added to the scores, so that the variance is
+    never 0 and a run of wins alone can decide the test. The test
+    accepts H1 once the LLR reaches log((1 - beta) / alpha) and H0 once it
+    falls to log(beta / (1 - alpha)), so that alpha and beta are about the
+    rates of false positives and false negatives.
+    """
+
+    _elo0: float
+    _elo1: float
+    _lower: float
+    _upper: float
+    wins: int
+    ties: int
+    losses: int
+    trajectory: list[float]
+
+    def __init__(self, elo0: float, elo1: float, alpha: float = 0.05,
+                 beta: float = 0.05) -> None:
+        """
+        Constructor
+
+        Args:
+            elo0: Elo difference of the null hypothesis
+            elo1: Elo difference of the alternative (larger than elo0)
+            alpha: Largest rate of accepting H1 when H0 holds
+            beta: Largest rate of accepting H0 when H1 holds
+        """
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be larger than elo0")
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError("alpha and beta must be between 0 and 1")
+        self._elo0 = elo0
+        self._elo1 = elo1
+        self._lower = math.log(beta / (1 - alpha))
+        self._upper = math.log((1 - beta) / alpha)
+        self.wins = 0
+        self.ties = 0
+        self.losses = 0
+        self.trajectory = []
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        """
+        returns the LLRs at which H0 and H1 are accepted
+        """
+        return self._lower, self._upper
+
+    @property
+    def games(self) -> int:
+        """
+        returns the number of games added
+        """
+        return self.wins + self.ties + self.losses
+
+    def llr(self) -> float:
+        """
+        returns the log-likelihood ratio of H1 to H0 given the games so far
+        """
+        if self.games == 0:
+            return 0.0
+        wins = self.wins + 1
+        losses = self.losses + 1
+        games = wins + self.ties + losses
+        mean = (wins + self.ties / 2) / games
+        variance = (wins * (1 - mean) ** 2 + self.ties * (0.5 - mean) ** 2
+                    + losses * mean ** 2) / games
+        score0 = expected_score(self._elo0)
+        score1 = expected_score(self._elo1)
+        return games * (score1 - score0) * (2 * mean - score0 - score1) \
+            / (2 * variance)
+
+    def add(self, score: float) -> None:
+        """
+        Adds the score (1, 1/2 or 0) of a game of the player being tested
+        and records the new LLR in trajectory.
+        """
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.ties += 1
+        self.trajectory.append(self.llr())
+
+    def state(self) -> dict[str, Any]:
+        """
+        returns the results of the games added, to be saved
+        """
+        return {'wins': self.wins, 'ties': self.ties, 'losses': self.losses,
+                'trajectory': self.trajectory}
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """
+        Sets the results of the games added from a state saved by state.
+        """
+        self.wins = state['wins']
+        self.ties = state['ties']
+        self.losses = state['losses']
+        self.trajectory = list(state['trajectory'])
+
+    @property
+    def decision(self) -> str | None:
+        """
+        returns H0 or H1 once one of them is accepted, or None while the
+        test goes on
+        """
+        if not self.trajectory:
+            return None
+        llr = self.trajectory[-1]
+        if llr >= self._upper:
+            return H1
+        if llr <= self._lower:
+            return H0
+        return None
@@ -0,0 +1,164 @@
+"""
+Symmetries of the square Go board and canonical position hashing
+"""
+from functools import lru_cache
+from hashlib import blake2b
+from operator import itemgetter
+from typing import Callable
+
+from go import Go
+
+# Number of symmetries of a square board (the dihedral group of order 8).
+NUM_TRANSFORMS = 8
+
+
+def transform_pos(pos: tuple[int, int], transform: int, size: int) -> \
+    tuple[int, int]:
+    """
+    Applies one of the eight board symmetries to a position.
+
+    Bit 2 of transform transposes the board, bit 1 flips it vertically and
+    bit 0 flips it horizontally, in that order.
+
+    Args:
+        pos: Position on the board
+        transform: Number of the symmetry, from 0 to 7 (0 is the identity)
+        size: Number of squares on each side of the board
+
+    Returns: the transformed position
+    """
+    row, col = pos
+    last = size - 1
+    if transform & 4:
+        row, col = col, row
+    if transform & 2:
+        row = last - row
+    if transform & 1:
+        col = last - col
+    return row, col
+
+
+def inverse_pos(pos: tuple[int, int], transform: int, size: int) -> \
+    tuple[int, int]:
+    """
+    Undoes transform_pos: returns the position that transform maps to pos.
+    """
+    row, col = pos
+    last = size - 1
+    if transform & 1:
+        col = last - col
+    if transform & 2:
+        row = last - row
+    if transform & 4:
+        row, col = col, row
+    return row, col
+
+
+def position_key(game: Go) -> tuple[int, tuple[tuple[int | None, ...], ...]]:
+    """
+    Returns a hashable key for the position and the player to move.
+    """
+    return game.turn, tuple(tuple(row) for row in game.grid)
+
+
+@lru_cache(maxsize=None)
+def permutation_tables(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Precomputes the eight board symmetries as permutations of the positions,
+    numbered row by row.
+
+    Args:
+        size: Number of squares on each side of the board
+
+    Returns: for each transform, the number of the position that the
+    transform maps onto each position.
+    """
+    return tuple(
+        tuple(src_row * size + src_col
+              for row in range(size) for col in range(size)
+              for src_row, src_col in [inverse_pos((row, col), transform,
+                                                   size)])
+        for transform in range(NUM_TRANSFORMS))
+
+
+@lru_cache(maxsize=None)
+def _permuters(size: int) -> tuple[Callable[[bytes], bytes], ...]:
+    """
+    Returns, for each transform, a function that applies it to a board
+    encoded as in Go.board_key.
+    """
+    def permuter(table: tuple[int, ...]) -> Callable[[bytes], bytes]:
+        getter = itemgetter(*table)
+        return lambda board: bytes(getter(board))
+
+    return tuple(permuter(table) for table in permutation_tables(size))
+
+
+def canonical_board_key(game: Go) -> tuple[bytes, int]:
+    """
+    Returns the smallest of the eight symmetric versions of Go.board_key,
+    so that symmetric boards get the same key, and the transform that maps
+    the board onto it. The player to move is not included.
+    """
+    board = game.board_key()
+    best = board
+    best_transform = 0
+    for transform, permute in enumerate(_permuters(game.size)):
+        if transform:
+            encoding = permute(board)
+            if encoding < best:
+                best = encoding
+                best_transform = transform
+    return best, best_transform
+
+
+def canonical_hash(game: Go) -> tuple[int, int]:
+    """
+    Hashes a position so that all eight symmetric versions of it get the
+    same hash.
+
+    The position is encoded in each of the eight orientations, the smallest
+    encoding is picked as the canonical one and hashed to 64 bits.
+
+    Args:
+        game: The game whose position (and player to move) is hashed
+
+    Returns: a tuple with the hash and the transform that maps the position
+    onto its canonical orientation.
+    """
+    board, transform = canonical_board_key(game)
+    digest = blake2b(bytes([game.turn]) + board, digest_size=8).digest()
+    return int.from_bytes(digest, "little"), transform
+
+
+def group_symmetric_moves(game: Go, moves: list[tuple[int, int]]) -> \
+    list[list[tuple[int, int]]]:
+    """
+    Groups moves that lead to symmetric positions: two moves are in the same
+    group if a symmetry that leaves the board unchanged maps one onto the
+    other. A search needs to look at only one move of each group. Moves off
+    the board (such as a pass) are each in a group of their own.
+
+    Args:
+        game: The game whose board's symmetries are used
+        moves: The moves to group
+
+    Returns: the groups, in the order of their first moves in moves
+    """
+    size = game.size
+    board = game.board_key()
+    symmetries = [transform
+                  for transform, permute in enumerate(_permuters(size))
+                  if transform and permute(board) == board]
+    if not symmetries:
+        return [[move] for move in moves]
+    groups: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for move in moves:
+        row, col = move
+        if not (0 <= row < size and 0 <= col < size):
+            groups[move] = [move]
+            continue
+        representative = min([move] + [transform_pos(move, transform, size)
+                                       for transform in symmetries])
+        groups.setdefault(representative, []).append(move)
+    return list(groups.values())
@@ -0,0 +1,368 @@
+"""
+Round-robin tournaments between bot strategies, with Elo ratings
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from statistics import NormalDist
+
+from adjudicator import Adjudicator
+from book import OpeningBook
+from bot import Simulation, game_seeds, make_bot, parse_bot_spec
+from botbase import BaseBot, Players
+from go import Go
+from solver import SolutionTable
+
+# Elo points per unit of natural log strength.
+ELO_SCALE = 400 / math.log(10)
+
+
+class _GamePlayer:
+    """
+    Plays single games between bot specs, keeping one bot per spec and
+    color so that their caches last from game to game.
+    """
+
+    _size: int
+    _move_time_limit: float | None
+    _adjudicator: Adjudicator | None
+    _book: OpeningBook | None
+    _table: SolutionTable | None
+    _bots: dict[tuple[str, Players], BaseBot]
+
+    def __init__(self, size: int, move_time_limit: float | None,
+                 book_path: str | None, table_path: str | None,
+                 adjudicator: Adjudicator | None = None) -> None:
+        """
+        Constructor
+
+        Args:
+            size: Board size
+            move_time_limit: Seconds each bot has per move, if limited
+            book_path: Opening book file for the bots that search
+            table_path: Solution table file for the perfect bot
+            adjudicator: Decides when games stop and who won them
+                (the default Adjudicator if None)
+        """
+        self._size = size
+        self._move_time_limit = move_time_limit
+        self._adjudicator = adjudicator
+        self._book = None if book_path is None \
+            else OpeningBook.load(book_path)
+        self._table = None if table_path is None \
+            else SolutionTable.load(table_path)
+        self._bots = {}
+
+    def bot(self, strategy: str, player: Players) -> BaseBot:
+        """
+        returns the bot of a spec (see bot.parse_bot_spec) playing a color
+        """
+        if (strategy, player) not in self._bots:
+            self._bots[strategy, player] = make_bot(strategy, player,
+                                                    self._book, self._table)
+        return self._bots[strategy, player]
+
+    def play(self, white: str, black: str, seed: int) -> list[int]:
+        """
+        Plays a game from a seed between two bot specs, white moving
+        first, and returns its outcome (see Adjudicator.winners).
+        """
+        bots = [self.bot(white, Players.WHITE), self.bot(black, Players.BLACK)]
+        simulation = Simulation(Go(self._size, 2), bots,
+                                self._move_time_limit,
+                                adjudicator=self._adjudicator)
+        return simulation.play_game(seed)['outcome']
+
+
+_worker_player: _GamePlayer | None = None
+
+
+def _start_worker(size: int, move_time_limit: float | None,
+                  book_path: str | None, table_path: str | None,
+                  adjudicator: Adjudicator | None) -> None:
+    """
+    Sets up the game player of a worker process.
+    """
+    global _worker_player
+    _worker_player = _GamePlayer(size, move_time_limit, book_path,
+                                 table_path, adjudicator)
+
+
+def _play_worker_game(game: tuple[str, str, int]) -> list[int]:
+    """
+    Plays one scheduled game (white, black, seed) in a worker process and
+    returns its outcome.
+    """
+    assert _worker_player is not None
+    return _worker_player.play(*game)
+
+
+class Tournament:
+    """
+    A round-robin tournament: every pair of entrants, bots given by their
+    specs (see bot.parse_bot_spec), plays the same number of games, half of
+    them with each entrant moving first.
+
+    Results are kept as points (1 for a win, 1/2 for a tie) and games for
+    every ordered pair of entrants, from which Elo ratings are computed
+    (see elo_ratings).
+    """
+
+    _strategies: list[str]
+    _games_per_pair: int
+    _size: int
+    _move_time_limit: float | None
+    _book_path: str | None
+    _table_path: str | None
+    _adjudicator: Adjudicator | None
+    points: list[list[float]]
+    games: list[list[int]]
+
+    def __init__(self, strategies: list[str], games_per_pair: int = 10,
+                 size: int = 6, move_time_limit: float | None = None,
+                 book_path: str | None = None,
+                 table_path: str | None = None,
+                 adjudicator: Adjudicator | None = None) -> None:
+        """
+        Constructor
+
+        Args:
+            strategies: Specs of the entrants' bots (see
+                bot.parse_bot_spec), at least two and all different
+            games_per_pair: Number of games every pair plays (even, so
+                that both move first equally often)
+            size: Board size
+            move_time_limit: Seconds each bot has per move, if limited
+            book_path: Opening book file for the bots that search
+            table_path: Solution table file for the perfect bot
+            adjudicator: Decides when games stop and who won them
+                (the default Adjudicator if None)
+        """
+        # Specs naming the same options in another order or form, as
+        # alphabeta:time=1,depth=3 and alphabeta:depth=3,time=1.0, are the
+        # same bot.
+        bots = set()
+        for spec in strategies:
+            strategy, options = parse_bot_spec(spec)
+            bots.add((strategy, tuple(sorted(options.items()))))
+        if len(strategies) < 2 or len(bots) != len(strategies):
+            raise ValueError("A tournament needs at least two different "
+                             "strategies")
+        if games_per_pair < 2 or games_per_pair % 2:
+            raise ValueError("Every pair must play a positive, even number "
+                             "of games")
+        self._strategies = strategies
+        self._games_per_pair = games_per_pair
+        self._size = size
+        self._move_time_limit = move_time_limit
+        self._book_path = book_path
+        self._table_path = table_path
+        self._adjudicator = adjudicator
+        entrants = len(strategies)
+        self.points = [[0.0] * entrants for _ in range(entrants)]
+        self.games = [[0] * entrants for _ in range(entrants)]
+
+    @property
+    def strategies(self) -> list[str]:
+        """
+        returns the specs of the entrants' bots
+        """
+        return self._strategies
+
+    def schedule(self, seed: int) -> list[tuple[int, int, int]]:
+        """
+        Returns the games of the tournament as (white, black, seed), with
+        the entrants given by their index. Colors alternate within every
+        pairing, and every game has its own seed (see bot.game_seeds).
+        """
+        pairings = []
+        for first, second in combinations(range(len(self._strategies)), 2):
+            for game in range(self._games_per_pair):
+                if game % 2:
+                    pairings.append((second, first))
+                else:
+                    pairings.append((first, second))
+        seeds = game_seeds(seed, len(pairings))
+        return [(white, black, game_seed)
+                for (white, black), game_seed in zip(pairings, seeds)]
+
+    def run(self, seed: int, jobs: int = 1) -> None:
+        """
+        Plays every game of the schedule, sharing them among a pool of jobs
+        worker processes if there is more than one, and adds their results.
+        """
+        schedule = self.schedule(seed)
+        games = [(self._strategies[white], self._strategies[black], game_seed)
+                 for white, black, game_seed in schedule]
+        setup = (self._size, self._move_time_limit, self._book_path,
+                 self._table_path, self._adjudicator)
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs,
+                                     initializer=_start_worker,
+                                     initargs=setup) as pool:
+                outcomes = list(pool.map(_play_worker_game, games))
+        else:
+            player = _GamePlayer(*setup)
+            outcomes = [player.play(*game) for game in games]
+        for (white, black, _), outcome in zip(schedule, outcomes):
+            self.add_result(white, black, outcome)
+
+    def add_result(self, white: int, black: int, outcome: list[int]) -> None:
+        """
+        Adds the outcome of a game between two entrants, given by their
+        index, to the results.
+        """
+        white_points = 0.0
+        if Players.WHITE in outcome:
+            white_points = 1.0 / len(outcome)
+        black_points = 1.0 - white_points
+        self.points[white][black] += white_points
+        self.points[black][white] += black_points
+        self.games[white][black] += 1
+        self.games[black][white] += 1
+
+    def ratings(self, prior: float = 1.0, confidence: float = 0.95) -> \
+        list[tuple[float, float]]:
+        """
+        returns the Elo rating of every entrant and the half-width of its
+        confidence interval (see elo_ratings)
+        """
+        return elo_ratings(self.points, self.games, prior, confidence)
+
+    def crosstable(self, prior: float = 1.0, confidence: float = 0.95) -> \
+        str:
+        """
+        Returns a table of the entrants, best rated first, with their
+        ratings, total score and score against every other entrant.
+        """
+        ratings = self.ratings(prior, confidence)
+        order = sorted(range(len(self._strategies)),
+                       key=lambda entrant: -ratings[entrant][0])
+        name_width = max(len(name) for name in self._strategies)
+        header = f"{'':>3} {'Strategy':<{name_width}} {'Elo':>6} " \
+            f"{'+/-':>5} {'Score':>11}"
+        for rank in range(1, len(order) + 1):
+            header += f" {rank:>9}"
+        lines = [header]
+        for rank, entrant in enumerate(order, 1):
+            rating, interval = ratings[entrant]
+            points = sum(self.points[entrant])
+            games = sum(self.games[entrant])
+            line = f"{rank:>3} {self._strategies[entrant]:<{name_width}} " \
+                f"{rating:>+6.0f} {interval:>5.0f} " \
+                f"{_score(points, games):>11}"
+            for opponent in order:
+                if opponent == entrant:
+                    line += f" {'-':>9}"
+                else:
+                    line += " " + _score(self.points[entrant][opponent],
+                                         self.games[entrant][opponent]) \
+                        .rjust(9)
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def _score(points: float, games: int) -> str:
+    """
+    formats a number of points out of a number of games
+    """
+    return f"{points:g}/{games}"
+
+
+def elo_ratings(points: list[list[float]], games: list[list[int]],
+                prior: float = 1.0, confidence: float = 0.95) -> \
+    list[tuple[float, float]]:
+    """
+    Fits a Bradley-Terry model to the results of games between a number of
+    players and returns every player's Elo rating with the half-width of
+    its confidence interval.
+
+    points[i][j] is the number of points player i scored against player j
+    in games[i][j] games, a tie counting as half a win for each. The model
+    gives player i a strength g_i and says it beats player j with
+    probability g_i / (g_i + g_j). The strengths are fitted by maximum
+    likelihood with Hunter's MM algorithm. Like BayesElo, every pair that
+    played gets prior virtual tied games, so that players who won or lost
+    every game have finite ratings. Ratings average 0; the intervals come
+    from the inverse of the Fisher information.
+
+    Raises ValueError if the players do not all play each other, directly
+    or through other players.
+    """
+    count = len(points)
+    if not _connected(games):
+        raise ValueError("Every player must be linked to every other by "
+                         "the games played")
+    total = [[games[i][j] + prior if games[i][j] else 0.0
+              for j in range(count)] for i in range(count)]
+    wins = [sum(points[i][j] + prior / 2 for j in range(count) if games[i][j])
+            for i in range(count)]
+    strengths = [1.0] * count
+    for _ in range(10000):
+        updated = []
+        for i in range(count):
+            weight = sum(total[i][j] / (strengths[i] + strengths[j])
+                         for j in range(count) if total[i][j])
+            updated.append(wins[i] / weight)
+        mean = math.exp(sum(math.log(strength) for strength in updated)
+                        / count)
+        updated = [strength / mean for strength in updated]
+        change = max(abs(math.log(new / old))
+                     for new, old in zip(updated, strengths))
+        strengths = updated
+        if change < 1e-10:
+            break
+    information = [[0.0] * count for _ in range(count)]
+    for i in range(count):
+        for j in range(count):
+            if i != j and total[i][j]:
+                share = strengths[i] * strengths[j] / \
+                    (strengths[i] + strengths[j]) ** 2
+                information[i][j] = -total[i][j] * share
+                information[i][i] += total[i][j] * share
+    # The information matrix is singular (adding the same amount to every
+    # log strength changes nothing); shifting it by the all-ones matrix and
+    # back gives its pseudo-inverse, the covariance of ratings with mean 0.
+    shifted = [[value + 1 / count for value in row] for row in information]
+    covariance = _inverse(shifted)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    return [(ELO_SCALE * math.log(strengths[i]),
+             z * ELO_SCALE * math.sqrt(max(0.0, covariance[i][i] - 1 / count)))
+            for i in range(count)]
+
+
+def _connected(games: list[list[int]]) -> bool:
+    """
+    returns whether every player is linked to every other by games played
+    """
+    reached = {0}
+    frontier = [0]
+    while frontier:
+        player = frontier.pop()
+        for opponent, played in enumerate(games[player]):
+            if played and opponent not in reached:
+                reached.add(opponent)
+                frontier.append(opponent)
+    return len(reached) == len(games)
+
+
+def _inverse(matrix: list[list[float]]) -> list[list[float]]:
+    """
+    returns the inverse of a square matrix, by Gauss-Jordan elimination
+    with partial pivoting
+    """
+    size = len(matrix)
+    rows = [row[:] + [1.0 if i == j else 0.0 for j in range(size)]
+            for i, row in enumerate(matrix)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda i: abs(rows[i][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        divisor = rows[column][column]
+        rows[column] = [value / divisor for value in rows[column]]
+        for i in range(size):
+            if i != column and rows[i][column]:
+                factor = rows[i][column]
+                rows[i] = [value - factor * pivot_value
+                           for value, pivot_value in zip(rows[i],
+                                                         rows[column])]
+    return [row[size:] for row in rows]
@@ -7,6 +7,9 @@ from colorama import Fore, Style
 import click
 
 from go import Go
+from botbase import BaseBot, Players
+from bot import STRATEGIES, make_bot
+from solver import SolutionTable
 
 PASS_MOVE = (-1, -1)
 
@@ -31,15 +34,22 @@ class GoTUI():
     Class for presenting TUI for a game of Go
     """
     go: Go
+    bot: BaseBot | None
 
-    def __init__(self, go: Go) -> None:
+    def __init__(self, go: Go, bot: BaseBot | None = None,
+                 ponder: bool = False) -> None:
         """
         Constructor
 
         Args:
             go: The Go game to display and interact with
+            bot: A bot playing one of the players, or None if every player
+            is human
+            ponder: If True, the bot thinks while the humans are thinking
         """
         self._go = go
+        self._bot = bot
+        self._ponder = ponder
 
     def print_board(self) -> None:
         """
@@ -122,13 +132,21 @@ class GoTUI():
         """
         self.print_board()
         while not self._go.done:
-            move = self.get_move()
-            if move == PASS_MOVE:
-                self._go.pass_turn()
+            if self._bot is not None and \
+                self._go.turn == self._bot.show_player():
+                self._bot.make_move(self._go)
             else:
-                self._go.apply_move(move)
+                if self._bot is not None and self._ponder:
+                    self._bot.start_pondering(self._go)
+                move = self.get_move()
+                if move == PASS_MOVE:
+                    self._go.pass_turn()
+                else:
+                    self._go.apply_move(move)
             print("\033c", end="")
             self.print_board()
+        if self._bot is not None:
+            self._bot.stop_pondering()
         self.end_game()
 
     def end_game(self) -> None:
@@ -157,16 +175,31 @@ class GoTUI():
 @click.option("-s", "--size", default=19, help="Size of the board")
 @click.option("--simple-ko", is_flag=True, help="Use simple ko rule")
 @click.option("--super-ko", is_flag=True, help="Use super ko rule")
+@click.option("--bot", type=click.Choice(STRATEGIES), default=None,
+              help="Let a bot play as player 2")
+@click.option("--ponder", is_flag=True,
+              help="Let the bot think during the other players' turns")
+@click.option("--table", "table_path", default=None,
+              type=click.Path(exists=True, dir_okay=False),
+              help="Solution table file for the perfect bot")
 def main(
     num_players: int = 2,
     size: int = 19,
     simple_ko: bool = True,
-    super_ko: bool = False) -> None:
+    super_ko: bool = False,
+    bot: str | None = None,
+    ponder: bool = False,
+    table_path: str | None = None) -> None:
     """
     Main function for the TUI
     """
+    table = None if table_path is None else SolutionTable.load(table_path)
+    if bot == "perfect" and table is None:
+        raise click.BadParameter("the perfect strategy needs --table")
     go = Go(size, num_players, super_ko)
-    tui = GoTUI(go)
+    opponent = None if bot is None else make_bot(bot, Players.BLACK,
+                                                 table=table)
+    tui = GoTUI(go, opponent, ponder)
     print("\033c", end="")
     _ = input(Fore.GREEN + ">>WELCOME TO 碁! PRESS ANY KEY TO START<<\n")
     print("\033c", end="")
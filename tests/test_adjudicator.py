@@ -0,0 +1,121 @@
+"""
+Tests for deciding simulated games early
+"""
+import io
+import json
+from go import Go
+from adjudicator import CAP, END, PASSES, RESIGN, Adjudicator
+from bot import HeuristicBot, PlayoutBot, Simulation
+from botbase import Players
+from test_go import load_rows
+
+
+def test_max_moves_1() -> None:
+    """
+    Verifies that the move cap grows with the area of the board.
+    """
+    adjudicator = Adjudicator(moves_per_point=3.0)
+
+    assert adjudicator.max_moves(Go(5, 2)) == 75
+    assert adjudicator.max_moves(Go(19, 2)) == 1083
+
+
+def test_check_cap_1() -> None:
+    """
+    Verifies that a game stops once it reaches the move cap.
+    """
+    game = Go(4, 2)
+    adjudicator = Adjudicator(moves_per_point=0.25, resign_margin=None)
+    adjudicator.start()
+
+    reasons = []
+    for move in [(0, 0), (3, 3), (0, 3), (3, 0)]:
+        game.apply_move(move)
+        reasons.append(adjudicator.check(game))
+
+    assert reasons == [None, None, None, CAP]
+
+
+def test_check_end_1() -> None:
+    """
+    Verifies that a game that is over stops with its own outcome.
+    """
+    game = Go(4, 2)
+    game.apply_move((1, 1))
+    game.pass_turn()
+    game.pass_turn()
+    adjudicator = Adjudicator()
+    adjudicator.start()
+
+    assert adjudicator.check(game) == END
+    assert adjudicator.winners(game, END) == game.outcome
+
+
+def test_check_resign_1() -> None:
+    """
+    Verifies that a game is resigned once one player has had a large lead
+    for the required number of moves in a row, and not before.
+    """
+    game = load_rows(["WWWWW",
+                      "WWWWW",
+                      ".W.W.",
+                      ".....",
+                      "B...B"])
+    adjudicator = Adjudicator(resign_margin=0.3, resign_moves=3)
+    adjudicator.start()
+
+    reasons = [adjudicator.check(game) for _ in range(3)]
+
+    assert reasons == [None, None, RESIGN]
+    assert adjudicator.winners(game, RESIGN) == [Players.WHITE]
+
+
+def test_check_resign_2() -> None:
+    """
+    Verifies that a game with a small lead is never resigned.
+    """
+    game = load_rows(["W...B",
+                      ".....",
+                      ".....",
+                      ".....",
+                      "B...W"])
+    adjudicator = Adjudicator(resign_margin=0.3, resign_moves=1)
+    adjudicator.start()
+
+    assert all(adjudicator.check(game) is None for _ in range(5))
+
+
+def test_check_passes_1() -> None:
+    """
+    Verifies that a game stops when one player has passed and the other
+    could only fill its own eyes or capture itself, and that the settled
+    scores decide it.
+    """
+    game = load_rows(["BWW",
+                      "W.W",
+                      "WW."], turn=Players.BLACK)
+    game.pass_turn()
+    adjudicator = Adjudicator(resign_margin=None)
+    adjudicator.start()
+
+    assert adjudicator.check(game) == PASSES
+    assert adjudicator.winners(game, PASSES) == [Players.WHITE]
+
+
+def test_simulation_reasons_1() -> None:
+    """
+    Runs a simulation and verifies that every game records why it stopped
+    and stays within the move cap.
+    """
+    output = io.StringIO()
+    adjudicator = Adjudicator(moves_per_point=2.0)
+    simulation = Simulation(Go(5, 2), [HeuristicBot(Players.WHITE),
+                                       PlayoutBot(Players.BLACK)],
+                            output=output, adjudicator=adjudicator)
+
+    simulation.simulate_games(10, seed=11)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    for record in records:
+        assert record['reason'] in (END, CAP, RESIGN, PASSES)
+        assert record['num_moves'] <= 50
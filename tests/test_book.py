@@ -0,0 +1,159 @@
+"""
+Tests for board symmetries and the opening book
+"""
+from pathlib import Path
+import pytest
+from go import Go
+from book import OpeningBook, PASS
+from symmetry import canonical_board_key, canonical_hash, \
+    group_symmetric_moves, inverse_pos, permutation_tables, transform_pos
+
+
+@pytest.mark.parametrize("transform", range(8))
+def test_transform_1(transform: int) -> None:
+    """
+    Verifies that inverse_pos undoes transform_pos for every symmetry.
+    """
+    for row in range(5):
+        for col in range(5):
+            moved = transform_pos((row, col), transform, 5)
+            assert inverse_pos(moved, transform, 5) == (row, col)
+
+
+def test_canonical_hash_1() -> None:
+    """
+    Plays the same stone in the four corners of the board and verifies that
+    the four positions share a canonical hash, different from the empty
+    board's.
+    """
+    hashes = set()
+    for corner in [(0, 0), (0, 4), (4, 0), (4, 4)]:
+        game = Go(5, 2)
+        game.apply_move(corner)
+        hashes.add(canonical_hash(game)[0])
+
+    assert len(hashes) == 1
+    assert canonical_hash(Go(5, 2))[0] not in hashes
+
+
+@pytest.mark.parametrize("transform", range(8))
+def test_permutation_tables_1(transform: int) -> None:
+    """
+    Verifies that the permutation tables match inverse_pos.
+    """
+    table = permutation_tables(5)[transform]
+
+    for row in range(5):
+        for col in range(5):
+            src_row, src_col = inverse_pos((row, col), transform, 5)
+            assert table[row * 5 + col] == src_row * 5 + src_col
+
+
+def test_canonical_board_key_1() -> None:
+    """
+    Verifies that symmetric boards share a canonical key, and that the
+    transform maps the board onto it.
+    """
+    game = Go(5, 2)
+    game.apply_move((0, 1))
+    mirrored = Go(5, 2)
+    mirrored.apply_move((3, 4))
+
+    key, transform = canonical_board_key(game)
+
+    assert canonical_board_key(mirrored)[0] == key
+    row, col = transform_pos((0, 1), transform, 5)
+    assert key[row * 5 + col] == 1
+
+
+def test_group_symmetric_moves_1() -> None:
+    """
+    Verifies that the moves of the empty 5x5 board fall into the six
+    groups of symmetric points, with the pass on its own, and that a board
+    without symmetries leaves every move on its own.
+    """
+    game = Go(5, 2)
+    moves = game.available_moves + [PASS]
+
+    groups = group_symmetric_moves(game, moves)
+
+    assert sorted(len(group) for group in groups) == [1, 1, 4, 4, 4, 4, 8]
+    assert [PASS] in groups
+    assert sorted(move for group in groups for move in group) == \
+        sorted(moves)
+
+    game.apply_move((0, 1))
+    game.apply_move((2, 3))
+
+    assert len(group_symmetric_moves(game, game.available_moves)) == 23
+
+
+def test_book_lookup_1() -> None:
+    """
+    Adds a move for one position and verifies that the book answers with
+    the matching move in a symmetric position.
+    """
+    game = Go(5, 2)
+    game.apply_move((0, 1))
+    book = OpeningBook(5)
+    book.add(game, (1, 1))
+
+    mirrored = Go(5, 2)
+    mirrored.apply_move((0, 3))
+
+    assert book.lookup(mirrored) == (1, 3)
+    assert book.lookup(Go(5, 2)) is None
+    assert (book.hits, book.lookups) == (1, 2)
+
+
+def test_book_save_1(tmp_path: Path) -> None:
+    """
+    Writes a book to a file, reads it back and verifies the entries.
+    """
+    game = Go(5, 2)
+    book = OpeningBook(5)
+    book.add(game, (2, 2))
+    game.apply_move((2, 2))
+    book.add(game, PASS)
+    path = str(tmp_path / "book.bin")
+
+    book.save(path)
+    loaded = OpeningBook.load(path)
+
+    assert loaded.size == 5
+    assert len(loaded) == 2
+    assert loaded.lookup(game) == PASS
+    assert loaded.lookup(Go(5, 2)) == (2, 2)
+
+
+def test_book_build_1() -> None:
+    """
+    Builds a two-ply book and verifies that it covers the empty board and
+    every distinct reply expanded from it.
+    """
+    book = OpeningBook.build(3, 2, 2, lambda game: [(1, 1), (0, 0), (0, 1)])
+
+    assert len(book) == 3
+    assert book.lookup(Go(3, 2)) == (1, 1)
+
+
+def test_book_build_2() -> None:
+    """
+    Verifies that the move stored for a position is expanded first, then
+    the best ranked alternatives, and not the first moves of the board.
+    """
+    def rank_moves(game: Go) -> list[tuple[int, int]]:
+        return sorted(game.available_moves,
+                      key=lambda move: abs(move[0] - 2) + abs(move[1] - 2))
+
+    book = OpeningBook.build(5, 3, 2, rank_moves)
+
+    game = Go(5, 2)
+    assert book.lookup(game) == (2, 2)
+    game.apply_move((2, 2))
+    assert book.lookup(game) is not None
+    game.apply_move(book.lookup(game) or PASS)
+    assert book.lookup(game) is not None
+    corner = Go(5, 2)
+    corner.apply_move((0, 0))
+    assert book.lookup(corner) is None
@@ -0,0 +1,572 @@
+"""
+Tests for the Go bots
+"""
+import io
+import json
+import pickle
+import random
+import time
+from collections import Counter
+import pytest
+from go import Go
+from bot import AlphaBetaBot, HeuristicBot, MCTSBot, PlayoutBot, RandomBot
+from bot import SmartBot
+from bot import Simulation, PASS, game_seeds, parse_bot_spec
+from botbase import BaseBot, Deadline, Players
+from cache import EvalCache
+from patterns import PatternTable
+
+
+def load_small_game(size: int, white: list[tuple[int, int]],
+                    black: list[tuple[int, int]], turn: int = 1) -> Go:
+    """
+    Loads a size x size 2-player Go game with white (player 1) and black
+    (player 2) pieces at the given positions.
+
+    Returns: the loaded game
+    """
+    grid: list[list[int | None]] = [[None] * size for _ in range(size)]
+    for i, j in white:
+        grid[i][j] = 1
+    for i, j in black:
+        grid[i][j] = 2
+    game = Go(size, 2)
+    game.load_game(turn, grid)
+    return game
+
+
+class SlowBot(RandomBot):
+    """
+    Random bot that always takes a little time to answer.
+    """
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        Waits a millisecond, then returns a random move.
+        """
+        time.sleep(0.001)
+        return super().get_move(game, deadline)
+
+
+def test_alphabeta_capture_1() -> None:
+    """
+    Puts a black stone in atari and verifies that the alpha-beta bot
+    captures it.
+    """
+    game = load_small_game(5, [(1, 2), (2, 1), (3, 2)], [(2, 2)])
+    bot = AlphaBetaBot(Players.WHITE, time_limit=1.0, max_depth=2)
+
+    assert bot.get_move(game) == (2, 3)
+    assert bot.completed_depth == 2
+
+
+def test_alphabeta_time_limit_1() -> None:
+    """
+    Gives the alpha-beta bot no time at all and verifies that it still
+    returns a legal move.
+    """
+    game = Go(5, 2)
+    bot = AlphaBetaBot(Players.WHITE, time_limit=0.0)
+
+    move = bot.get_move(game)
+
+    assert bot.completed_depth == 0
+    assert move == PASS or game.legal_move(move)
+
+
+@pytest.mark.parametrize("size", [3, 4])
+def test_alphabeta_game_1(size: int) -> None:
+    """
+    Plays a whole game between two alpha-beta bots and verifies that every
+    move they choose is legal.
+    """
+    game = Go(size, 2)
+    bots = {1: AlphaBetaBot(Players.WHITE, time_limit=0.02),
+            2: AlphaBetaBot(Players.BLACK, time_limit=0.02)}
+    while not game.done and game.num_of_turns < 40:
+        move = bots[game.turn].get_move(game)
+        if move == PASS:
+            game.pass_turn()
+        else:
+            assert game.legal_move(move)
+            game.apply_move(move)
+
+
+def test_deadline_1() -> None:
+    """
+    Verifies that a deadline without a budget never expires, and that a
+    deadline with no time left expires on the first check.
+    """
+    assert not Deadline().expired()
+    assert Deadline().remaining() == float("inf")
+    assert Deadline(0.0).expired()
+
+
+def test_deadline_2() -> None:
+    """
+    Verifies that within() keeps the earlier of the two deadlines.
+    """
+    assert Deadline(0.0).within(10.0).expired()
+    assert Deadline(10.0).within(0.0).expired()
+    assert Deadline().within(None).end is None
+
+
+def test_smart_deadline_1() -> None:
+    """
+    Gives the smart bot an expired deadline and verifies that it still
+    returns a legal move or a pass.
+    """
+    game = Go(5, 2)
+    bot = SmartBot(Players.WHITE)
+
+    move = bot.get_move(game, Deadline(0.0))
+
+    assert move is None or move == PASS or game.legal_move(move)
+
+
+def test_smart_cache_1() -> None:
+    """
+    Verifies that the smart bot scores a position it has searched before
+    from its cache, and still chooses a legal move.
+    """
+    game = load_small_game(4, [(1, 1)], [(2, 2)])
+    cache: EvalCache[dict[int, int]] = EvalCache()
+    bot = SmartBot(Players.WHITE, cache=cache)
+
+    bot.get_move(game)
+    misses = cache.misses
+    move = bot.get_move(game)
+
+    assert move is not None
+    assert move == PASS or game.legal_move(move)
+    assert cache.misses == misses
+    assert cache.hits == misses
+
+
+def test_alphabeta_cache_1() -> None:
+    """
+    Verifies that iterative deepening finds the leaves of earlier
+    iterations in the cache.
+    """
+    game = load_small_game(4, [(1, 1)], [(2, 2)])
+    cache: EvalCache[dict[int, int]] = EvalCache()
+    bot = AlphaBetaBot(Players.WHITE, time_limit=60.0, max_depth=2,
+                       cache=cache)
+
+    bot.get_move(game)
+
+    assert cache.hits > 0
+
+
+def test_alphabeta_influence_1() -> None:
+    """
+    Verifies that the alpha-beta bot evaluating by influence plays a legal
+    move, and leaves the game it was given untouched.
+    """
+    game = load_small_game(5, [(1, 1)], [(3, 3)])
+    grid = game.grid
+    bot = AlphaBetaBot(Players.WHITE, time_limit=60.0, max_depth=2,
+                       influence=True)
+
+    move = bot.get_move(game)
+
+    assert move == PASS or game.legal_move(move)
+    assert game.grid == grid
+
+
+@pytest.mark.parametrize("rave", [True, False])
+def test_mcts_1(rave: bool) -> None:
+    """
+    Verifies that the tree search runs the number of playouts it is allowed
+    and plays a legal move, with and without RAVE.
+    """
+    game = load_small_game(5, [(0, 1), (0, 2), (1, 0), (2, 1), (2, 2)],
+                           [(1, 1), (1, 2), (3, 3), (3, 2)])
+    bot = MCTSBot(Players.WHITE, time_limit=60.0, max_playouts=20, rave=rave)
+
+    move = bot.get_move(game)
+
+    assert bot.playouts == 20
+    assert game.legal_move(move)
+
+
+def test_mcts_deadline_1() -> None:
+    """
+    Verifies that the tree search stops at the deadline.
+    """
+    game = Go(9, 2)
+    bot = MCTSBot(Players.WHITE, time_limit=60.0)
+
+    start = time.perf_counter()
+    move = bot.get_move(game, Deadline(0.2))
+
+    assert time.perf_counter() - start < 0.5
+    assert move == PASS or game.legal_move(move)
+
+
+def test_heuristic_ladder_1() -> None:
+    """
+    Verifies that the heuristic bot reading ladders starts a ladder that
+    works.
+    """
+    game = load_small_game(19, [(4, 4)], [(3, 4), (4, 3), (5, 5)], turn=2)
+    bot = HeuristicBot(Players.BLACK, ladders=True)
+
+    assert bot.get_move(game) in [(4, 5), (5, 4)]
+
+
+def test_playout_settled_1() -> None:
+    """
+    Verifies that the playout policy skipping settled positions never plays
+    inside a pass-alive wall's eyes.
+    """
+    white = [(0, 2), (1, 0), (1, 1), (1, 2), (2, 2), (3, 0), (3, 1), (3, 2),
+             (4, 2)]
+    game = load_small_game(5, white, [], turn=2)
+    bot = PlayoutBot(Players.BLACK, skip_settled=True)
+
+    for _ in range(30):
+        move = bot.get_move(game)
+        assert move[1] >= 3
+
+
+def test_playout_settled_2() -> None:
+    """
+    Verifies that the settled positions of a game are found again once the
+    game is reset, and that a bot that found some can still be pickled.
+    """
+    white = [(0, 2), (1, 0), (1, 1), (1, 2), (2, 2), (3, 0), (3, 1), (3, 2),
+             (4, 2)]
+    game = load_small_game(5, white, [], turn=2)
+    bot = PlayoutBot(Players.BLACK, skip_settled=True)
+    assert bot.settled(game)
+
+    game.reset()
+
+    assert bot.settled(game) == {}
+    assert pickle.loads(pickle.dumps(bot)).settled(game) == {}
+
+
+def test_parse_bot_spec_1() -> None:
+    """
+    Verifies that the options of a bot spec become the keyword arguments
+    of its bot.
+    """
+    assert parse_bot_spec("random") == ("random", {})
+    assert parse_bot_spec("alphabeta:time=2,depth=4,influence=off") == \
+        ("alphabeta", {'time_limit': 2.0, 'max_depth': 4, 'influence': False})
+    assert parse_bot_spec("mcts:rave=yes") == ("mcts", {'rave': True})
+
+
+@pytest.mark.parametrize("spec", ["clever", "random:time=1", "alphabeta:time",
+                                  "alphabeta:depth=two", "mcts:rave=maybe"])
+def test_parse_bot_spec_2(spec: str) -> None:
+    """
+    Verifies that unknown strategies and options and bad values are
+    rejected.
+    """
+    with pytest.raises(ValueError):
+        parse_bot_spec(spec)
+
+
+def test_simulation_timeouts_1() -> None:
+    """
+    Runs a simulation with a time limit no bot can meet and verifies that
+    every move was recorded as a timeout and played as a pass.
+    """
+    bots: list[BaseBot] = [SlowBot(Players.WHITE), SlowBot(Players.BLACK)]
+    simulation = Simulation(Go(4, 2), bots, move_time_limit=0.0)
+
+    simulation.simulate_games(1)
+
+    assert simulation.total_moves == 2
+    assert simulation.timeouts == {Players.WHITE: 1, Players.BLACK: 1}
+
+
+def test_simulation_jobs_1() -> None:
+    """
+    Runs the same seeded simulation serially and on two worker processes
+    and verifies that both produce the same results.
+    """
+    results = []
+    for jobs in (1, 2):
+        simulation = Simulation(Go(5, 2), [PlayoutBot(Players.WHITE),
+                                           RandomBot(Players.BLACK)])
+        results.append((simulation.simulate_games(6, jobs, seed=7),
+                        simulation.total_moves))
+
+    assert results[0] == results[1]
+
+
+def test_simulation_output_1() -> None:
+    """
+    Runs a simulation that writes its games to a file and verifies that
+    every line describes a finished game that agrees with the counts.
+    """
+    output = io.StringIO()
+    simulation = Simulation(Go(4, 2), [PlayoutBot(Players.WHITE),
+                                       RandomBot(Players.BLACK)],
+                            output=output)
+
+    white, black, ties, _ = simulation.simulate_games(5, seed=3)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record['seed'] for record in records] == game_seeds(3, 5)
+    assert sum(record['num_moves'] for record in records) == \
+        simulation.total_moves
+    wins = Counter(tuple(record['outcome']) for record in records)
+    assert (wins[(1,)] * 20, wins[(2,)] * 20) == (white, black)
+    assert (len(records) - wins[(1,)] - wins[(2,)]) * 20 == ties
+    slowest = max(records, key=lambda record: record['seconds'])
+    assert simulation.slowest_game == (slowest['seed'], slowest['seconds'])
+    assert simulation.game_times.count == 5
+    for record in records:
+        assert len(record['moves']) == record['num_moves']
+        assert set(record['scores']) == {'1', '2'}
+        think_times = record['think_times']
+        assert len(think_times['1']) + len(think_times['2']) == \
+            record['num_moves']
+        assert record['timeouts'] == {'1': 0, '2': 0}
+
+
+def test_simulation_replay_1() -> None:
+    """
+    Runs a seeded simulation, plays its games again one at a time from
+    their recorded seeds and verifies that every game ends the same way.
+    """
+    def make_simulation(output: io.StringIO | None = None) -> Simulation:
+        return Simulation(Go(5, 2), [HeuristicBot(Players.WHITE),
+                                     PlayoutBot(Players.BLACK)],
+                          output=output)
+
+    output = io.StringIO()
+    simulation = make_simulation(output)
+    simulation.simulate_games(4, seed=42)
+    seeds = [json.loads(line)['seed']
+             for line in output.getvalue().splitlines()]
+    assert seeds == game_seeds(42, 4)
+
+    results = []
+    for seed in seeds:
+        replay = make_simulation()
+        replay.play_games([seed])
+        results.append((replay.calculate_percentages(1), replay.total_moves))
+    total_moves = sum(moves for _, moves in results)
+    white_wins = sum(1 for (white, _, _, _), _ in results if white)
+
+    assert total_moves == simulation.total_moves
+    assert white_wins * 25 == simulation.calculate_percentages(4)[0]
+
+
+def test_simulation_reset_1() -> None:
+    """
+    Verifies that a simulation plays every game on the game it was given,
+    reset in place, and keeps its ko rule.
+    """
+    game = Go(4, 2, superko=True)
+    simulation = Simulation(game, [PlayoutBot(Players.WHITE),
+                                   RandomBot(Players.BLACK)])
+
+    simulation.simulate_games(3, seed=5)
+
+    assert game.superko
+    assert game.num_of_turns == 0
+    assert game.grid == Go(4, 2).grid
+
+
+def test_alphabeta_ponder_1() -> None:
+    """
+    Lets the alpha-beta bot ponder while white thinks, plays one of the
+    replies it pondered, and verifies that the next search picks up where
+    pondering stopped.
+    """
+    game = Go(3, 2)
+    game.apply_move((1, 1))
+    bot = AlphaBetaBot(Players.WHITE, time_limit=0.0, max_depth=3,
+                       ponder_width=9)
+
+    bot.start_pondering(game)
+    time.sleep(0.2)
+    game.apply_move((0, 0))
+    move = bot.get_move(game)
+
+    assert bot.ponder_hits == 1
+    assert bot.completed_depth >= 1
+    assert game.legal_move(move)
+
+
+def test_alphabeta_ponder_2() -> None:
+    """
+    Verifies that stopping the pondering without a matching reply leaves
+    the bot able to search normally.
+    """
+    game = Go(3, 2)
+    bot = AlphaBetaBot(Players.BLACK, time_limit=0.05, ponder_width=1)
+
+    bot.start_pondering(game)
+    bot.stop_pondering()
+    game.pass_turn()
+    game.apply_move((2, 2))
+    move = bot.get_move(game)
+
+    assert bot.ponder_hits == 0
+    assert move == PASS or game.legal_move(move)
+
+
+def test_alphabeta_deadline_1() -> None:
+    """
+    Gives the alpha-beta bot a deadline shorter than its own time limit and
+    verifies that it answers before the deadline.
+    """
+    game = Go(4, 2)
+    bot = AlphaBetaBot(Players.WHITE, time_limit=10.0)
+
+    deadline = Deadline(0.1)
+    bot.get_move(game, deadline)
+
+    assert deadline.remaining() > 0
+
+
+@pytest.mark.parametrize("bot", [SmartBot(Players.BLACK),
+                                 AlphaBetaBot(Players.BLACK, time_limit=10.0)])
+def test_deadline_19x19_1(bot: SmartBot | AlphaBetaBot) -> None:
+    """
+    Verifies that the searching bots answer close to a short deadline on a
+    full-size board, where finding the legal moves alone takes a while.
+    """
+    game = Go(19, 2)
+    rng = random.Random(1)
+    for _ in range(60):
+        game.apply_move(rng.choice(game.empty_positions()))
+
+    start = time.perf_counter()
+    move = bot.get_move(game, Deadline(0.05))
+
+    assert time.perf_counter() - start < 0.5
+    assert move is not None
+    assert move == PASS or game.legal_move(move)
+
+
+@pytest.mark.parametrize("bot", [
+    HeuristicBot(Players.WHITE, PatternTable.default(), ladders=True),
+    PlayoutBot(Players.WHITE, skip_settled=True),
+    MCTSBot(Players.WHITE, time_limit=10.0)])
+def test_deadline_19x19_2(bot: BaseBot) -> None:
+    """
+    Verifies that the playout and heuristic bots and the tree search
+    answer with a legal move close to a very short deadline in a 19x19
+    middle game.
+    """
+    game = Go(19, 2)
+    policy = PlayoutBot(Players.WHITE)
+    policy.use_rng(random.Random(1))
+    for _ in range(120):
+        policy.make_move(game)
+
+    start = time.perf_counter()
+    move = bot.get_move(game, Deadline(0.005))
+
+    assert time.perf_counter() - start < 0.05
+    assert move is not None
+    assert move == PASS or game.legal_move(move)
+
+
+def test_random_distribution_1() -> None:
+    """
+    Sets up a board where some empty positions are illegal because of the
+    ko rule and verifies that the random bot picks every legal move and the
+    pass about equally often, and never an illegal move.
+    """
+    game = load_small_game(4, [(0, 1), (1, 0), (2, 1)],
+                           [(0, 2), (1, 1), (1, 3), (2, 2)])
+    game.apply_move((1, 2))
+    legal = set(game.available_moves) | {PASS}
+    assert (1, 1) not in legal
+    bot = RandomBot(Players.BLACK)
+    bot.rng.seed(14200)
+
+    counts = Counter(bot.get_move(game) for _ in range(len(legal) * 300))
+
+    assert set(counts) == legal
+    assert min(counts.values()) > 200
+    assert max(counts.values()) < 400
+
+
+def test_random_full_board_1() -> None:
+    """
+    Verifies that the random bot passes when no move is legal.
+    """
+    game = load_small_game(2, [(0, 0), (0, 1), (1, 0), (1, 1)], [])
+
+    assert RandomBot(Players.BLACK).get_move(game) == PASS
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_playout_game_1(seed: int) -> None:
+    """
+    Plays a game between two playout bots and verifies that it ends with
+    both bots passing, without either of them filling its own eyes.
+    """
+    random.seed(seed)
+    game = Go(5, 2)
+    bots = {1: PlayoutBot(Players.WHITE), 2: PlayoutBot(Players.BLACK)}
+    while not game.done and game.num_of_turns < 256:
+        move = bots[game.turn].get_move(game)
+        assert move == PASS or not game.is_eye(move, game.turn)
+        if move == PASS:
+            game.pass_turn()
+        else:
+            game.apply_move(move)
+
+    assert game.done
+
+
+def test_heuristic_capture_1() -> None:
+    """
+    Puts a black stone in atari and verifies that the heuristic bot
+    captures it.
+    """
+    game = load_small_game(5, [(1, 2), (2, 1), (3, 2)], [(2, 2)])
+
+    assert HeuristicBot(Players.WHITE).get_move(game) == (2, 3)
+
+
+def test_heuristic_save_1() -> None:
+    """
+    Puts a white stone in atari and verifies that the heuristic bot moves
+    it out of atari.
+    """
+    game = load_small_game(5, [(2, 2)], [(1, 2), (2, 1), (3, 2)])
+
+    assert HeuristicBot(Players.WHITE).get_move(game) == (2, 3)
+
+
+def test_heuristic_self_atari_1() -> None:
+    """
+    Verifies that the heuristic bot scores a self-atari below a move that
+    keeps its liberties.
+    """
+    game = load_small_game(5, [], [(0, 2), (1, 1)])
+    bot = HeuristicBot(Players.WHITE)
+    chains = game.chains()
+
+    self_atari = bot.score_move(game, (0, 1), chains)
+    safe = bot.score_move(game, (3, 3), chains)
+
+    assert self_atari is not None and safe is not None
+    assert self_atari < safe
+
+
+def test_heuristic_simulation_1() -> None:
+    """
+    Plays heuristic bots against random bots and verifies that the
+    heuristic bots win most games.
+    """
+    random.seed(142)
+    simulation = Simulation(Go(5, 2), [HeuristicBot(Players.WHITE),
+                                       RandomBot(Players.BLACK)])
+
+    white, _, _, _ = simulation.simulate_games(20)
+
+    assert white >= 70
@@ -0,0 +1,49 @@
+"""
+Tests for the evaluation cache
+"""
+import pytest
+from cache import EvalCache
+
+
+def test_cache_1() -> None:
+    """
+    Verifies that a full cache evicts the least recently used entry and
+    counts hits, misses and evictions.
+    """
+    cache: EvalCache[int] = EvalCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+
+
+def test_cache_2() -> None:
+    """
+    Verifies that get_or_compute only computes values it does not have.
+    """
+    cache: EvalCache[int] = EvalCache(4)
+    calls = []
+
+    def compute() -> int:
+        calls.append(1)
+        return 42
+
+    assert cache.get_or_compute("a", compute) == 42
+    assert cache.get_or_compute("a", compute) == 42
+    assert len(calls) == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_cache_3() -> None:
+    """
+    Verifies that a cache needs room for at least one entry.
+    """
+    with pytest.raises(ValueError):
+        EvalCache(0)
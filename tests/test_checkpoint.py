@@ -0,0 +1,220 @@
+"""
+Tests for checkpoints of simulation runs
+"""
+import io
+import json
+import os
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from go import Go
+from bot import HeuristicBot, PlayoutBot, Simulation, main
+from botbase import Deadline, Players
+from checkpoint import Checkpoint, CheckpointError
+from sprt import SPRT
+
+
+class CrashingBot(PlayoutBot):
+    """
+    Playout bot that fails after a number of moves, like a run that is
+    interrupted.
+    """
+
+    def __init__(self, player: Players, moves: int) -> None:
+        """
+        Initialize the bot to fail after a number of moves.
+        """
+        super().__init__(player)
+        self.moves_left = moves
+
+    def get_move(self, game: Go, deadline: Deadline | None = None) -> \
+        tuple[int, int]:
+        """
+        Returns a playout move, or fails once the moves have run out.
+        """
+        if self.moves_left == 0:
+            raise RuntimeError("interrupted")
+        self.moves_left -= 1
+        return super().get_move(game, deadline)
+
+
+def make_simulation(output: io.StringIO, moves: int | None = None) -> \
+    Simulation:
+    """
+    Creates a simulation between a heuristic bot and a playout bot that
+    fails after a number of moves, if given. Both have the settings of the
+    same run, so that either can resume from the other's checkpoints.
+    """
+    black = PlayoutBot(Players.BLACK) if moves is None \
+        else CrashingBot(Players.BLACK, moves)
+    return Simulation(Go(5, 2), [HeuristicBot(Players.WHITE), black],
+                      output=output,
+                      settings={'size': 5, 'bots': ['heuristic', 'light']})
+
+
+def without_times(output: io.StringIO) -> list[dict[str, object]]:
+    """
+    Returns the game records written to an output, without their times.
+    """
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    for record in records:
+        del record['think_times']
+        del record['seconds']
+    return records
+
+
+def test_checkpoint_save_1(tmp_path: Path) -> None:
+    """
+    Saves a state and verifies that it loads back and that no temporary
+    file is left behind.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    checkpoint = Checkpoint(path)
+    assert checkpoint.load() is None
+
+    checkpoint.save({"games": 3})
+    checkpoint.save({"games": 4})
+
+    assert Checkpoint(path).load() == {"games": 4}
+    assert os.listdir(tmp_path) == ["run.json"]
+
+
+def test_checkpoint_load_1(tmp_path: Path) -> None:
+    """
+    Verifies that a file that is not a checkpoint is rejected.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("not json")
+
+    with pytest.raises(CheckpointError):
+        Checkpoint(path).load()
+
+
+def test_checkpoint_load_2(tmp_path: Path) -> None:
+    """
+    Verifies that a checkpoint saved in an older format is rejected.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"version": 1, "state": {"games": 3}}, file)
+
+    with pytest.raises(CheckpointError, match="another version"):
+        Checkpoint(path).load()
+
+
+def test_checkpoint_due_1(tmp_path: Path) -> None:
+    """
+    Verifies that a checkpoint is due only once its interval has passed.
+    """
+    path = os.path.join(tmp_path, "run.json")
+
+    assert Checkpoint(path, interval=0.0).due()
+    assert not Checkpoint(path, interval=60.0).due()
+
+
+def test_simulation_resume_1(tmp_path: Path) -> None:
+    """
+    Interrupts a run that checkpoints after every game, resumes it and
+    verifies that the counts and the games written are those of a run
+    that was never interrupted.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    expected_output = io.StringIO()
+    expected = make_simulation(expected_output).simulate_games(8, seed=4)
+
+    output = io.StringIO()
+    with pytest.raises(RuntimeError):
+        make_simulation(output, moves=60).simulate_games(
+            8, seed=4, checkpoint=Checkpoint(path, interval=0.0))
+    state = Checkpoint(path).load()
+    assert state is not None and 0 < state['games'] < 8
+    resumed = make_simulation(output)
+    result = resumed.simulate_games(8, checkpoint=Checkpoint(path),
+                                    resume=True)
+
+    assert result == expected
+    assert without_times(output) == without_times(expected_output)
+    assert sum(histogram.count
+               for histogram in resumed.think_times.values()) == \
+        resumed.total_moves
+    assert resumed.last_run is not None
+    assert resumed.last_run[0] == 8 - state['games']
+
+
+def test_simulation_resume_2(tmp_path: Path) -> None:
+    """
+    Verifies that a checkpoint cannot resume a run of a different length.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    make_simulation(io.StringIO()).simulate_games(
+        2, seed=1, checkpoint=Checkpoint(path))
+
+    with pytest.raises(CheckpointError):
+        make_simulation(io.StringIO()).simulate_games(
+            3, checkpoint=Checkpoint(path), resume=True)
+
+
+def test_simulation_resume_3(tmp_path: Path) -> None:
+    """
+    Verifies that a checkpoint cannot resume a run with other bots or on
+    another board.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    make_simulation(io.StringIO()).simulate_games(
+        2, seed=1, checkpoint=Checkpoint(path))
+    other_bots = Simulation(Go(5, 2), [PlayoutBot(Players.WHITE),
+                                       PlayoutBot(Players.BLACK)])
+    other_board = Simulation(Go(4, 2), [HeuristicBot(Players.WHITE),
+                                        PlayoutBot(Players.BLACK)])
+
+    for simulation in (other_bots, other_board):
+        with pytest.raises(CheckpointError):
+            simulation.simulate_games(2, checkpoint=Checkpoint(path),
+                                      resume=True)
+
+
+def test_main_resume_1(tmp_path: Path) -> None:
+    """
+    Verifies that the command line reports a checkpoint of another run as
+    a bad --checkpoint rather than failing with a traceback.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    runner = CliRunner()
+    runner.invoke(main, ["-n", "2", "-s", "4", "--seed", "1",
+                         "--checkpoint", path])
+
+    result = runner.invoke(main, ["-n", "3", "-s", "4", "--checkpoint", path,
+                                  "--resume"])
+
+    assert result.exit_code == 2
+    assert "different run" in result.output
+    for options in (["-s", "5"], ["-1", "light"], ["-t", "1"],
+                    ["--moves-per-point", "2"]):
+        result = runner.invoke(main, ["-n", "2", "-s", "4", "--checkpoint",
+                                      path, "--resume"] + options)
+        assert result.exit_code == 2
+        assert "different run" in result.output
+    result = runner.invoke(main, ["-n", "2", "-s", "4", "--checkpoint", path,
+                                  "--resume"])
+    assert result.exit_code == 0
+
+
+def test_sprt_resume_1(tmp_path: Path) -> None:
+    """
+    Verifies that the results of an SPRT are saved with the checkpoint and
+    that a resumed test that has already decided plays no more games.
+    """
+    path = os.path.join(tmp_path, "run.json")
+    sprt = SPRT(0, 100)
+    make_simulation(io.StringIO()).run_sprt(sprt, 200, seed=5,
+                                            checkpoint=Checkpoint(path))
+
+    resumed_sprt = SPRT(0, 100)
+    resumed = make_simulation(io.StringIO())
+    resumed.run_sprt(resumed_sprt, 200, checkpoint=Checkpoint(path),
+                     resume=True)
+
+    assert resumed_sprt.decision == sprt.decision
+    assert resumed_sprt.trajectory == sprt.trajectory
+    assert resumed.game_times.count == sprt.games
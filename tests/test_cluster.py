@@ -0,0 +1,98 @@
+"""
+Tests for simulations spread over workers
+"""
+import io
+import json
+import socket
+import threading
+from typing import Any
+from bot import make_simulation
+from cluster import Coordinator, run_worker
+
+SETTINGS: dict[str, Any] = {
+    'size': 5, 'player1': 'heuristic', 'player2': 'light',
+    'move_time': None, 'moves_per_point': 3.0, 'resign_margin': 0.3,
+    'resign_moves': 10}
+
+
+def start(coordinator: Coordinator) -> threading.Thread:
+    """
+    Runs a coordinator in a thread and returns the thread.
+    """
+    thread = threading.Thread(target=coordinator.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def without_times(output: io.StringIO) -> list[dict[str, object]]:
+    """
+    Returns the game records written to an output, sorted by seed and
+    without their times.
+    """
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    for record in records:
+        del record['think_times']
+        del record['seconds']
+    return sorted(records, key=lambda record: record['seed'])
+
+
+def test_coordinator_run_1() -> None:
+    """
+    Shares a run between two workers and verifies that every game is
+    counted once, with the results of the same run played in one process.
+    """
+    expected_output = io.StringIO()
+    expected = make_simulation(book=None, table_path=None,
+                               output=expected_output, **SETTINGS)
+    expected_result = expected.simulate_games(12, seed=8)
+
+    output = io.StringIO()
+    simulation = make_simulation(book=None, table_path=None, output=output,
+                                 **SETTINGS)
+    coordinator = Coordinator(simulation, SETTINGS, 12, 8, batch_size=2)
+    thread = start(coordinator)
+    host, port = coordinator.address
+    workers = [threading.Thread(target=run_worker, args=(host, port))
+               for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    thread.join()
+
+    assert simulation.calculate_percentages(12) == expected_result
+    assert simulation.last_run is not None
+    assert simulation.last_run[:2] == (12, simulation.total_moves)
+    assert without_times(output) == without_times(expected_output)
+
+
+def test_coordinator_run_2() -> None:
+    """
+    Verifies that the games of a worker that leaves before finishing them
+    are handed out again, and that a game sent back twice counts once.
+    """
+    simulation = make_simulation(book=None, table_path=None, **SETTINGS)
+    coordinator = Coordinator(simulation, SETTINGS, 4, 3, batch_size=3)
+    thread = start(coordinator)
+    host, port = coordinator.address
+    player = make_simulation(book=None, table_path=None, **SETTINGS)
+
+    with socket.create_connection((host, port)) as connection, \
+        connection.makefile("rw", encoding="utf-8") as lines:
+        lines.readline()
+        lines.write(json.dumps({"type": "request"}) + "\n")
+        lines.flush()
+        batch = json.loads(lines.readline())["games"]
+        index, game_seed = batch[0]
+        record = player.play_game(game_seed)
+        for _ in range(2):
+            lines.write(json.dumps({"type": "result", "index": index,
+                                    "record": record}) + "\n")
+        lines.flush()
+    assert len(batch) == 3
+
+    assert run_worker(host, port) == 3
+    thread.join()
+
+    assert simulation.game_times.count == 4
+    assert sum(simulation.calculate_percentages(4)[:3]) == 100
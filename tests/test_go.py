@@ -1,8 +1,11 @@
 """
 Tests for Go
 """
+import random
+import time
 import pytest
 from go import Go
+from patterns import EDGE, EMPTY, OPPONENT, OWN, decode
 from typing import Union
 
 ####Fixtures####
@@ -369,6 +372,22 @@ def test_ko_1(game: Go) -> None:
     assert not game.legal_move((5, 6))
 
 
+def test_ko_point_1(game: Go) -> None:
+    """
+    Verifies that ko_point names the recapture the ko rule forbids, and
+    nothing once another move has been played.
+    """
+    moves= [(5, 6), (5, 5), (4, 7), (4, 6), (6, 7), (6, 6), (5, 8)]
+    game = sets_grid(game, moves)
+    assert game.ko_point() is None
+
+    game.apply_move((5, 7))
+    assert game.ko_point() == (5, 6)
+
+    game.apply_move((0, 0))
+    assert game.ko_point() is None
+
+
 def test_superko_1() -> None:
     """
     Makes moves in such a way that there will end up being a move that would
@@ -655,3 +674,343 @@ def test_scores_7(game_3: Go) -> None:
     game_3.pass_turn()
 
     assert game_3.scores() == {1: 7, 2: 6, 3: 6}
+
+
+def test_chain_1(game: Go) -> None:
+    """
+    Builds a chain of three stones next to an opposing stone and verifies
+    that chain returns its stones and liberties, and empty sets for an empty
+    position.
+    """
+    game = sets_grid_no_order([(5, 5), (5, 6), (6, 6)], [(4, 5)])
+
+    group, liberties = game.chain((5, 5))
+
+    assert group == {(5, 5), (5, 6), (6, 6)}
+    assert liberties == {(5, 4), (6, 5), (4, 6), (5, 7), (6, 7), (7, 6)}
+    assert game.chain((0, 0)) == (set(), set())
+
+
+def test_empty_positions_1() -> None:
+    """
+    Verifies that empty_positions lists exactly the positions without a
+    piece.
+    """
+    game: Go = load_board_with_pieces(5)
+
+    empty = game.empty_positions()
+
+    assert len(empty) == 25 - 8
+    assert all(game.piece_at(pos) is None for pos in empty)
+
+
+def test_is_eye_1() -> None:
+    """
+    Surrounds a position with white stones and verifies that it is an eye
+    of white only, and stops being one once black holds two diagonals.
+    """
+    game = sets_grid_no_order([(4, 5), (5, 4), (5, 6), (6, 5)], [(4, 4)])
+
+    assert game.is_eye((5, 5), 1)
+    assert not game.is_eye((5, 5), 2)
+
+    game = sets_grid_no_order([(4, 5), (5, 4), (5, 6), (6, 5)],
+                              [(4, 4), (6, 6)])
+
+    assert not game.is_eye((5, 5), 1)
+
+
+def test_is_eye_2() -> None:
+    """
+    Verifies that on the edge of the board a single opposing diagonal is
+    enough to make a false eye.
+    """
+    game = sets_grid_no_order([(0, 4), (0, 6), (1, 5)], [])
+
+    assert game.is_eye((0, 5), 1)
+
+    game = sets_grid_no_order([(0, 4), (0, 6), (1, 5)], [(1, 4)])
+
+    assert not game.is_eye((0, 5), 1)
+
+
+def test_is_self_capture_1() -> None:
+    """
+    Verifies that playing inside an opposing eye captures one's own stone,
+    unless the move captures the surrounding chain.
+    """
+    game = sets_grid_no_order([(0, 1), (1, 0)], [])
+    game.pass_turn()
+
+    assert game.is_self_capture((0, 0))
+
+    game = sets_grid_no_order([(0, 1), (1, 0)], [(0, 2), (1, 1), (2, 0)])
+    game.pass_turn()
+
+    assert not game.is_self_capture((0, 0))
+
+
+def test_chains_1(game: Go) -> None:
+    """
+    Verifies that chains maps every stone to the color, stones and
+    liberties of its chain.
+    """
+    game = sets_grid_no_order([(0, 0), (0, 1)], [(1, 0)])
+
+    chains = game.chains()
+
+    assert set(chains) == {(0, 0), (0, 1), (1, 0)}
+    assert chains[(0, 0)] is chains[(0, 1)]
+    assert chains[(0, 0)] == (1, {(0, 0), (0, 1)}, {(0, 2), (1, 1)})
+    assert chains[(1, 0)] == (2, {(1, 0)}, {(2, 0), (1, 1)})
+
+
+def test_pattern_at_1() -> None:
+    """
+    Verifies that the pattern codes kept up to date through random moves
+    and captures match codes recomputed from the final grid.
+    """
+    rand = random.Random(7)
+    game = Go(7, 2)
+    for _ in range(200):
+        moves = [pos for pos in game.empty_positions() if game.legal_move(pos)]
+        if not moves:
+            break
+        game.apply_move(rand.choice(moves))
+
+    fresh = Go(7, 2)
+    fresh.load_game(game.turn, game.grid)
+
+    for row in range(7):
+        for col in range(7):
+            assert game.pattern_at((row, col)) == fresh.pattern_at((row, col))
+
+
+def test_pattern_at_2() -> None:
+    """
+    Verifies the pattern codes of a corner next to pieces of both colors.
+    """
+    game = sets_grid_no_order([(0, 1)], [(1, 1)])
+    cells = decode(game.pattern_at((0, 0)))
+
+    assert cells == (EDGE, EDGE, OWN, OPPONENT, EMPTY, EDGE, EDGE, EDGE)
+
+
+def test_board_key_1() -> None:
+    """
+    Verifies that the board key encodes one byte per position and tells
+    different boards apart.
+    """
+    game = sets_grid_no_order([(0, 0)], [(1, 1)])
+    other = sets_grid_no_order([(1, 1)], [(0, 0)])
+
+    assert len(game.board_key()) == 19 * 19
+    assert game.board_key() != other.board_key()
+    passed = game.simulate_move(None)
+    assert isinstance(passed, Go)
+    assert game.board_key() == passed.board_key()
+
+
+def test_ownership_1() -> None:
+    """
+    Verifies that ownership kept up to date through random moves and
+    captures matches ownership computed from the final grid.
+    """
+    rand = random.Random(11)
+    game = Go(9, 2)
+    game.estimated_scores()
+    for _ in range(120):
+        moves = [pos for pos in game.empty_positions() if game.legal_move(pos)]
+        if not moves:
+            break
+        game.apply_move(rand.choice(moves))
+        if rand.random() < 0.2:
+            game.estimated_scores()
+
+    fresh = Go(9, 2)
+    fresh.load_game(game.turn, game.grid)
+
+    assert game.ownership() == fresh.ownership()
+    assert game.estimated_scores() == fresh.estimated_scores()
+
+
+def test_ownership_2() -> None:
+    """
+    Verifies that a lone stone owns the area around it, and that a stone
+    surrounded by opposing stones is owned by the opponent.
+    """
+    game = Go(9, 2)
+    game.apply_move((4, 4))
+
+    assert game.ownership()[4][4] == 1
+    assert game.ownership()[0][0] is None
+    assert game.estimated_scores() == {1: 41, 2: 0}
+
+    game = sets_grid_no_order([(4, 4)], [(3, 4), (5, 4), (4, 3), (4, 5)])
+
+    assert game.ownership()[4][4] == 2
+
+
+def test_read_ladder_1() -> None:
+    """
+    Verifies that a ladder running to the edge captures the chain, and that
+    the board is left as it was.
+    """
+    game = sets_grid_no_order([(4, 4)], [(3, 4), (4, 3), (5, 5)])
+    game.pass_turn()
+    grid = game.grid
+
+    assert game.read_ladder((4, 4))
+    assert game.read_ladder((4, 4), attack=(5, 4))
+    assert game.grid == grid
+    assert not game.read_ladder((4, 4), max_depth=4)
+
+
+def test_read_ladder_2() -> None:
+    """
+    Verifies that a stone of the defender on the ladder's path breaks it.
+    """
+    game = sets_grid_no_order([(4, 4), (2, 7)], [(3, 4), (4, 3), (5, 5)])
+    game.pass_turn()
+
+    assert not game.read_ladder((4, 4), attack=(5, 4))
+    assert game.read_ladder((4, 4), attack=(4, 5))
+
+
+def test_read_ladder_3() -> None:
+    """
+    Verifies that a stone in atari in the corner, whose extension has a
+    single liberty, is captured, while chains with three liberties and
+    empty positions are not in a ladder.
+    """
+    game = sets_grid_no_order([(0, 0)], [(0, 1), (1, 1)])
+
+    assert game.read_ladder((0, 0))
+    assert not game.read_ladder((9, 9))
+
+    game = sets_grid_no_order([(9, 9)], [])
+
+    assert not game.read_ladder((9, 9))
+
+
+def load_rows(rows: list[str], turn: int = 1) -> Go:
+    """
+    Loads a square 2-player game from rows of text, with W for white
+    (player 1), B for black (player 2) and . for empty positions.
+    """
+    pieces = {"W": 1, "B": 2, ".": None}
+    grid = [[pieces[char] for char in row] for row in rows]
+    game = Go(len(rows), 2)
+    game.load_game(turn, grid)
+    return game
+
+
+def test_pass_alive_1() -> None:
+    """
+    Verifies that a wall with three small eyes is pass-alive and settles
+    its eyes, including an opposing stone in one of them, but not the open
+    side of the board.
+    """
+    game = load_rows(["B.W..",
+                      "WWW..",
+                      "..W..",
+                      "WWW..",
+                      "..W.."])
+
+    stones, regions = game.pass_alive(1)
+
+    assert stones == {(0, 2), (1, 0), (1, 1), (1, 2), (2, 2), (3, 0),
+                      (3, 1), (3, 2), (4, 2)}
+    assert regions == {(0, 0), (0, 1), (2, 0), (2, 1), (4, 0), (4, 1)}
+    assert game.pass_alive(2) == (set(), set())
+    assert game.scores() == {1: 23, 2: 1}
+    assert game.settled_scores() == {1: 25, 2: 0}
+
+
+def test_pass_alive_2() -> None:
+    """
+    Verifies that a chain with a single eye is not pass-alive.
+    """
+    game = load_rows(["..W..",
+                      "WWW..",
+                      ".....",
+                      ".....",
+                      "....."])
+
+    assert game.pass_alive(1) == (set(), set())
+    assert game.settled() == {}
+
+
+def test_read_ladder_4() -> None:
+    """
+    Verifies that reading a ladder whose captures repeat like a ko stops
+    quickly and leaves the board as it was.
+    """
+    game = load_rows([".B.B.W.",
+                      "BBBBWW.",
+                      ".BWBW..",
+                      "B.WBBW.",
+                      "WW.B.W.",
+                      "BWBB.WW",
+                      ".B.BW.."], turn=2)
+    grid = game.grid
+
+    start = time.perf_counter()
+    game.read_ladder((4, 1), attack=(3, 1))
+
+    assert time.perf_counter() - start < 1.0
+    assert game.grid == grid
+
+
+def test_read_ladder_5() -> None:
+    """
+    Verifies that a long diagonal ladder is read to the end after the other
+    atari, which runs into a ladder breaker, has used up its own budget.
+    """
+    game = sets_grid_no_order([(8, 9), (9, 8), (10, 10)], [(9, 9), (18, 3)])
+
+    assert not game.read_ladder((9, 9), attack=(9, 10))
+    assert game.read_ladder((9, 9), attack=(10, 9))
+    assert game.read_ladder((9, 9))
+
+
+def test_reset_1() -> None:
+    """
+    Plays part of a game, with captures and the influence of its stones
+    found, resets it and verifies that it plays on like a new game.
+    """
+    game = Go(5, 2)
+    fresh = Go(5, 2)
+    rng = random.Random(3)
+    for _ in range(30):
+        game.apply_move(rng.choice(game.available_moves))
+        game.estimated_scores()
+    game.pass_turn()
+
+    game.reset()
+
+    assert game.grid == fresh.grid
+    assert (game.turn, game.num_of_turns, game.consecutive_passes) == (1, 0, 0)
+    assert game.captured_pos_color == {}
+    assert all(game.pattern_at(pos) == fresh.pattern_at(pos)
+               for pos in fresh.empty_positions())
+    for move in [(1, 1), (2, 2), (1, 2)]:
+        game.apply_move(move)
+        fresh.apply_move(move)
+    assert game.estimated_scores() == fresh.estimated_scores()
+    assert game.available_moves == fresh.available_moves
+
+
+def test_reset_2() -> None:
+    """
+    Verifies that a reset keeps the ko rule of the game and forgets the
+    boards of the moves before it.
+    """
+    game = Go(4, 2, superko=True)
+    game.apply_move((0, 0))
+
+    game.reset()
+
+    assert game.superko
+    game.apply_move((1, 1))
+    assert game.legal_move((0, 0))
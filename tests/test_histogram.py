@@ -0,0 +1,63 @@
+"""
+Tests for latency histograms
+"""
+import math
+import random
+from histogram import BUCKETS_PER_DOUBLING, LARGEST, SMALLEST, Histogram
+
+
+def test_percentile_1() -> None:
+    """
+    Adds latencies spread over several orders of magnitude and verifies
+    that every percentile is within the width of a bucket of the exact one.
+    """
+    rng = random.Random(7)
+    latencies = sorted(10 ** rng.uniform(-5, 1) for _ in range(10000))
+    histogram = Histogram()
+    for latency in latencies:
+        histogram.add(latency)
+
+    error = 2 ** (1 / BUCKETS_PER_DOUBLING)
+    for percent in (1, 50, 90, 99, 99.9):
+        exact = latencies[math.ceil(len(latencies) * percent / 100) - 1]
+        assert exact / error <= histogram.percentile(percent) <= \
+            exact * error
+    assert histogram.percentile(100) == histogram.largest == latencies[-1]
+    assert histogram.count == 10000
+
+
+def test_percentile_2() -> None:
+    """
+    Verifies that latencies outside the buckets are counted and that the
+    percentiles stay within the latencies added.
+    """
+    histogram = Histogram()
+    assert histogram.percentile(50) == 0.0
+
+    for latency in [0.0, SMALLEST / 10, LARGEST * 10]:
+        histogram.add(latency)
+
+    assert histogram.percentile(50) < 2 * SMALLEST
+    assert LARGEST <= histogram.percentile(99) <= LARGEST * 10
+    assert histogram.percentile(100) == LARGEST * 10
+    assert histogram.count == 3
+
+
+def test_state_1() -> None:
+    """
+    Verifies that a histogram restored from its state gives the same
+    percentiles, and that an empty one round-trips too.
+    """
+    histogram = Histogram()
+    for latency in [0.001, 0.002, 0.004, 0.5]:
+        histogram.add(latency)
+    restored = Histogram()
+    restored.restore(histogram.state())
+    empty = Histogram()
+    empty.restore(Histogram().state())
+
+    assert [restored.percentile(p) for p in (50, 90, 99)] == \
+        [histogram.percentile(p) for p in (50, 90, 99)]
+    assert (restored.count, restored.mean, restored.largest) == \
+        (histogram.count, histogram.mean, histogram.largest)
+    assert empty.count == 0 and empty.percentile(50) == 0.0
@@ -0,0 +1,50 @@
+"""
+Tests for the 3x3 pattern tables
+"""
+from board import PATTERN_DIRECTIONS
+from patterns import EDGE, EMPTY, NUM_PATTERNS, OPPONENT, OWN, \
+    PatternTable, decode, shape_weight
+
+
+def encode(cells: tuple[int, ...]) -> int:
+    """
+    Builds a pattern code from the contents of the eight neighbors.
+    """
+    return sum(cell << (2 * i) for i, cell in enumerate(cells))
+
+
+def test_decode_1() -> None:
+    """
+    Verifies that decode inverts the encoding of every code.
+    """
+    for code in range(0, NUM_PATTERNS, 97):
+        cells = decode(code)
+        assert len(cells) == len(PATTERN_DIRECTIONS)
+        assert encode(cells) == code
+
+
+def test_weight_1() -> None:
+    """
+    Verifies that weights are looked up from the side of the player to
+    move, swapping colors for player 2.
+    """
+    table = PatternTable.from_function(
+        lambda cells: cells.count(OWN) - cells.count(OPPONENT))
+    code = encode((OWN, OWN, EMPTY, EMPTY, OPPONENT, EMPTY, EDGE, EDGE))
+
+    assert table.weight(code, 1) == 1
+    assert table.weight(code, 2) == -1
+
+
+def test_shape_weight_1() -> None:
+    """
+    Verifies that the default weights prefer cuts and avoid empty
+    triangles.
+    """
+    empty_triangle = (OWN, EMPTY, OWN, EMPTY, EMPTY, EMPTY, EMPTY, EMPTY)
+    cut = (OPPONENT, OWN, OPPONENT, EMPTY, EMPTY, EMPTY, EMPTY, EMPTY)
+
+    assert shape_weight(empty_triangle) < 0
+    assert shape_weight(cut) > 0
+    assert PatternTable.default().weight(encode(cut), 1) == shape_weight(cut)
+    assert PatternTable.default().weight(encode(cut), 2) < shape_weight(cut)
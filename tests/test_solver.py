@@ -0,0 +1,110 @@
+"""
+Tests for the exact solver and the perfect bot
+"""
+import random
+from pathlib import Path
+import pytest
+from go import Go
+from bot import PerfectBot, RandomBot, PASS
+from botbase import Players
+from solver import SolutionTable, Solver, state_key
+from symmetry import canonical_hash
+
+
+@pytest.fixture(scope="module")
+def solver_2x2() -> Solver:
+    """
+    Returns a solver that solved the empty 2x2 board.
+    """
+    solver = Solver(2)
+    solver.solve()
+    return solver
+
+
+def test_solve_2x2_1(solver_2x2: Solver) -> None:
+    """
+    Solves the empty 2x2 board and verifies the known result: the first
+    player wins by one point. Also verifies that the table has the best
+    move of the first player.
+    """
+    entry = solver_2x2.table.lookup(Go(2, 2))
+    assert entry is not None
+    assert entry[0] == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_perfect_bot_2(solver_2x2: Solver, seed: int) -> None:
+    """
+    Plays the perfect bot, solving the positions missing from its table,
+    from the empty 2x2 board the solver marks as won against a random bot
+    and verifies that it wins.
+    """
+    game = Go(2, 2)
+    bots = [PerfectBot(Players.WHITE, solver_2x2.table, solve_misses=True),
+            RandomBot(Players.BLACK)]
+    bots[1].use_rng(random.Random(seed))
+
+    for _ in range(100):
+        if game.done:
+            break
+        bots[game.turn - 1].make_move(game)
+
+    assert game.done
+    scores = game.scores()
+    assert scores[Players.WHITE] > scores[Players.BLACK]
+
+
+def test_state_key_1() -> None:
+    """
+    Verifies that a position where the ko rule forbids a recapture is a
+    different state from the same position without the ko.
+    """
+    game = Go(4, 2)
+    game.load_game(1, [[None, 1, 2, None], [1, 2, None, 2],
+                       [None, 1, 2, None], [None] * 4])
+    game.apply_move((1, 2))
+    assert game.ko_point() == (1, 1)
+    same_board = Go(4, 2)
+    same_board.load_game(game.turn, game.grid)
+
+    assert canonical_hash(game) == canonical_hash(same_board)
+    assert state_key(game)[0] != state_key(same_board)[0]
+
+
+def test_table_save_1(tmp_path: Path) -> None:
+    """
+    Writes a solution table to a file, reads it back and verifies that the
+    stored move comes back in the orientation of the position looked up.
+    """
+    game = Go(3, 2)
+    game.apply_move((0, 0))
+    key, transform = canonical_hash(game)
+    table = SolutionTable(3)
+    table.add((key, 0), -2, (1, 1))
+    path = str(tmp_path / "solution.bin")
+
+    table.save(path)
+    loaded = SolutionTable.load(path)
+
+    mirrored = Go(3, 2)
+    mirrored.apply_move((2, 2))
+    assert len(loaded) == 1
+    assert loaded.lookup(mirrored) == (-2, (1, 1))
+    assert loaded.lookup(Go(3, 2)) is None
+
+
+def test_perfect_bot_1() -> None:
+    """
+    Verifies that the perfect bot plays the table move when it has one and
+    a legal move otherwise.
+    """
+    game = Go(3, 2)
+    table = SolutionTable(3)
+    table.add((canonical_hash(game)[0], 0), 0, (1, 1))
+    bot = PerfectBot(Players.WHITE, table)
+
+    assert bot.get_move(game) == (1, 1)
+    bot.make_move(game)
+    move = bot.get_move(game)
+    assert move == PASS or game.legal_move(move)
+    assert bot.misses == 1
@@ -0,0 +1,93 @@
+"""
+Tests for the sequential probability ratio test
+"""
+import math
+import pytest
+from go import Go
+from bot import HeuristicBot, RandomBot, Simulation
+from botbase import Players
+from sprt import H0, H1, SPRT, expected_score
+
+
+def test_expected_score_1() -> None:
+    """
+    Verifies the expected scores of equal players and of a player 400 Elo
+    stronger.
+    """
+    assert expected_score(0) == 0.5
+    assert expected_score(400) == pytest.approx(10 / 11)
+    assert expected_score(-400) == pytest.approx(1 / 11)
+
+
+def test_sprt_invalid_1() -> None:
+    """
+    Verifies that the hypotheses must be ordered and the error rates must
+    be probabilities.
+    """
+    with pytest.raises(ValueError):
+        SPRT(5, 0)
+    with pytest.raises(ValueError):
+        SPRT(0, 5, alpha=0)
+    with pytest.raises(ValueError):
+        SPRT(0, 5, beta=1)
+
+
+def test_sprt_bounds_1() -> None:
+    """
+    Verifies the bounds of the test for the usual error rates.
+    """
+    lower, upper = SPRT(0, 5, 0.05, 0.05).bounds
+
+    assert lower == pytest.approx(-math.log(19))
+    assert upper == pytest.approx(math.log(19))
+
+
+@pytest.mark.parametrize("score, decision", [(1.0, H1), (0.0, H0)])
+def test_sprt_decision_1(score: float, decision: str) -> None:
+    """
+    Adds the same result over and over and verifies that the test soon
+    accepts the matching hypothesis, and not before its bound.
+    """
+    sprt = SPRT(0, 50)
+
+    while sprt.decision is None:
+        sprt.add(score)
+
+    assert sprt.decision == decision
+    assert sprt.games < 40
+    assert len(sprt.trajectory) == sprt.games
+    lower, upper = sprt.bounds
+    assert all(lower < llr < upper for llr in sprt.trajectory[:-1])
+
+
+def test_sprt_balanced_1() -> None:
+    """
+    Verifies that evenly matched results between the two hypotheses move
+    the LLR towards neither.
+    """
+    sprt = SPRT(-20, 20)
+
+    for _ in range(100):
+        sprt.add(1.0)
+        sprt.add(0.0)
+        sprt.add(0.5)
+
+    assert sprt.llr() == pytest.approx(0.0)
+    assert sprt.decision is None
+
+
+def test_simulation_sprt_1() -> None:
+    """
+    Runs an SPRT between a heuristic bot and a random bot and verifies that
+    it accepts that the heuristic bot is stronger well before the cap.
+    """
+    simulation = Simulation(Go(5, 2), [HeuristicBot(Players.WHITE),
+                                       RandomBot(Players.BLACK)])
+    sprt = SPRT(0, 100)
+
+    white, _, _, _ = simulation.run_sprt(sprt, 200, seed=5)
+
+    assert sprt.decision == H1
+    assert sprt.games < 50
+    assert simulation.game_times.count == sprt.games
+    assert white == pytest.approx(sprt.wins / sprt.games * 100)
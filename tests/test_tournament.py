@@ -0,0 +1,120 @@
+"""
+Tests for round-robin tournaments and Elo ratings
+"""
+import math
+from collections import Counter
+import pytest
+from adjudicator import Adjudicator
+from tournament import Tournament, elo_ratings
+
+
+def test_elo_ratings_1() -> None:
+    """
+    Verifies that two players who scored 3/4 and 1/4 against each other
+    are rated 400 * log10(3) Elo apart, symmetrically about 0, with the
+    interval given by the binomial variance of the score.
+    """
+    ratings = elo_ratings([[0.0, 75], [25, 0]], [[0, 100], [100, 0]],
+                          prior=0.0)
+
+    difference = 400 * math.log10(3)
+    assert ratings[0][0] == pytest.approx(difference / 2)
+    assert ratings[1][0] == pytest.approx(-difference / 2)
+    # Standard error of the difference in log strength: 1 / sqrt(n p q).
+    error = 400 / math.log(10) / math.sqrt(100 * 0.75 * 0.25)
+    assert ratings[0][1] == pytest.approx(1.959964 * error / 2, rel=1e-5)
+    assert ratings[0][1] == pytest.approx(ratings[1][1])
+
+
+def test_elo_ratings_2() -> None:
+    """
+    Verifies that a player who won every game has a finite rating thanks
+    to the prior, and that the ratings follow the scores.
+    """
+    points: list[list[float]] = [[0, 10, 10], [0, 0, 6], [0, 4, 0]]
+    games = [[0, 10, 10], [10, 0, 10], [10, 10, 0]]
+
+    ratings = elo_ratings(points, games)
+
+    elos = [rating for rating, _ in ratings]
+    assert elos[0] > elos[1] > elos[2]
+    assert math.isfinite(elos[0])
+    assert sum(elos) == pytest.approx(0, abs=1e-6)
+
+
+def test_elo_ratings_disconnected_1() -> None:
+    """
+    Verifies that players who are not linked by games cannot be rated.
+    """
+    games = [[0, 2, 0, 0], [2, 0, 0, 0], [0, 0, 0, 2], [0, 0, 2, 0]]
+    points: list[list[float]] = [[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1],
+                                 [0, 0, 1, 0]]
+
+    with pytest.raises(ValueError):
+        elo_ratings(points, games)
+
+
+def test_tournament_schedule_1() -> None:
+    """
+    Verifies that every pair plays the same number of games, half with
+    each player moving first, and that every game has its own seed.
+    """
+    tournament = Tournament(["random", "light", "heuristic"], 4)
+
+    schedule = tournament.schedule(7)
+
+    assert len(schedule) == 12
+    assert Counter((white, black) for white, black, _ in schedule) == \
+        {pair: 2 for pair in [(0, 1), (1, 0), (0, 2), (2, 0), (1, 2),
+                              (2, 1)]}
+    assert len({seed for _, _, seed in schedule}) == 12
+
+
+def test_tournament_invalid_1() -> None:
+    """
+    Verifies that a tournament needs two different strategies and an even
+    number of games per pair.
+    """
+    with pytest.raises(ValueError):
+        Tournament(["random"])
+    with pytest.raises(ValueError):
+        Tournament(["random", "random"])
+    with pytest.raises(ValueError):
+        Tournament(["random", "light"], 3)
+    with pytest.raises(ValueError):
+        Tournament(["alphabeta:time=1,depth=2",
+                    "alphabeta:depth=2,time=1.0"])
+    with pytest.raises(ValueError):
+        Tournament(["random", "light:speed=2"])
+
+
+def test_tournament_run_1() -> None:
+    """
+    Runs a small tournament and verifies that every game was counted once
+    for each player and that the crosstable lists every strategy.
+    """
+    tournament = Tournament(["random", "light", "heuristic"], 2, size=4)
+
+    tournament.run(seed=3)
+
+    for entrant in range(3):
+        assert sum(tournament.games[entrant]) == 4
+    assert sum(map(sum, tournament.points)) == 6
+    table = tournament.crosstable()
+    assert len(table.splitlines()) == 4
+    for strategy in ["random", "light", "heuristic"]:
+        assert strategy in table
+
+
+def test_tournament_run_2() -> None:
+    """
+    Runs a tournament between two configurations of one strategy, with
+    adjudicated games, and verifies that both are rated.
+    """
+    tournament = Tournament(["light", "light:settled=no"], 2, size=4,
+                            adjudicator=Adjudicator(1.0, None))
+
+    tournament.run(seed=5)
+
+    assert tournament.games == [[0, 2], [2, 0]]
+    assert "light:settled=no" in tournament.crosstable()